@@ -0,0 +1,50 @@
+"""Process-wide response cache and invalidation bus, built from the settings."""
+
+import asyncio
+from functools import partial
+
+from .core.cache import create_cache_backend
+from .core.config import get_settings
+from .core.invalidation import Invalidation, create_invalidation_bus
+
+# Namespaces of the serialized GET /books/{id} and GET /authors/{id} responses
+BOOKS = "books"
+AUTHORS = "authors"
+# Namespaces of the genre and publisher reference caches
+GENRES = "genres"
+PUBLISHERS = "publishers"
+
+settings = get_settings()
+
+entity_cache = create_cache_backend(
+    settings.cache_url,
+    ttl=settings.entity_cache_ttl,
+    max_size=settings.entity_cache_size,
+)
+invalidation_bus = create_invalidation_bus(settings.cache_url)
+
+# A shared backend is invalidated once by the writer; a per-process one by every worker
+if not entity_cache.shared:
+    for namespace in (BOOKS, AUTHORS):
+        invalidation_bus.subscribe(namespace, partial(entity_cache.invalidate, namespace))
+
+
+def publish_invalidations(*invalidations: Invalidation) -> None:
+    """Invalidate cached entries in every worker after a committed write.
+    
+    Args:
+        invalidations: The entries made stale by the write.
+    """
+    if entity_cache.shared:
+        for invalidation in invalidations:
+            if invalidation.namespace in (BOOKS, AUTHORS):
+                entity_cache.invalidate(invalidation.namespace, invalidation.ids)
+    invalidation_bus.publish(*invalidations)
+
+
+async def publish_invalidations_async(*invalidations: Invalidation) -> None:
+    """Async variant of publish_invalidations; Redis calls run in a thread."""
+    if entity_cache.shared:
+        await asyncio.to_thread(publish_invalidations, *invalidations)
+    else:
+        publish_invalidations(*invalidations)
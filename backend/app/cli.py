@@ -0,0 +1,186 @@
+"""Command line entry points for catalog maintenance tasks.
+
+Usage:
+    python -m app.cli migrate
+    python -m app.cli migrate --status
+    python -m app.cli seed
+    python -m app.cli generate --books 1000000
+    python -m app.cli import-books books.ndjson
+    python -m app.cli import-books books.csv --format csv
+    python -m app.cli prune-changes --days 30
+"""
+
+import argparse
+import sys
+import time
+from datetime import timedelta
+from typing import List, Optional
+
+from .core.exceptions import ValidationException
+from .database import engine, SessionLocal
+from .generator import CatalogSize, generate_catalog
+from .migrations import MIGRATIONS, applied_versions, migrate as apply_migrations
+from .seed import seed_database
+from .services import BookImportService, ChangeService, ImportFormat
+
+
+def generate(args: argparse.Namespace) -> int:
+    """Fill an empty database with a synthetic catalog for benchmarks.
+    
+    Args:
+        args: Parsed command line arguments.
+    
+    Returns:
+        Process exit code; non-zero if the catalog is not empty.
+    """
+    size = CatalogSize.for_books(args.books, args.authors, args.publishers, args.genres)
+    
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        generate_catalog(db, size, seed=args.seed)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+    
+    print(f"generated {size.as_dict()} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+def import_books(args: argparse.Namespace) -> int:
+    """Stream a local NDJSON or CSV feed into the catalog.
+    
+    Args:
+        args: Parsed command line arguments.
+    
+    Returns:
+        Process exit code; non-zero if any row was rejected.
+    """
+    import_format = ImportFormat(args.format) if args.format else ImportFormat.from_filename(args.path)
+    
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as stream:
+            result = BookImportService(db).import_books(stream, import_format)
+    except ValidationException as error:
+        print(error.message, file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+    
+    print(result.model_dump_json(indent=2))
+    return 1 if result.failed else 0
+
+
+def migrate(args: argparse.Namespace) -> int:
+    """Apply pending schema migrations, or list their status.
+    
+    Args:
+        args: Parsed command line arguments.
+        
+    Returns:
+        Process exit code.
+    """
+    if args.status:
+        applied = applied_versions(engine)
+        for migration in MIGRATIONS:
+            state = "applied" if migration.version in applied else "pending"
+            print(f"{migration.version:04d} {state:<8} {migration.name}")
+        return 0
+    
+    applied = apply_migrations(
+        engine,
+        MIGRATIONS,
+        target=args.target,
+        on_apply=lambda migration: print(f"applying {migration.version:04d} {migration.name}"),
+    )
+    if not applied:
+        print("database is up to date")
+    return 0
+
+
+def prune_changes(args: argparse.Namespace) -> int:
+    """Delete change log entries older than the retention period.
+    
+    Args:
+        args: Parsed command line arguments.
+    
+    Returns:
+        Process exit code.
+    """
+    db = SessionLocal()
+    try:
+        deleted = ChangeService(db).prune(timedelta(days=args.days))
+    finally:
+        db.close()
+    
+    print(f"deleted {deleted} change log entries older than {args.days} days")
+    return 0
+
+
+def seed(args: argparse.Namespace) -> int:
+    """Insert the sample catalog into an empty database.
+    
+    Args:
+        args: Parsed command line arguments.
+        
+    Returns:
+        Process exit code.
+    """
+    db = SessionLocal()
+    try:
+        seed_database(db)
+    finally:
+        db.close()
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parse arguments and dispatch to the selected command.
+    
+    Args:
+        argv: Command line arguments, defaulting to sys.argv.
+    
+    Returns:
+        Process exit code.
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Book Catalog maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    migrate_parser = subparsers.add_parser("migrate", help="Apply pending schema migrations")
+    migrate_parser.add_argument("--target", type=int, help="Stop after this migration version")
+    migrate_parser.add_argument("--status", action="store_true", help="List migrations and whether they are applied")
+    migrate_parser.set_defaults(handler=migrate)
+    
+    seed_parser = subparsers.add_parser("seed", help="Insert sample data into an empty database")
+    seed_parser.set_defaults(handler=seed)
+    
+    generate_parser = subparsers.add_parser("generate", help="Fill an empty database with a synthetic catalog")
+    generate_parser.add_argument("--books", type=int, default=100000, help="Number of books")
+    generate_parser.add_argument("--authors", type=int, help="Number of authors (default: books / 5)")
+    generate_parser.add_argument("--publishers", type=int, help="Number of publishers (default: books / 200)")
+    generate_parser.add_argument("--genres", type=int, help="Number of genres (default: books / 20000, at least 20)")
+    generate_parser.add_argument("--seed", type=int, default=42, help="Random seed; the same seed gives the same catalog")
+    generate_parser.set_defaults(handler=generate)
+    
+    import_parser = subparsers.add_parser("import-books", help="Bulk import books from NDJSON or CSV")
+    import_parser.add_argument("path", help="Path to the feed file")
+    import_parser.add_argument(
+        "--format",
+        choices=[f.value for f in ImportFormat],
+        help="Feed format (defaults from the file extension)",
+    )
+    import_parser.set_defaults(handler=import_books)
+    
+    prune_parser = subparsers.add_parser("prune-changes", help="Delete old entries of the change log")
+    prune_parser.add_argument("--days", type=int, default=30, help="Days of changes to keep")
+    prune_parser.set_defaults(handler=prune_changes)
+    
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
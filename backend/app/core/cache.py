@@ -0,0 +1,470 @@
+"""Cache primitives: an in-process TTL and LRU cache and pluggable backends.
+
+TTLCache holds rarely changing reference data inside one process.
+CacheBackend stores serialized API responses by entity id, either in
+process memory or in Redis, where every worker shares the entries.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters of a cache since the process started.
+    
+    Attributes:
+        name: The cache name.
+        hits: Lookups answered from memory.
+        misses: Lookups that went to the loader.
+        evictions: Entries dropped because the cache was full.
+        size: Entries currently held.
+    """
+    name: str
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+class TTLCache:
+    """Thread-safe cache whose entries expire after a TTL, evicting least recently used first.
+    
+    Values must not be mutated by callers, since every hit returns the same
+    object. clear() bumps a generation number; a load that started before
+    the clear is not stored, so a read racing a write cannot put the old
+    value back for a whole TTL. Entries may carry a version: a lookup for
+    another version misses and replaces the entry, so a value is never
+    returned for a version it was not loaded at.
+    
+    Attributes:
+        name: Name reported in the stats.
+        max_size: Maximum number of entries.
+        ttl: Seconds an entry stays valid; 0 disables caching.
+    """
+    
+    def __init__(self, name: str, max_size: int = 1024, ttl: float = 300.0):
+        """Initialize the cache.
+        
+        Args:
+            name: Name reported in the stats.
+            max_size: Maximum number of entries.
+            ttl: Seconds an entry stays valid; 0 disables caching.
+        """
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        # Expiry time, value and version of each key
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Hashable]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether entries are stored at all."""
+        return self.ttl > 0 and self.max_size > 0
+    
+    def _lookup(self, key: Hashable, version: Hashable) -> Tuple[Any, int]:
+        """Look up a key, counting the hit or miss.
+        
+        Args:
+            key: The cache key.
+            version: The version the entry must have been stored at.
+        
+        Returns:
+            Tuple of (the value or _MISSING, generation to pass to _store).
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now and entry[2] == version:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1], self._generation
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return _MISSING, self._generation
+    
+    def _store(self, key: Hashable, value: Any, generation: int, version: Hashable) -> None:
+        """Store a value loaded after a miss.
+        
+        Args:
+            key: The cache key.
+            value: The loaded value.
+            generation: The generation returned by the lookup that missed; the
+                value is dropped if the cache was cleared since.
+            version: The version the value was loaded at.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+    
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], version: Hashable = None) -> Any:
+        """Return the cached value, calling the loader on a miss.
+        
+        Args:
+            key: The cache key.
+            loader: Function producing the value.
+            version: Current version of the value; an entry stored at
+                another version is replaced.
+        
+        Returns:
+            The cached or freshly loaded value.
+        """
+        value, generation = self._lookup(key, version)
+        if value is _MISSING:
+            value = loader()
+            self._store(key, value, generation, version)
+        return value
+    
+    async def get_or_load_async(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]], version: Hashable = None
+    ) -> Any:
+        """Return the cached value, awaiting the loader on a miss.
+        
+        Args:
+            key: The cache key.
+            loader: Coroutine function producing the value.
+            version: Current version of the value; an entry stored at
+                another version is replaced.
+        
+        Returns:
+            The cached or freshly loaded value.
+        """
+        value, generation = self._lookup(key, version)
+        if value is _MISSING:
+            value = await loader()
+            self._store(key, value, generation, version)
+        return value
+    
+    def clear(self) -> None:
+        """Drop every entry and discard loads still in flight."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+    
+    def discard(self, keys: Iterable[Hashable]) -> None:
+        """Drop some entries and discard loads still in flight.
+        
+        Args:
+            keys: The cache keys to drop.
+        """
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+            self._generation += 1
+    
+    def stats(self) -> CacheStats:
+        """Return the hit, miss and eviction counters."""
+        with self._lock:
+            return CacheStats(
+                name=self.name,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+            )
+
+
+class CacheBackend(ABC):
+    """Storage for serialized entities, grouped in namespaces such as "books".
+    
+    Attributes:
+        shared: Whether entries are shared by every worker process. A
+            backend that is not shared must also be invalidated from the
+            invalidation messages of other workers.
+    """
+    
+    shared: bool = False
+    
+    @abstractmethod
+    def get_or_load(self, namespace: str, id: int, version: str, loader: Callable[[], bytes]) -> bytes:
+        """Return the cached entry, calling the loader and storing its result on a miss.
+        
+        Entries are stored with the version they were serialized at, and an
+        entry of another version is a miss. Passing the version the response
+        validators come from keeps the body and its ETag in step, even when
+        another worker's write has not been invalidated here yet.
+        
+        Args:
+            namespace: The entity namespace.
+            id: The entity's primary key.
+            version: Tag of the entity's current version, e.g. its ETag.
+            loader: Function producing the serialized entity. Exceptions
+                propagate and nothing is stored.
+        
+        Returns:
+            The serialized entity.
+        """
+    
+    @abstractmethod
+    async def get_or_load_async(
+        self, namespace: str, id: int, version: str, loader: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """Async variant of get_or_load for the async stack."""
+    
+    @abstractmethod
+    def invalidate(self, namespace: str, ids: Optional[Iterable[int]] = None) -> None:
+        """Drop entries so the next read loads them from the database.
+        
+        Args:
+            namespace: The entity namespace.
+            ids: Primary keys to drop, or None for the whole namespace.
+        """
+    
+    @abstractmethod
+    def stats(self) -> Dict[str, CacheStats]:
+        """Return the counters of this process, by namespace."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Backend keeping one TTLCache per namespace in process memory."""
+    
+    def __init__(self, ttl: float, max_size: int):
+        """Initialize the backend.
+        
+        Args:
+            ttl: Seconds an entry stays valid.
+            max_size: Maximum entries per namespace.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._caches: Dict[str, TTLCache] = {}
+        self._lock = threading.Lock()
+    
+    def _cache(self, namespace: str) -> TTLCache:
+        """Return the cache of a namespace, creating it on first use."""
+        with self._lock:
+            if namespace not in self._caches:
+                self._caches[namespace] = TTLCache(namespace, max_size=self.max_size, ttl=self.ttl)
+            return self._caches[namespace]
+    
+    def get_or_load(self, namespace: str, id: int, version: str, loader: Callable[[], bytes]) -> bytes:
+        """Return the cached entry, calling the loader on a miss."""
+        return self._cache(namespace).get_or_load(id, loader, version)
+    
+    async def get_or_load_async(
+        self, namespace: str, id: int, version: str, loader: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """Return the cached entry, awaiting the loader on a miss."""
+        return await self._cache(namespace).get_or_load_async(id, loader, version)
+    
+    def invalidate(self, namespace: str, ids: Optional[Iterable[int]] = None) -> None:
+        """Drop entries of a namespace."""
+        if ids is None:
+            self._cache(namespace).clear()
+        else:
+            self._cache(namespace).discard(ids)
+    
+    def stats(self) -> Dict[str, CacheStats]:
+        """Return the counters of each namespace."""
+        with self._lock:
+            caches = list(self._caches.values())
+        return {cache.name: cache.stats() for cache in caches}
+
+
+# Reads the namespace generation and the entry under it in one round trip
+REDIS_GET_SCRIPT = """
+local generation = redis.call('GET', KEYS[1]) or '0'
+return {generation, redis.call('GET', ARGV[1] .. generation .. ':' .. ARGV[2])}
+"""
+
+
+class RedisCacheBackend(CacheBackend):
+    """Backend storing entries in Redis, shared by every worker and replica.
+    
+    Keys are ``<prefix>:<namespace>:<generation>:<id>``. Invalidating a whole
+    namespace increments its generation, orphaning the old keys until they
+    expire. Invalidating single ids overwrites them with a short-lived
+    tombstone, and entries are stored with SET NX, so a read that loaded
+    the old row before the write committed cannot store it afterwards.
+    Values are the entity's version tag, a newline and the serialized
+    entity; an entry of an older version is overwritten by the next read.
+    
+    Attributes:
+        url: The Redis URL.
+        ttl: Seconds an entry stays valid; 0 disables the cache.
+        prefix: Prefix of every key.
+        tombstone_ttl: Seconds an invalidated id is kept out of the cache.
+    """
+    
+    shared = True
+    TOMBSTONE = b"-"
+    
+    def __init__(
+        self,
+        url: str,
+        ttl: int,
+        prefix: str = "catalog:cache",
+        tombstone_ttl: int = 5,
+        client=None,
+        async_client=None,
+    ):
+        """Initialize the backend.
+        
+        Args:
+            url: The Redis URL, e.g. redis://localhost:6379/0.
+            ttl: Seconds an entry stays valid.
+            prefix: Prefix of every key.
+            tombstone_ttl: Seconds an invalidated id is kept out of the cache.
+            client: Redis client to use instead of one connected to url,
+                e.g. a fakeredis.FakeRedis in tests.
+            async_client: Async Redis client to use instead of one
+                connected to url.
+        """
+        if client is None or async_client is None:
+            import redis
+            import redis.asyncio
+            
+            client = client or redis.Redis.from_url(url)
+            async_client = async_client or redis.asyncio.Redis.from_url(url)
+        
+        self.url = url
+        self.ttl = ttl
+        self.prefix = prefix
+        self.tombstone_ttl = tombstone_ttl
+        self.client = client
+        self.async_client = async_client
+        self._get_script = self.client.register_script(REDIS_GET_SCRIPT)
+        self._async_get_script = self.async_client.register_script(REDIS_GET_SCRIPT)
+        self._counters: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+    
+    def _generation_key(self, namespace: str) -> str:
+        """Key holding the current generation of a namespace."""
+        return f"{self.prefix}:{namespace}:generation"
+    
+    def _entry_key(self, namespace: str, generation: bytes, id: int) -> str:
+        """Key of an entry under a namespace generation."""
+        return f"{self.prefix}:{namespace}:{generation.decode()}:{id}"
+    
+    def _count(self, namespace: str, hit: bool) -> None:
+        """Increment this process's hit or miss counter."""
+        with self._lock:
+            hits, misses = self._counters.get(namespace, (0, 0))
+            self._counters[namespace] = (hits + 1, misses) if hit else (hits, misses + 1)
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether entries are stored at all; Redis rejects an expiry of 0."""
+        return self.ttl > 0
+    
+    def _read(self, namespace: str, value: Optional[bytes], version: str) -> Tuple[Optional[bytes], Optional[dict]]:
+        """Interpret a stored value, counting the hit or miss.
+        
+        Args:
+            namespace: The entity namespace.
+            value: The stored value, or None.
+            version: The version the entry must have been stored at.
+        
+        Returns:
+            Tuple of (the serialized entity on a hit or None, SET options
+            for the loaded value, or None if it must not be stored).
+        """
+        if value is None:
+            self._count(namespace, hit=False)
+            return None, {"nx": True}
+        if value == self.TOMBSTONE:
+            self._count(namespace, hit=False)
+            return None, None
+        stored_version, _, body = value.partition(b"\n")
+        if stored_version == version.encode():
+            self._count(namespace, hit=True)
+            return body, None
+        self._count(namespace, hit=False)
+        return None, {"xx": True}
+    
+    def get_or_load(self, namespace: str, id: int, version: str, loader: Callable[[], bytes]) -> bytes:
+        """Return the cached entry, calling the loader on a miss."""
+        if not self.enabled:
+            return loader()
+        generation, value = self._get_script(
+            keys=[self._generation_key(namespace)], args=[f"{self.prefix}:{namespace}:", id]
+        )
+        body, store = self._read(namespace, value, version)
+        if body is not None:
+            return body
+        loaded = loader()
+        if store is not None:
+            self.client.set(
+                self._entry_key(namespace, generation, id), version.encode() + b"\n" + loaded, ex=self.ttl, **store
+            )
+        return loaded
+    
+    async def get_or_load_async(
+        self, namespace: str, id: int, version: str, loader: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """Return the cached entry, awaiting the loader on a miss."""
+        if not self.enabled:
+            return await loader()
+        generation, value = await self._async_get_script(
+            keys=[self._generation_key(namespace)], args=[f"{self.prefix}:{namespace}:", id]
+        )
+        body, store = self._read(namespace, value, version)
+        if body is not None:
+            return body
+        loaded = await loader()
+        if store is not None:
+            await self.async_client.set(
+                self._entry_key(namespace, generation, id), version.encode() + b"\n" + loaded, ex=self.ttl, **store
+            )
+        return loaded
+    
+    def invalidate(self, namespace: str, ids: Optional[Iterable[int]] = None) -> None:
+        """Tombstone single entries, or start a new generation of the namespace."""
+        if ids is None:
+            self.client.incr(self._generation_key(namespace))
+            return
+        generation = self.client.get(self._generation_key(namespace)) or b"0"
+        with self.client.pipeline(transaction=False) as pipeline:
+            for id in ids:
+                pipeline.set(self._entry_key(namespace, generation, id), self.TOMBSTONE, ex=self.tombstone_ttl)
+            pipeline.execute()
+    
+    def stats(self) -> Dict[str, CacheStats]:
+        """Return this process's counters of each namespace; size is not tracked."""
+        with self._lock:
+            return {
+                namespace: CacheStats(name=namespace, hits=hits, misses=misses, evictions=0, size=0)
+                for namespace, (hits, misses) in self._counters.items()
+            }
+
+
+def create_cache_backend(url: str, ttl: int, max_size: int) -> CacheBackend:
+    """Create the cache backend selected by a cache URL.
+    
+    Args:
+        url: memory:// for a cache per process, or a redis:// or rediss://
+            URL for a cache shared by every worker.
+        ttl: Seconds an entry stays valid.
+        max_size: Maximum entries per namespace of the memory cache.
+    
+    Returns:
+        The backend.
+    
+    Raises:
+        ValueError: If the URL scheme is not supported.
+    """
+    scheme = url.split("://", 1)[0]
+    if scheme == "memory":
+        return MemoryCacheBackend(ttl=ttl, max_size=max_size)
+    if scheme in ("redis", "rediss"):
+        return RedisCacheBackend(url, ttl=ttl)
+    raise ValueError(f"Unsupported CACHE_URL scheme {scheme!r}; expected memory, redis or rediss")
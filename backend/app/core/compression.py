@@ -0,0 +1,199 @@
+"""Response compression negotiated from Accept-Encoding."""
+
+import zlib
+from importlib.util import find_spec
+from typing import Dict, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Response statuses that never carry a body
+BODILESS_STATUSES = (204, 304)
+
+
+class _GzipEncoder:
+    """Incremental gzip stream."""
+    
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Compress a chunk, flushing it so it can be sent right away."""
+        mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(mode)
+
+
+class _BrotliEncoder:
+    """Incremental brotli stream."""
+    
+    def __init__(self, brotli, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+    
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Compress a chunk, flushing it so it can be sent right away."""
+        output = self._compressor.process(data)
+        return output + (self._compressor.finish() if final else self._compressor.flush())
+
+
+def available_encodings() -> Sequence[str]:
+    """Content codings this process can produce, most preferred first.
+    
+    Brotli needs the optional brotli package; gzip is always available.
+    """
+    if find_spec("brotli") is None:
+        return ("gzip",)
+    return ("br", "gzip")
+
+
+def negotiate_encoding(accept_encoding: str, encodings: Sequence[str]) -> Optional[str]:
+    """Pick the content coding for a response.
+    
+    Args:
+        accept_encoding: The request's Accept-Encoding header.
+        encodings: Codings the server offers, most preferred first.
+    
+    Returns:
+        The offered coding with the highest client weight, ties going to the
+        server's preference, or None to send the body uncompressed.
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, parameters = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        name, _, value = parameters.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                weight = float(value)
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+    
+    best, best_weight = None, 0.0
+    for coding in encodings:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+class CompressionMiddleware:
+    """Compress response bodies with the best coding the client accepts.
+    
+    Bodies smaller than the threshold are sent as they are, since the
+    framing overhead outweighs the savings. Streaming responses are
+    compressed chunk by chunk and each chunk is flushed, so exports keep
+    streaming. Compressed responses get a weak ETag, as their bytes differ
+    from the identity representation while the content is the same, and
+    every response large enough to be compressed varies on Accept-Encoding.
+    
+    Attributes:
+        minimum_size: Smallest body, in bytes, that is compressed.
+        gzip_level: zlib compression level.
+        brotli_quality: Brotli quality; low values trade ratio for speed.
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        """Initialize the middleware.
+        
+        Args:
+            app: The wrapped application.
+            minimum_size: Smallest body, in bytes, that is compressed.
+            gzip_level: zlib compression level.
+            brotli_quality: Brotli quality.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings = available_encodings()
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve a request, compressing its response if negotiated."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate_encoding(accept_encoding, self.encodings)
+        await _CompressionResponder(self, encoding, send)(scope, receive)
+    
+    def encoder(self, encoding: str):
+        """Create the incremental encoder of a coding."""
+        if encoding == "br":
+            import brotli
+            return _BrotliEncoder(brotli, self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+
+class _CompressionResponder:
+    """Rewrites the messages of one response."""
+    
+    def __init__(self, middleware: CompressionMiddleware, encoding: Optional[str], send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Optional[Message] = None
+        self.encoder = None
+        self.passthrough = False
+    
+    async def __call__(self, scope: Scope, receive: Receive) -> None:
+        """Run the wrapped application with the rewriting send."""
+        await self.middleware.app(scope, receive, self.send_message)
+    
+    async def send_message(self, message: Message) -> None:
+        """Forward a message, compressing body chunks once the encoder is chosen."""
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether to compress
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                message["status"] in BODILESS_STATUSES or "content-encoding" in headers
+            )
+            if self.passthrough:
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+        
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+            
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if self.encoding is None:
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+            
+            self.encoder = self.middleware.encoder(self.encoding)
+            body = self.encoder.compress(body, final=not more_body)
+            headers["Content-Encoding"] = self.encoding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(body))
+            await self.send(start)
+        else:
+            body = self.encoder.compress(body, final=not more_body)
+        
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
@@ -0,0 +1,114 @@
+"""HTTP conditional request helpers: ETag, Last-Modified and 304 responses."""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable
+
+from fastapi import Request, Response
+
+# Clients may store responses but must revalidate them on every use
+CACHE_CONTROL = "no-cache"
+
+
+@dataclass(frozen=True)
+class Validator:
+    """Validators of a resource or collection representation.
+    
+    Attributes:
+        etag: The quoted entity tag.
+        last_modified: Naive UTC time of the last change.
+    """
+    etag: str
+    last_modified: datetime
+    
+    @classmethod
+    def from_version(cls, version: int, updated_at: datetime) -> "Validator":
+        """Build the validators of a row carrying version and updated_at.
+        
+        The timestamp is part of the tag, so a row deleted and recreated
+        under the same id and version does not match old cached copies.
+        
+        Args:
+            version: The row's version counter.
+            updated_at: Time the row was last bumped.
+        
+        Returns:
+            The validators.
+        """
+        return cls(etag=f'"{version}-{updated_at:%Y%m%d%H%M%S%f}"', last_modified=updated_at)
+    
+    @classmethod
+    def combine(cls, validators: Iterable["Validator"]) -> "Validator":
+        """Build the validators of a representation derived from several others.
+        
+        Args:
+            validators: Validators of the sources, in a fixed order.
+        
+        Returns:
+            Validators that change whenever any of the sources changes.
+        """
+        validators = list(validators)
+        etag = ".".join(validator.etag.strip('"') for validator in validators)
+        last_modified = max(validator.last_modified for validator in validators)
+        return cls(etag=f'"{etag}"', last_modified=last_modified)
+    
+    @property
+    def http_date(self) -> str:
+        """Last-Modified value, truncated to whole seconds as HTTP dates are."""
+        return format_datetime(self.last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def is_not_modified(request: Request, validator: Validator) -> bool:
+    """Evaluate If-None-Match, or If-Modified-Since when no entity tag is sent.
+    
+    Args:
+        request: The incoming GET request.
+        validator: The current validators of the requested representation.
+    
+    Returns:
+        True if the client's copy is current and a 304 can be sent.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison, as required for GET
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or validator.etag in tags
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    last_modified = validator.last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+    return last_modified <= since
+
+
+def set_validator_headers(response: Response, validator: Validator) -> None:
+    """Send the ETag, Last-Modified and Cache-Control headers.
+    
+    Args:
+        response: The outgoing response.
+        validator: The validators of its body.
+    """
+    response.headers["ETag"] = validator.etag
+    response.headers["Last-Modified"] = validator.http_date
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified_response(validator: Validator) -> Response:
+    """Build the bodiless 304 response confirming the client's copy.
+    
+    Args:
+        validator: The current validators.
+    
+    Returns:
+        The 304 response.
+    """
+    response = Response(status_code=304)
+    set_validator_headers(response, validator)
+    return response
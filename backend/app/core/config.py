@@ -0,0 +1,219 @@
+"""Application settings read from environment variables."""
+
+import os
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class SQLiteProfile:
+    """PRAGMA values applied to every new SQLite connection.
+    
+    A field left as None keeps the SQLite default.
+    
+    Attributes:
+        journal_mode: WAL lets readers proceed while a write is in progress.
+        synchronous: NORMAL skips the fsync on every commit in WAL mode.
+        cache_size: Page cache size; negative values are in KiB.
+        mmap_size: Bytes of the database file read through memory mapping.
+        temp_store: MEMORY keeps temporary tables and sort spills off disk.
+        busy_timeout: Milliseconds to wait for a lock before failing.
+    """
+    journal_mode: Optional[str] = None
+    synchronous: Optional[str] = None
+    cache_size: Optional[int] = None
+    mmap_size: Optional[int] = None
+    temp_store: Optional[str] = None
+    busy_timeout: Optional[int] = 5000
+
+
+SQLITE_PROFILES = {
+    # Driver defaults: rollback journal and full fsync on every commit
+    "default": SQLiteProfile(),
+    # Concurrent readers during writes, 64 MiB cache, 256 MiB memory map
+    "production": SQLiteProfile(
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        cache_size=-65536,
+        mmap_size=268435456,
+        temp_store="MEMORY",
+        busy_timeout=5000,
+    ),
+    # Bulk loads where a crash may lose the last transactions
+    "bulk": SQLiteProfile(
+        journal_mode="WAL",
+        synchronous="OFF",
+        cache_size=-262144,
+        mmap_size=1073741824,
+        temp_store="MEMORY",
+        busy_timeout=30000,
+    ),
+}
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Connection pool sizing for server databases such as PostgreSQL.
+    
+    Each API worker process holds its own pool, so the database must accept
+    workers * (pool_size + max_overflow) connections.
+    
+    Attributes:
+        pool_size: Connections kept open per process.
+        max_overflow: Extra connections opened under load and closed when returned.
+        pool_timeout: Seconds to wait for a free connection before failing.
+        pool_recycle: Seconds after which a connection is replaced, staying
+            below server and proxy idle timeouts.
+        pool_pre_ping: Test connections on checkout so ones dropped by a
+            failover or restart are replaced instead of failing a request.
+    """
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_timeout: int = 30
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Runtime configuration.
+    
+    Attributes:
+        database_url: SQLAlchemy URL of the catalog database.
+        async_database: Serve the CRUD endpoints from async routes on an
+            AsyncSession instead of sync routes in the thread pool.
+        sqlite: PRAGMAs applied when the database is SQLite.
+        pool: Connection pool used when the database is not SQLite.
+        reference_cache_ttl: Seconds genre and publisher reads stay cached;
+            0 disables the cache.
+        reference_cache_size: Maximum entries per reference data cache.
+        cache_url: Where book and author responses are cached: memory://
+            for a cache per worker process, or a redis:// URL for one cache
+            shared by every worker, whose pub/sub channel also carries
+            invalidation messages between workers.
+        entity_cache_ttl: Seconds book and author responses stay cached;
+            0 disables the cache.
+        entity_cache_size: Maximum entries per namespace of the memory cache.
+        compression: Compress responses the client accepts gzip or brotli
+            for; disable when a reverse proxy already compresses.
+        compression_min_size: Smallest response body, in bytes, that is
+            compressed.
+        request_timing: Time the SQL, ORM hydration and serialization of
+            every request, and report them in a Server-Timing header and
+            the log.
+        metrics: Record request, pool and cache metrics and serve them at
+            /metrics in the Prometheus text format.
+    """
+    database_url: str = "sqlite:///./book_catalog.db"
+    async_database: bool = False
+    sqlite: SQLiteProfile = SQLITE_PROFILES["production"]
+    pool: PoolSettings = PoolSettings()
+    reference_cache_ttl: int = 300
+    reference_cache_size: int = 1024
+    cache_url: str = "memory://"
+    entity_cache_ttl: int = 60
+    entity_cache_size: int = 10000
+    compression: bool = True
+    compression_min_size: int = 1024
+    request_timing: bool = False
+    metrics: bool = True
+
+
+def _env_int(name: str) -> Optional[int]:
+    """Read an optional integer environment variable."""
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}")
+
+
+def _env_bool(name: str) -> Optional[bool]:
+    """Read an optional boolean environment variable."""
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return None
+    if value.lower() in ("1", "true", "yes", "on"):
+        return True
+    if value.lower() in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"{name} must be a boolean, got {value!r}")
+
+
+def _without_unset(values: dict) -> dict:
+    """Drop the entries whose environment variable was not set."""
+    return {field: value for field, value in values.items() if value is not None}
+
+
+def load_settings() -> Settings:
+    """Build settings from the environment.
+    
+    DATABASE_URL selects the database and DATABASE_ASYNC enables the async
+    stack. SQLITE_PROFILE selects a preset from SQLITE_PROFILES;
+    SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS, SQLITE_CACHE_SIZE, SQLITE_MMAP_SIZE,
+    SQLITE_TEMP_STORE and SQLITE_BUSY_TIMEOUT override single values of that
+    preset. DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE and
+    DB_POOL_PRE_PING size the connection pool of server databases.
+    REFERENCE_CACHE_TTL and REFERENCE_CACHE_SIZE tune the genre and publisher
+    caches. CACHE_URL, ENTITY_CACHE_TTL and ENTITY_CACHE_SIZE configure the
+    book and author response cache. COMPRESSION and COMPRESSION_MIN_SIZE
+    control response compression. REQUEST_TIMING enables per-request timing and
+    METRICS the /metrics endpoint.
+    
+    Returns:
+        The settings.
+    
+    Raises:
+        ValueError: If a variable holds an invalid value.
+    """
+    profile_name = os.environ.get("SQLITE_PROFILE", "production")
+    if profile_name not in SQLITE_PROFILES:
+        raise ValueError(
+            f"Unknown SQLITE_PROFILE {profile_name!r}; expected one of {sorted(SQLITE_PROFILES)}"
+        )
+    
+    overrides = {
+        "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE"),
+        "synchronous": os.environ.get("SQLITE_SYNCHRONOUS"),
+        "cache_size": _env_int("SQLITE_CACHE_SIZE"),
+        "mmap_size": _env_int("SQLITE_MMAP_SIZE"),
+        "temp_store": os.environ.get("SQLITE_TEMP_STORE"),
+        "busy_timeout": _env_int("SQLITE_BUSY_TIMEOUT"),
+    }
+    for field in ("journal_mode", "synchronous", "temp_store"):
+        if overrides[field] is not None and not overrides[field].isalpha():
+            raise ValueError(f"SQLITE_{field.upper()} must be a PRAGMA keyword, got {overrides[field]!r}")
+    sqlite = replace(SQLITE_PROFILES[profile_name], **_without_unset(overrides))
+    
+    pool = PoolSettings(**_without_unset({
+        "pool_size": _env_int("DB_POOL_SIZE"),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW"),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT"),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE"),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING"),
+    }))
+    
+    return Settings(**_without_unset({
+        "database_url": os.environ.get("DATABASE_URL") or None,
+        "async_database": _env_bool("DATABASE_ASYNC"),
+        "sqlite": sqlite,
+        "pool": pool,
+        "reference_cache_ttl": _env_int("REFERENCE_CACHE_TTL"),
+        "reference_cache_size": _env_int("REFERENCE_CACHE_SIZE"),
+        "cache_url": os.environ.get("CACHE_URL") or None,
+        "entity_cache_ttl": _env_int("ENTITY_CACHE_TTL"),
+        "entity_cache_size": _env_int("ENTITY_CACHE_SIZE"),
+        "compression": _env_bool("COMPRESSION"),
+        "compression_min_size": _env_int("COMPRESSION_MIN_SIZE"),
+        "request_timing": _env_bool("REQUEST_TIMING"),
+        "metrics": _env_bool("METRICS"),
+    }))
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Return the process-wide settings, loading them on first use."""
+    return load_settings()
@@ -36,3 +36,10 @@ class ValidationException(AppException):
     
     def __init__(self, message: str):
         super().__init__(message=message, status_code=400)
+
+
+class GoneException(AppException):
+    """Exception raised when requested data has been deleted for good."""
+    
+    def __init__(self, message: str):
+        super().__init__(message=message, status_code=410)
@@ -0,0 +1,174 @@
+"""Cache invalidation messages delivered to every worker process."""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+InvalidationHandler = Callable[[Optional[Tuple[int, ...]]], None]
+
+
+@dataclass(frozen=True)
+class Invalidation:
+    """Cached entries made stale by a committed write.
+    
+    Attributes:
+        namespace: The cache namespace, e.g. "books" or "genres".
+        ids: Primary keys of the stale entries, or None for the whole namespace.
+    """
+    namespace: str
+    ids: Optional[Tuple[int, ...]] = None
+
+
+class InvalidationBus:
+    """Delivers invalidations to the caches subscribed in this process.
+    
+    Caches held in process memory subscribe to their namespace. The service
+    layer publishes an invalidation after each committed write. This base
+    class only reaches the current process; RedisInvalidationBus also
+    broadcasts to every other worker.
+    """
+    
+    def __init__(self):
+        """Initialize the bus with no subscribers."""
+        self._handlers: Dict[str, List[InvalidationHandler]] = defaultdict(list)
+    
+    def subscribe(self, namespace: str, handler: InvalidationHandler) -> None:
+        """Call a handler for every invalidation of a namespace.
+        
+        Args:
+            namespace: The cache namespace.
+            handler: Function receiving the stale ids, or None for all.
+        """
+        self._handlers[namespace].append(handler)
+    
+    def publish(self, *invalidations: Invalidation) -> None:
+        """Apply invalidations in this process and broadcast them to the others.
+        
+        Args:
+            invalidations: The invalidations to deliver.
+        """
+        for invalidation in invalidations:
+            self._deliver(invalidation)
+        self._broadcast(invalidations)
+    
+    def start(self) -> None:
+        """Start receiving invalidations from other workers."""
+    
+    def stop(self) -> None:
+        """Stop receiving invalidations from other workers."""
+    
+    def _deliver(self, invalidation: Invalidation) -> None:
+        """Call the handlers subscribed to the invalidated namespace."""
+        for handler in self._handlers.get(invalidation.namespace, ()):
+            handler(invalidation.ids)
+    
+    def _deliver_all(self) -> None:
+        """Invalidate every subscribed namespace."""
+        for namespace in list(self._handlers):
+            self._deliver(Invalidation(namespace))
+    
+    def _broadcast(self, invalidations: Tuple[Invalidation, ...]) -> None:
+        """Send invalidations to the other workers; a no-op for a single process."""
+
+
+class RedisInvalidationBus(InvalidationBus):
+    """Invalidation bus broadcasting over a Redis pub/sub channel.
+    
+    Every message carries the id of the publishing process, which ignores
+    its own messages since it applied them when publishing. Messages sent
+    while a worker is disconnected are lost, so on a connection error the
+    worker clears all of its subscribed caches.
+    
+    Attributes:
+        url: The Redis URL.
+        channel: The pub/sub channel.
+        origin: Id of this process in published messages.
+    """
+    
+    def __init__(self, url: str, channel: str = "catalog:invalidations", client=None):
+        """Initialize the bus.
+        
+        Args:
+            url: The Redis URL, e.g. redis://localhost:6379/0.
+            channel: The pub/sub channel.
+            client: Redis client to use instead of one connected to url,
+                e.g. a fakeredis.FakeRedis in tests.
+        """
+        if client is None:
+            import redis
+            
+            client = redis.Redis.from_url(url)
+        
+        super().__init__()
+        self.url = url
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self.client = client
+        self._listener: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """Subscribe to the channel from a background thread."""
+        if self._listener is not None:
+            return
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.channel: self._on_message})
+        self._listener = pubsub.run_in_thread(
+            sleep_time=1.0,
+            daemon=True,
+            exception_handler=self._on_error,
+        )
+    
+    def stop(self) -> None:
+        """Stop the listener thread."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+    
+    def _broadcast(self, invalidations: Tuple[Invalidation, ...]) -> None:
+        """Publish invalidations on the channel."""
+        if not invalidations:
+            return
+        message = {
+            "origin": self.origin,
+            "invalidations": [
+                {"namespace": invalidation.namespace, "ids": invalidation.ids}
+                for invalidation in invalidations
+            ],
+        }
+        self.client.publish(self.channel, json.dumps(message))
+    
+    def _on_message(self, message: dict) -> None:
+        """Apply the invalidations published by another worker."""
+        payload = json.loads(message["data"])
+        if payload["origin"] == self.origin:
+            return
+        for item in payload["invalidations"]:
+            ids = tuple(item["ids"]) if item["ids"] is not None else None
+            self._deliver(Invalidation(item["namespace"], ids))
+    
+    def _on_error(self, error: Exception, pubsub, thread) -> None:
+        """Clear local caches after a connection error, then let the listener reconnect."""
+        logger.warning("Invalidation listener error, clearing local caches: %s", error)
+        self._deliver_all()
+        time.sleep(1.0)
+
+
+def create_invalidation_bus(cache_url: str) -> InvalidationBus:
+    """Create the bus matching the cache backend.
+    
+    Args:
+        cache_url: The cache URL; a Redis URL broadcasts over its pub/sub.
+    
+    Returns:
+        The bus.
+    """
+    if cache_url.split("://", 1)[0] in ("redis", "rediss"):
+        return RedisInvalidationBus(cache_url)
+    return InvalidationBus()
@@ -0,0 +1,277 @@
+"""Prometheus metrics of requests, database connections and caches.
+
+MetricsMiddleware records the latency, status and concurrency of every
+HTTP request, labelled with the route template rather than the raw path so
+the number of series stays bounded. Its counters are plain integers: ASGI
+middleware runs on the event loop thread only, so no lock is needed.
+watch_engine() counts pool checkouts and SQLite lock errors, which happen
+in the threads of the sync stack and so take a short lock. Gauges such as
+the pool occupancy and cache sizes are read when /metrics is scraped.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .cache import CacheStats
+
+# Content type of the Prometheus text exposition format; Starlette adds the charset
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Upper bounds, in seconds, of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route label of requests that matched no route, such as 404s
+UNMATCHED_ROUTE = "unmatched"
+
+
+class _Histogram:
+    """Latency observations of one route, counted per bucket."""
+    
+    __slots__ = ("counts", "sum")
+    
+    def __init__(self):
+        # One count per bucket, not cumulative; the last one is +Inf
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+    
+    def observe(self, seconds: float) -> None:
+        """Count one observation in the first bucket whose bound it does not exceed."""
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.sum += seconds
+
+
+class RequestMetrics:
+    """Counters of the HTTP requests served by this process.
+    
+    Only updated from the event loop thread.
+    
+    Attributes:
+        in_flight: Requests currently being handled.
+        durations: Latency histogram per method and route.
+        responses: Completed requests per method, route and status code.
+    """
+    
+    def __init__(self):
+        self.in_flight = 0
+        self.durations: Dict[Tuple[str, str], _Histogram] = {}
+        self.responses: Dict[Tuple[str, str, int], int] = {}
+    
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        """Record a completed request.
+        
+        Args:
+            method: The HTTP method.
+            route: The path template of the matched route.
+            status: The response status code.
+            seconds: Time from the request to the end of the response body.
+        """
+        histogram = self.durations.get((method, route))
+        if histogram is None:
+            histogram = self.durations[(method, route)] = _Histogram()
+        histogram.observe(seconds)
+        key = (method, route, status)
+        self.responses[key] = self.responses.get(key, 0) + 1
+
+
+class EngineMetrics:
+    """Counters of one engine, incremented from any thread.
+    
+    Attributes:
+        name: Value of the engine label.
+        engine: The sync engine, or the sync_engine of an async one.
+        checkouts: Connections handed out by the pool.
+        sqlite_lock_errors: Statements that failed because the SQLite
+            database stayed locked for longer than busy_timeout.
+    """
+    
+    def __init__(self, name: str, engine: Engine):
+        self.name = name
+        self.engine = engine
+        self.checkouts = 0
+        self.sqlite_lock_errors = 0
+        self._lock = threading.Lock()
+    
+    def count_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        """Count a connection checked out of the pool."""
+        with self._lock:
+            self.checkouts += 1
+    
+    def count_lock_error(self, context) -> None:
+        """Count a statement failing with SQLite's database is locked error."""
+        if "locked" in str(context.original_exception):
+            with self._lock:
+                self.sqlite_lock_errors += 1
+
+
+request_metrics = RequestMetrics()
+engines: List[EngineMetrics] = []
+
+
+def watch_engine(name: str, engine: Engine) -> None:
+    """Report the pool and lock errors of an engine in the metrics.
+    
+    Args:
+        name: Value of the engine label, such as sync or async.
+        engine: A sync engine, or the sync_engine of an async one.
+    """
+    metrics = EngineMetrics(name, engine)
+    event.listen(engine.pool, "checkout", metrics.count_checkout)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "handle_error", metrics.count_lock_error)
+    engines.append(metrics)
+
+
+class MetricsMiddleware:
+    """Record the latency, status and concurrency of each HTTP request.
+    
+    The latency runs until the last body chunk is sent, so streamed
+    exports are measured in full. Requests that fail before a response
+    starts are recorded with status 500, which the server error handler
+    sends for them.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        """Initialize the middleware.
+        
+        Args:
+            app: The wrapped ASGI application.
+        """
+        self.app = app
+        # Path template of each endpoint, built on the first request
+        self._routes: Optional[Dict[Callable, str]] = None
+    
+    def _route(self, scope: Scope) -> str:
+        """Return the path template of the route a request was dispatched to."""
+        if self._routes is None:
+            self._routes = {
+                route.endpoint: route.path
+                for route in scope["app"].routes
+                if hasattr(route, "endpoint")
+            }
+        return self._routes.get(scope.get("endpoint"), UNMATCHED_ROUTE)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        status = 500
+        
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        request_metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_metrics.in_flight -= 1
+            # The router stores the matched endpoint in the scope
+            request_metrics.observe(scope["method"], self._route(scope), status, time.perf_counter() - start)
+
+
+class _Exposition:
+    """Writer of the Prometheus text exposition format."""
+    
+    def __init__(self):
+        self.lines: List[str] = []
+    
+    def family(self, name: str, type: str, help: str) -> None:
+        """Start a metric family."""
+        self.lines.append(f"# HELP {name} {help}")
+        self.lines.append(f"# TYPE {name} {type}")
+    
+    def sample(self, name: str, labels: Dict[str, str], value: float) -> None:
+        """Add one sample of the current family."""
+        if labels:
+            pairs = ",".join(f'{key}="{_escape(str(label))}"' for key, label in labels.items())
+            name = f"{name}{{{pairs}}}"
+        self.lines.append(f"{name} {value}")
+    
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_metrics(caches: Iterable[CacheStats]) -> str:
+    """Render every metric in the Prometheus text exposition format.
+    
+    Args:
+        caches: Stats of the caches to report.
+    
+    Returns:
+        The exposition text.
+    """
+    out = _Exposition()
+    
+    out.family("http_requests_in_flight", "gauge", "HTTP requests currently being handled.")
+    out.sample("http_requests_in_flight", {}, request_metrics.in_flight)
+    
+    out.family("http_requests_total", "counter", "HTTP requests completed, by method, route and status.")
+    for (method, route, status), count in sorted(request_metrics.responses.items()):
+        out.sample("http_requests_total", {"method": method, "route": route, "status": status}, count)
+    
+    out.family("http_request_duration_seconds", "histogram", "Time to serve HTTP requests, by method and route.")
+    for (method, route), histogram in sorted(request_metrics.durations.items()):
+        labels = {"method": method, "route": route}
+        cumulative = 0
+        for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), histogram.counts):
+            cumulative += count
+            out.sample("http_request_duration_seconds_bucket", {**labels, "le": bound}, cumulative)
+        out.sample("http_request_duration_seconds_sum", labels, histogram.sum)
+        out.sample("http_request_duration_seconds_count", labels, cumulative)
+    
+    out.family("db_pool_checkouts_total", "counter", "Connections checked out of the pool.")
+    for metrics in engines:
+        out.sample("db_pool_checkouts_total", {"engine": metrics.name}, metrics.checkouts)
+    
+    # Pools other than QueuePool, such as SQLite's for :memory:, have no fixed size
+    pools = [metrics for metrics in engines if isinstance(metrics.engine.pool, QueuePool)]
+    out.family("db_pool_size", "gauge", "Connections the pool keeps open.")
+    for metrics in pools:
+        out.sample("db_pool_size", {"engine": metrics.name}, metrics.engine.pool.size())
+    out.family("db_pool_checked_out", "gauge", "Connections currently checked out of the pool.")
+    for metrics in pools:
+        out.sample("db_pool_checked_out", {"engine": metrics.name}, metrics.engine.pool.checkedout())
+    out.family("db_pool_overflow", "gauge", "Connections open beyond the pool size.")
+    for metrics in pools:
+        out.sample("db_pool_overflow", {"engine": metrics.name}, max(metrics.engine.pool.overflow(), 0))
+    
+    out.family("sqlite_lock_errors_total", "counter", "Statements that failed because the database stayed locked past busy_timeout.")
+    for metrics in engines:
+        if metrics.engine.dialect.name == "sqlite":
+            out.sample("sqlite_lock_errors_total", {"engine": metrics.name}, metrics.sqlite_lock_errors)
+    
+    caches = list(caches)
+    out.family("cache_hits_total", "counter", "Cache lookups answered from the cache.")
+    for stats in caches:
+        out.sample("cache_hits_total", {"cache": stats.name}, stats.hits)
+    out.family("cache_misses_total", "counter", "Cache lookups that went to the database.")
+    for stats in caches:
+        out.sample("cache_misses_total", {"cache": stats.name}, stats.misses)
+    out.family("cache_hit_ratio", "gauge", "Share of cache lookups answered from the cache since the process started.")
+    for stats in caches:
+        lookups = stats.hits + stats.misses
+        out.sample("cache_hit_ratio", {"cache": stats.name}, stats.hits / lookups if lookups else 0.0)
+    out.family("cache_evictions_total", "counter", "Entries dropped because the cache was full.")
+    for stats in caches:
+        out.sample("cache_evictions_total", {"cache": stats.name}, stats.evictions)
+    out.family("cache_entries", "gauge", "Entries held by an in-process cache.")
+    for stats in caches:
+        out.sample("cache_entries", {"cache": stats.name}, stats.size)
+    
+    return out.text()
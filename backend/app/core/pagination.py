@@ -0,0 +1,83 @@
+"""Keyset (cursor) pagination helpers shared by repositories and routers."""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Generic, List, Optional, Tuple, TypeVar
+
+from fastapi import Response
+
+from .exceptions import ValidationException
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class SortOrder(str, Enum):
+    """Direction of a sorted list."""
+    ASC = "asc"
+    DESC = "desc"
+
+
+@dataclass
+class Page(Generic[T]):
+    """A single page of results.
+    
+    Attributes:
+        items: The records on this page.
+        next_cursor: Opaque cursor for the following page, or None on the last page.
+    """
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(sort_value: Any, id: int) -> str:
+    """Encode the sort key and id of the last row on a page into an opaque cursor.
+    
+    Args:
+        sort_value: Value of the sort column for the last row.
+        id: Primary key of the last row.
+    
+    Returns:
+        A URL-safe cursor string.
+    """
+    raw = json.dumps([sort_value, id], separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """Decode a cursor produced by encode_cursor.
+    
+    Args:
+        cursor: The opaque cursor string.
+    
+    Returns:
+        Tuple of (sort_value, id).
+    
+    Raises:
+        ValidationException: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise ValidationException("Invalid pagination cursor")
+    if not isinstance(id, int):
+        raise ValidationException("Invalid pagination cursor")
+    return sort_value, id
+
+
+def set_next_cursor_header(response: Response, page: Page) -> None:
+    """Expose the next page cursor to the client via a response header.
+    
+    Args:
+        response: The outgoing response.
+        page: The page being returned.
+    """
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
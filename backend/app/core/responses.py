@@ -0,0 +1,58 @@
+"""JSON responses serialized straight to bytes from trusted database data."""
+
+from typing import Any, List, Mapping, Optional, get_args, get_origin
+
+from fastapi import Response
+
+from .serializers import serializer_for
+
+
+def dump_json(schema: Any, content: Any) -> bytes:
+    """Serialize ORM objects, rows or schema instances as JSON of a schema.
+    
+    Args:
+        schema: The response schema, e.g. BookResponse or List[BookSummary].
+        content: Data read through attributes, as with from_attributes.
+    
+    Returns:
+        The UTF-8 encoded JSON document.
+    """
+    if get_origin(schema) in (list, List):
+        return serializer_for(get_args(schema)[0]).dump_json_many(content)
+    return serializer_for(schema).dump_json(content)
+
+
+class ModelResponse(Response):
+    """JSON response rendered through a schema's compiled serializer.
+    
+    For a response_model, FastAPI validates the endpoint's return value,
+    dumps it to dicts and lists and encodes those with json.dumps. This
+    response reads the schema's fields from the database objects without
+    validating them again and lets pydantic-core write the JSON in one
+    native pass, several times faster on long lists.
+    
+    Endpoints returning it keep response_model for the OpenAPI schema.
+    """
+    media_type = "application/json"
+    
+    def __init__(
+        self,
+        content: Any,
+        schema: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        """Initialize the response.
+        
+        Args:
+            content: ORM objects, rows or schema instances to serialize.
+            schema: The response schema.
+            status_code: The HTTP status code.
+            headers: Extra response headers.
+        """
+        self.schema = schema
+        super().__init__(content, status_code=status_code, headers=headers)
+    
+    def render(self, content: Any) -> bytes:
+        """Serialize the content through the schema."""
+        return dump_json(self.schema, content)
@@ -0,0 +1,85 @@
+"""Serializers writing trusted database data as schema JSON without validation."""
+
+from functools import lru_cache
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from .timing import serialization_timer
+
+
+class ModelSerializer:
+    """Compiled serializer of one response schema.
+    
+    Validating ORM objects and rows against a from_attributes schema checks
+    every field of data that was read from typed columns and already passed
+    validation on the way in. This serializer inspects the schema's fields
+    once, then copies the attributes of each source into a dict in field
+    order, recursing into nested schemas, and lets pydantic-core encode the
+    result. For the column types of the catalog the JSON is identical to
+    validating and dumping, at a fraction of the cost.
+    
+    Only data coming from the database should be serialized this way; a
+    value of the wrong type is written as it is instead of being rejected.
+    
+    Attributes:
+        schema: The response schema.
+    """
+    
+    def __init__(self, schema: Type[BaseModel]):
+        """Compile the serializer of a schema.
+        
+        Args:
+            schema: The response schema, whose nested schemas are compiled too.
+        """
+        self.schema = schema
+        self._fields: List[Tuple[str, Optional[Callable[[Any], Any]]]] = [
+            (name, _nested_converter(field.annotation))
+            for name, field in schema.model_fields.items()
+        ]
+    
+    def to_dict(self, source: Any) -> dict:
+        """Read the schema's fields from an ORM object, row or schema instance."""
+        values = {}
+        for name, convert in self._fields:
+            value = getattr(source, name)
+            values[name] = value if convert is None or value is None else convert(value)
+        return values
+    
+    def dump_json(self, source: Any) -> bytes:
+        """Serialize one source as JSON of the schema."""
+        with serialization_timer():
+            return to_json(self.to_dict(source))
+    
+    def dump_json_many(self, sources: Iterable[Any]) -> bytes:
+        """Serialize several sources as a JSON array of the schema."""
+        with serialization_timer():
+            return to_json([self.to_dict(source) for source in sources])
+
+
+@lru_cache(maxsize=None)
+def serializer_for(schema: Type[BaseModel]) -> ModelSerializer:
+    """Return the process-wide serializer of a schema, compiling it on first use."""
+    return ModelSerializer(schema)
+
+
+def _nested_converter(annotation: Any) -> Optional[Callable[[Any], Any]]:
+    """Converter of a field holding a schema or a list of schemas, None for plain values."""
+    if get_origin(annotation) is Union:
+        # Optional[X] is Union[X, None]; None values are passed through by to_dict
+        members = [member for member in get_args(annotation) if member is not type(None)]
+        if len(members) != 1:
+            return None
+        annotation = members[0]
+    
+    many = get_origin(annotation) in (list, List)
+    if many:
+        annotation = get_args(annotation)[0]
+    if not (isinstance(annotation, type) and issubclass(annotation, BaseModel)):
+        return None
+    
+    to_dict = serializer_for(annotation).to_dict
+    if many:
+        return lambda items: [to_dict(item) for item in items]
+    return to_dict
@@ -0,0 +1,208 @@
+"""Per-request timing of SQL, ORM hydration and serialization.
+
+When REQUEST_TIMING is enabled, TimingMiddleware opens a RequestTimings
+for each request. Engine and session event hooks add the time spent in
+the database driver and in building ORM objects, and the serializers add
+the time spent writing JSON. The totals are sent in the Server-Timing
+header, which browser developer tools display next to the request, and
+logged as one JSON line per request. When disabled, neither the
+middleware nor the hooks are installed.
+"""
+
+import json
+import logging
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import ContextManager, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.util import immutabledict
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Timings of the request being handled; copied into the threads running sync endpoints
+_current: ContextVar[Optional["RequestTimings"]] = ContextVar("request_timings", default=None)
+
+_NOT_TIMED = nullcontext()
+
+
+@dataclass
+class RequestTimings:
+    """Time spent in each phase of one request, in seconds.
+    
+    Attributes:
+        queries: Number of SQL statements executed.
+        sql: Time the database driver spent executing them.
+        hydration: Time spent turning result rows into ORM objects,
+            including statement compilation but not the SQL of eager loads.
+        serialization: Time spent writing response JSON.
+    """
+    queries: int = 0
+    sql: float = 0.0
+    hydration: float = 0.0
+    serialization: float = 0.0
+    # Nesting of ORM statements, so the queries of eager loaders are not timed twice
+    orm_depth: int = field(default=0, repr=False)
+    
+    def server_timing(self, total: float) -> str:
+        """Format the timings as a Server-Timing header value.
+        
+        Args:
+            total: Seconds since the request started.
+        
+        Returns:
+            The header value, with durations in milliseconds.
+        """
+        return ", ".join([
+            f'db;dur={self.sql * 1000:.2f};desc="SQL, {self.queries} queries"',
+            f'hydration;dur={self.hydration * 1000:.2f};desc="ORM hydration"',
+            f'serialization;dur={self.serialization * 1000:.2f};desc="JSON serialization"',
+            f'total;dur={total * 1000:.2f}',
+        ])
+
+
+class _SerializationTimer:
+    """Adds the time spent in its block to the serialization of a request."""
+    
+    def __init__(self, timings: RequestTimings):
+        self.timings = timings
+    
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+    
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.timings.serialization += time.perf_counter() - self.start
+
+
+def serialization_timer() -> ContextManager[None]:
+    """Time a serialization against the current request, if it is being timed."""
+    timings = _current.get()
+    return _NOT_TIMED if timings is None else _SerializationTimer(timings)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count and time the statements an engine executes for timed requests.
+    
+    Args:
+        engine: A sync engine, or the sync_engine of an async one.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def instrument_sessions() -> None:
+    """Time the hydration of ORM results in every session, async ones included."""
+    event.listen(Session, "do_orm_execute", _time_orm_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Note when a statement is sent to the driver."""
+    if _current.get() is not None:
+        context._timing_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Add a statement's execution time to the current request."""
+    timings = _current.get()
+    if timings is not None:
+        timings.queries += 1
+        timings.sql += time.perf_counter() - context._timing_start
+
+
+def _time_orm_execute(orm_execute_state: ORMExecuteState):
+    """Run an ORM SELECT and hydrate its rows at once, timing the hydration.
+    
+    ORM results build their objects lazily as they are iterated. Freezing
+    the result loads every row inside this hook, so the time spent outside
+    the driver is hydration. Loads of relationships are part of the
+    hydration of their parent statement, and streamed results are left
+    alone, as freezing them would load everything into memory.
+    """
+    if orm_execute_state.is_relationship_load and "yield_per" in orm_execute_state.local_execution_options:
+        # With a do_orm_execute hook installed, the loaders of a streamed
+        # result inherit its yield_per, which their unique() rejects; without
+        # one they never see it
+        orm_execute_state.local_execution_options = immutabledict({
+            key: value
+            for key, value in orm_execute_state.local_execution_options.items()
+            if key != "yield_per"
+        })
+    
+    timings = _current.get()
+    options = orm_execute_state.execution_options
+    if (
+        timings is None
+        or timings.orm_depth
+        or not orm_execute_state.is_select
+        or orm_execute_state.is_relationship_load
+        or options.get("yield_per")
+        or orm_execute_state.load_options._yield_per
+        or options.get("stream_results")
+    ):
+        return None
+    
+    sql = timings.sql
+    start = time.perf_counter()
+    timings.orm_depth += 1
+    try:
+        frozen = orm_execute_state.invoke_statement().freeze()
+    finally:
+        timings.orm_depth -= 1
+    timings.hydration += time.perf_counter() - start - (timings.sql - sql)
+    return frozen()
+
+
+class TimingMiddleware:
+    """Time each HTTP request and report it in Server-Timing and the log.
+    
+    The header is added when the response starts, so it covers the work
+    done before the first byte; the log line is written once the body is
+    sent.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        """Initialize the middleware.
+        
+        Args:
+            app: The wrapped ASGI application.
+        """
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        status = None
+        
+        async def send_with_timings(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.server_timing(time.perf_counter() - start))
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            _current.reset(token)
+            logger.info(json.dumps({
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                "queries": timings.queries,
+                "sql_ms": round(timings.sql * 1000, 2),
+                "hydration_ms": round(timings.hydration * 1000, 2),
+                "serialization_ms": round(timings.serialization * 1000, 2),
+            }))
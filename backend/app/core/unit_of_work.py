@@ -0,0 +1,72 @@
+"""Unit of work: the transaction scope of a service operation."""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+class UnitOfWork:
+    """Commit everything a service operation wrote in one transaction.
+    
+    Repositories only flush their writes, so the rows, versions, change log
+    entries and derived data of an operation are committed together when
+    the block exits, with a single commit, or rolled back together if it
+    raises. Cache invalidations are published after the block, once the
+    write is visible to other sessions.
+    
+    Usage:
+        with UnitOfWork(self.db):
+            self.versions.bump_collection(Genre.__tablename__)
+            genre = self.repository.create(genre)
+        publish_invalidations(Invalidation(GENRES))
+    
+    Attributes:
+        db: The session whose transaction is committed.
+    """
+    
+    def __init__(self, db: Session):
+        """Initialize the unit of work.
+        
+        Args:
+            db: The database session.
+        """
+        self.db = db
+    
+    def __enter__(self) -> "UnitOfWork":
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        """Commit on success, roll back on error."""
+        if exc_type is not None:
+            self.db.rollback()
+            return
+        try:
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+
+class AsyncUnitOfWork:
+    """Async variant of UnitOfWork for an AsyncSession."""
+    
+    def __init__(self, db: AsyncSession):
+        """Initialize the unit of work.
+        
+        Args:
+            db: The async database session.
+        """
+        self.db = db
+    
+    async def __aenter__(self) -> "AsyncUnitOfWork":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        """Commit on success, roll back on error."""
+        if exc_type is not None:
+            await self.db.rollback()
+            return
+        try:
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
@@ -1,12 +1,117 @@
-from sqlalchemy import create_engine
+from dataclasses import asdict, fields
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-DATABASE_URL = "sqlite:///./book_catalog.db"
+from .core.config import Settings, SQLiteProfile, get_settings
+from .core.metrics import watch_engine
+from .core.timing import instrument_engine, instrument_sessions
+
+# Async DBAPI driver used for each database backend
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+def create_database_engine(settings: Settings) -> Engine:
+    """Create the engine for the configured database.
+    
+    SQLite connections get the configured PRAGMA profile. Server databases
+    such as PostgreSQL get a QueuePool sized by the pool settings, with
+    pre-ping and recycling so replicas survive restarts and idle timeouts.
+    
+    Args:
+        settings: The runtime configuration.
+    
+    Returns:
+        The engine.
+    """
+    url = make_url(settings.database_url)
+    if url.get_backend_name() != "sqlite":
+        return create_engine(url, **asdict(settings.pool))
+    
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    _apply_sqlite_profile(engine, settings.sqlite)
+    return engine
+
+
+def create_async_database_engine(settings: Settings) -> AsyncEngine:
+    """Create an async engine for the configured database.
+    
+    The driver in DATABASE_URL is replaced by the backend's async driver,
+    so the same URL serves both stacks. Pooling and PRAGMAs are configured
+    as for the sync engine.
+    
+    Args:
+        settings: The runtime configuration.
+    
+    Returns:
+        The async engine.
+    
+    Raises:
+        ValueError: If the database has no supported async driver.
+    """
+    url = make_url(settings.database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    url = url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    
+    if backend != "sqlite":
+        return create_async_engine(url, **asdict(settings.pool))
+    
+    engine = create_async_engine(url)
+    _apply_sqlite_profile(engine.sync_engine, settings.sqlite)
+    return engine
+
+
+def _apply_sqlite_profile(engine: Engine, profile: SQLiteProfile) -> None:
+    """Register a listener applying the PRAGMAs of a profile to new connections."""
+    
+    @event.listens_for(engine, "connect")
+    def apply_sqlite_pragmas(dbapi_connection, connection_record):
+        """Apply the configured SQLite profile to every new connection."""
+        cursor = dbapi_connection.cursor()
+        for field in fields(profile):
+            value = getattr(profile, field.name)
+            if value is not None:
+                cursor.execute(f"PRAGMA {field.name} = {value}")
+        cursor.close()
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+settings = get_settings()
+DATABASE_URL = settings.database_url
+
+engine = create_database_engine(settings)
+# Entities written by a unit of work are returned after its commit; they keep
+# the state of the flush instead of being reloaded attribute by attribute
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 Base = declarative_base()
 
+# Request timing hooks are only installed when enabled, so they cost nothing otherwise
+if settings.request_timing:
+    instrument_engine(engine)
+    instrument_sessions()
+# Pool checkouts and SQLite lock errors are counted for /metrics
+if settings.metrics:
+    watch_engine("sync", engine)
+
+# The async stack is only built when enabled, so its drivers stay optional
+async_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal: Optional[async_sessionmaker] = None
+if settings.async_database:
+    async_engine = create_async_database_engine(settings)
+    # Objects stay usable after commit; relationships are never lazy loaded
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    if settings.request_timing:
+        instrument_engine(async_engine.sync_engine)
+    if settings.metrics:
+        watch_engine("async", async_engine.sync_engine)
+
 
 def get_db():
     """Dependency to get database session."""
@@ -15,3 +120,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency to get an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
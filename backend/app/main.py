@@ -1,22 +1,35 @@
 """Main FastAPI application module."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from .database import engine, Base, SessionLocal
-from .seed import seed_database
-from .routers import authors, books, genres, publishers
+from .routers import authors, books, genres, publishers, export, search, changes, metrics
+from .caching import invalidation_bus
+from .core.compression import CompressionMiddleware
 from .core.exceptions import AppException
+from .core.metrics import MetricsMiddleware
+from .core.pagination import NEXT_CURSOR_HEADER
+from .core.timing import TimingMiddleware
+from .database import settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Receive cache invalidations from other workers while the app runs."""
+    invalidation_bus.start()
+    yield
+    invalidation_bus.stop()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Book Catalog API",
     description="REST API for managing a catalog of books, authors, publishers, and genres",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 
@@ -41,23 +54,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Last-Modified", "Server-Timing"],
 )
 
-# Include routers
-app.include_router(authors.router)
-app.include_router(books.router)
-app.include_router(genres.router)
-app.include_router(publishers.router)
-
-
-@app.on_event("startup")
-def startup_event():
-    """Seed database on startup."""
-    db = SessionLocal()
-    try:
-        seed_database(db)
-    finally:
-        db.close()
+# Compress large responses with gzip, or brotli when the brotli package is installed
+if settings.compression:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_size)
+
+# Report the SQL, hydration and serialization time of each request
+if settings.request_timing:
+    app.add_middleware(TimingMiddleware)
+
+# Count requests and their latency per route; outermost, so compression is included
+if settings.metrics:
+    app.add_middleware(MetricsMiddleware)
+
+# Include routers; the CRUD routers have an async variant selected by DATABASE_ASYNC
+for crud in (authors, books, genres, publishers):
+    app.include_router(crud.async_router if settings.async_database else crud.router)
+app.include_router(export.router)
+app.include_router(search.router)
+app.include_router(changes.router)
+if settings.metrics:
+    app.include_router(metrics.router)
 
 
 @app.get("/", tags=["Health"])
@@ -0,0 +1,45 @@
+"""Versioned schema migrations.
+
+Migrations run from a separate command rather than at application import,
+so API workers start without touching the schema:
+    
+    python -m app.cli migrate
+
+Applied versions are recorded in the schema_migrations table. New
+migrations are added as a module under ``versions`` and listed below.
+"""
+
+from .runner import Migration, applied_versions, migrate, pending
+from .versions import (
+    v0001_initial_schema,
+    v0002_secondary_indexes,
+    v0003_search_index,
+    v0004_book_isbn_publication_year,
+    v0005_entity_versions,
+    v0006_change_log,
+    v0007_book_published_date_index,
+    v0008_book_facet_counts,
+    v0009_book_title_prefix_index,
+    v0010_change_log_visibility,
+)
+
+MIGRATIONS = [
+    Migration.from_module(v0001_initial_schema),
+    Migration.from_module(v0002_secondary_indexes),
+    Migration.from_module(v0003_search_index),
+    Migration.from_module(v0004_book_isbn_publication_year),
+    Migration.from_module(v0005_entity_versions),
+    Migration.from_module(v0006_change_log),
+    Migration.from_module(v0007_book_published_date_index),
+    Migration.from_module(v0008_book_facet_counts),
+    Migration.from_module(v0009_book_title_prefix_index),
+    Migration.from_module(v0010_change_log_visibility),
+]
+
+__all__ = [
+    "MIGRATIONS",
+    "Migration",
+    "applied_versions",
+    "migrate",
+    "pending",
+]
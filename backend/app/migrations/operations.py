@@ -0,0 +1,87 @@
+"""Building blocks for online-friendly migrations.
+
+Each helper is idempotent, so a migration interrupted half way can simply
+be run again.
+"""
+
+from sqlalchemy import Column, Index, Table, func, inspect, select
+from sqlalchemy.engine import Engine
+
+# Rows touched per backfill transaction
+BACKFILL_BATCH_SIZE = 10000
+
+
+def add_column(engine: Engine, table: Table, column: Column) -> None:
+    """Add a nullable column unless it already exists.
+    
+    Adding a nullable column without a default is a metadata-only change on
+    both SQLite and PostgreSQL, so it does not rewrite or lock the table.
+    
+    Args:
+        engine: The database engine.
+        table: The table to alter.
+        column: The column to add; must be nullable.
+    """
+    existing = {c["name"] for c in inspect(engine).get_columns(table.name)}
+    if column.name in existing:
+        return
+    column_type = column.type.compile(dialect=engine.dialect)
+    with engine.begin() as connection:
+        connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+
+
+def create_index(engine: Engine, index: Index) -> None:
+    """Create an index unless it already exists.
+    
+    On PostgreSQL the index is built with CREATE INDEX CONCURRENTLY so
+    writes keep flowing while it builds.
+    
+    Args:
+        engine: The database engine.
+        index: The index to create.
+    """
+    existing = {i["name"] for i in inspect(engine).get_indexes(index.table.name)}
+    if index.name in existing:
+        return
+    if engine.dialect.name == "postgresql":
+        # Build a concurrent copy, leaving the model's index untouched for create_all
+        options = {key: value for key, value in index.kwargs.items() if key != "postgresql_concurrently"}
+        concurrent = Index(index.name, *index.expressions, unique=index.unique, postgresql_concurrently=True, **options)
+        # Indexing the table's columns attaches the copy to the table; detach it again
+        index.table.indexes.discard(concurrent)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            concurrent.create(bind=connection)
+    else:
+        with engine.begin() as connection:
+            index.create(bind=connection)
+
+
+def backfill(engine: Engine, table: Table, values: dict, where=None, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """Update a table in primary key ranges, committing after each range.
+    
+    Short transactions keep locks brief so the catalog stays writable
+    while large tables are backfilled.
+    
+    Args:
+        engine: The database engine.
+        table: The table to update; must have an integer ``id`` primary key.
+        values: Column values or SQL expressions to set.
+        where: Optional extra condition limiting the rows to update.
+        batch_size: Width of each primary key range.
+    
+    Returns:
+        Number of rows updated.
+    """
+    with engine.connect() as connection:
+        low, high = connection.execute(select(func.min(table.c.id), func.max(table.c.id))).one()
+    if low is None:
+        return 0
+    
+    updated = 0
+    for start in range(low, high + 1, batch_size):
+        statement = table.update().where(table.c.id >= start, table.c.id < start + batch_size)
+        if where is not None:
+            statement = statement.where(where)
+        with engine.begin() as connection:
+            updated += connection.execute(statement.values(**values)).rowcount
+    return updated
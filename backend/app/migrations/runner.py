@@ -0,0 +1,106 @@
+"""Migration runner that applies versions in order and records them."""
+
+from dataclasses import dataclass
+from datetime import datetime
+from types import ModuleType
+from typing import Callable, List, Optional, Set
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select
+from sqlalchemy.engine import Engine
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A single schema version.
+    
+    Attributes:
+        version: Position in the migration order; never reused.
+        name: Short description of the change.
+        upgrade: Function applying the change. It receives the engine and
+            manages its own transactions, so long backfills can commit in
+            batches and PostgreSQL indexes can be built concurrently.
+    """
+    version: int
+    name: str
+    upgrade: Callable[[Engine], None]
+    
+    @classmethod
+    def from_module(cls, module: ModuleType) -> "Migration":
+        """Build a migration from a module defining VERSION, NAME and upgrade()."""
+        return cls(version=module.VERSION, name=module.NAME, upgrade=module.upgrade)
+
+
+def applied_versions(engine: Engine) -> Set[int]:
+    """Return the versions already applied to the database.
+    
+    Args:
+        engine: The database engine.
+    
+    Returns:
+        Set of applied version numbers.
+    """
+    _metadata.create_all(bind=engine)
+    with engine.connect() as connection:
+        return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def pending(engine: Engine, migrations: List[Migration], target: Optional[int] = None) -> List[Migration]:
+    """Return the migrations that still need to run, in order.
+    
+    Args:
+        engine: The database engine.
+        migrations: All known migrations.
+        target: Highest version to include; defaults to the latest.
+    
+    Returns:
+        The pending migrations.
+    """
+    applied = applied_versions(engine)
+    return [
+        migration for migration in sorted(migrations, key=lambda m: m.version)
+        if migration.version not in applied and (target is None or migration.version <= target)
+    ]
+
+
+def migrate(
+    engine: Engine,
+    migrations: List[Migration],
+    target: Optional[int] = None,
+    on_apply: Optional[Callable[[Migration], None]] = None
+) -> List[Migration]:
+    """Apply pending migrations in order.
+    
+    Each version is recorded only after its upgrade completes. Upgrades are
+    written to be idempotent, so an interrupted run can be repeated.
+    
+    Args:
+        engine: The database engine.
+        migrations: All known migrations.
+        target: Highest version to apply; defaults to the latest.
+        on_apply: Optional callback invoked before each migration runs.
+    
+    Returns:
+        The migrations that were applied.
+    """
+    to_apply = pending(engine, migrations, target)
+    for migration in to_apply:
+        if on_apply:
+            on_apply(migration)
+        migration.upgrade(engine)
+        with engine.begin() as connection:
+            connection.execute(schema_migrations.insert().values(
+                version=migration.version,
+                name=migration.name,
+                applied_at=datetime.utcnow(),
+            ))
+    return to_apply
@@ -0,0 +1 @@
+"""Schema migration versions, one module per version."""
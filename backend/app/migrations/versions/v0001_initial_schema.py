@@ -0,0 +1,65 @@
+"""Create the catalog tables as they existed before versioned migrations.
+
+The table definitions are frozen here rather than taken from app.models,
+so later model changes are expressed only by later migrations. Databases
+created by the old create_all startup already have these tables and are
+left untouched.
+"""
+
+from sqlalchemy import Column, Date, ForeignKey, Integer, MetaData, String, Table, Text
+from sqlalchemy.engine import Engine
+
+VERSION = 1
+NAME = "initial schema"
+
+metadata = MetaData()
+
+Table(
+    "authors",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(100), nullable=False),
+    Column("surname", String(100), nullable=False),
+    Column("birthyear", Integer, nullable=True),
+)
+
+Table(
+    "publishers",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(200), nullable=False, unique=True),
+    Column("website", String(500), nullable=True),
+    Column("description", Text, nullable=True),
+    Column("creation_date", Date, nullable=True),
+)
+
+Table(
+    "genres",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(100), nullable=False, unique=True),
+    Column("description", Text, nullable=True),
+)
+
+Table(
+    "books",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String(300), nullable=False),
+    Column("edition", String(50), nullable=True),
+    Column("published_date", Date, nullable=True),
+    Column("publisher_id", Integer, ForeignKey("publishers.id"), nullable=True),
+    Column("genre_id", Integer, ForeignKey("genres.id"), nullable=True),
+)
+
+Table(
+    "book_authors",
+    metadata,
+    Column("book_id", Integer, ForeignKey("books.id"), primary_key=True),
+    Column("author_id", Integer, ForeignKey("authors.id"), primary_key=True),
+)
+
+
+def upgrade(engine: Engine) -> None:
+    """Create any catalog table that does not exist yet."""
+    metadata.create_all(bind=engine, checkfirst=True)
@@ -0,0 +1,29 @@
+"""Index foreign keys, the reverse book_authors key and name lookups."""
+
+from sqlalchemy import Index, MetaData, Table
+from sqlalchemy.engine import Engine
+
+from ..operations import create_index
+
+VERSION = 2
+NAME = "secondary indexes"
+
+# (index name, table, columns)
+INDEXES = [
+    ("ix_books_genre_id", "books", ["genre_id"]),
+    ("ix_books_publisher_id", "books", ["publisher_id"]),
+    ("ix_books_title", "books", ["title"]),
+    ("ix_authors_name", "authors", ["name"]),
+    ("ix_book_authors_author_id_book_id", "book_authors", ["author_id", "book_id"]),
+]
+
+
+def upgrade(engine: Engine) -> None:
+    """Create each index that is missing, then refresh planner statistics."""
+    metadata = MetaData()
+    for name, table_name, columns in INDEXES:
+        table = Table(table_name, metadata, autoload_with=engine)
+        create_index(engine, Index(name, *(table.c[column] for column in columns)))
+    
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
@@ -0,0 +1,121 @@
+"""Create and populate the full-text search tables.
+
+The DDL and the documents are frozen here rather than taken from the
+search repository, so later changes to the index are expressed only by
+later migrations. On SQLite the tables are FTS5 virtual tables; on
+PostgreSQL they hold one weighted tsvector per row with a GIN index.
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+VERSION = 3
+NAME = "search index"
+
+# One denormalized document per book and one per author, keyed by their ids
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+        title, edition, authors, genre, publisher,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS authors_fts USING fts5(
+        name, surname,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+]
+
+# Text search configuration folding diacritics like the FTS5 tokenizer;
+# needs the unaccent extension, otherwise accents are kept
+POSTGRESQL_SEARCH_CONFIGURATION_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "CREATE TEXT SEARCH CONFIGURATION catalog_search (COPY = simple)",
+    "ALTER TEXT SEARCH CONFIGURATION catalog_search ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple",
+]
+
+# The key column is named rowid like the FTS5 one
+POSTGRESQL_DDL = [
+    "CREATE TABLE IF NOT EXISTS books_fts (rowid integer PRIMARY KEY, document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_books_fts_document ON books_fts USING gin (document)",
+    "CREATE TABLE IF NOT EXISTS authors_fts (rowid integer PRIMARY KEY, document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_authors_fts_document ON authors_fts USING gin (document)",
+]
+
+AUTHOR_NAMES_AGGREGATE = {
+    "sqlite": "group_concat(a.name || ' ' || a.surname, ' ')",
+    "postgresql": "string_agg(a.name || ' ' || a.surname, ' ')",
+}
+
+BOOK_DOCUMENTS_SELECT = """
+SELECT
+    b.id,
+    b.title,
+    coalesce(b.edition, ''),
+    coalesce((
+        SELECT {author_names}
+        FROM book_authors ba JOIN authors a ON a.id = ba.author_id
+        WHERE ba.book_id = b.id
+    ), ''),
+    coalesce(g.name, ''),
+    coalesce(p.name, '')
+FROM books b
+LEFT JOIN genres g ON g.id = b.genre_id
+LEFT JOIN publishers p ON p.id = b.publisher_id
+"""
+
+SQLITE_POPULATE = [
+    "INSERT INTO books_fts(rowid, title, edition, authors, genre, publisher) "
+    + BOOK_DOCUMENTS_SELECT.format(author_names=AUTHOR_NAMES_AGGREGATE["sqlite"]),
+    "INSERT INTO authors_fts(rowid, name, surname) SELECT id, name, surname FROM authors",
+]
+
+# Weights: title A, authors B, genre and publisher C, edition D
+POSTGRESQL_POPULATE = [
+    """
+    INSERT INTO books_fts(rowid, document)
+    SELECT
+        id,
+        setweight(to_tsvector('catalog_search', title), 'A')
+            || setweight(to_tsvector('catalog_search', authors), 'B')
+            || setweight(to_tsvector('catalog_search', genre || ' ' || publisher), 'C')
+            || setweight(to_tsvector('catalog_search', edition), 'D')
+    FROM ({documents}) AS documents(id, title, edition, authors, genre, publisher)
+    """.format(documents=BOOK_DOCUMENTS_SELECT.format(author_names=AUTHOR_NAMES_AGGREGATE["postgresql"])),
+    "INSERT INTO authors_fts(rowid, document) SELECT id, to_tsvector('catalog_search', name || ' ' || surname) FROM authors",
+]
+
+
+def upgrade(engine: Engine) -> None:
+    """Create the books_fts and authors_fts tables and index existing rows."""
+    dialect = engine.dialect.name
+    if dialect not in AUTHOR_NAMES_AGGREGATE:
+        raise ValueError(f"Full-text search is not supported on {dialect}")
+    postgresql = dialect == "postgresql"
+    
+    with engine.begin() as connection:
+        exists = inspect(connection).has_table("books_fts")
+        if postgresql:
+            _create_search_configuration(connection)
+        for ddl in POSTGRESQL_DDL if postgresql else SQLITE_DDL:
+            connection.execute(text(ddl))
+        if not exists:
+            for statement in POSTGRESQL_POPULATE if postgresql else SQLITE_POPULATE:
+                connection.execute(text(statement))
+
+
+def _create_search_configuration(connection: Connection) -> None:
+    """Create the catalog_search configuration, without unaccent if it is unavailable."""
+    if connection.execute(text("SELECT 1 FROM pg_ts_config WHERE cfgname = 'catalog_search'")).first():
+        return
+    try:
+        with connection.begin_nested():
+            for ddl in POSTGRESQL_SEARCH_CONFIGURATION_DDL:
+                connection.execute(text(ddl))
+    except DBAPIError:
+        connection.execute(text("CREATE TEXT SEARCH CONFIGURATION catalog_search (COPY = simple)"))
@@ -0,0 +1,31 @@
+"""Add isbn and publication_year to books.
+
+Both columns are nullable so adding them does not rewrite the table.
+publication_year is backfilled from published_date in short batches, and
+the isbn index is built concurrently on PostgreSQL.
+"""
+
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, extract
+from sqlalchemy.engine import Engine
+
+from ..operations import add_column, backfill, create_index
+
+VERSION = 4
+NAME = "book isbn and publication year"
+
+
+def upgrade(engine: Engine) -> None:
+    """Add the columns, backfill publication_year and index isbn."""
+    metadata = MetaData()
+    books = Table("books", metadata, autoload_with=engine)
+    add_column(engine, books, Column("isbn", String(20), nullable=True))
+    add_column(engine, books, Column("publication_year", Integer, nullable=True))
+    
+    books = Table("books", MetaData(), autoload_with=engine)
+    backfill(
+        engine,
+        books,
+        values={"publication_year": extract("year", books.c.published_date)},
+        where=books.c.published_date.isnot(None) & books.c.publication_year.is_(None),
+    )
+    create_index(engine, Index("ix_books_isbn", books.c.isbn))
@@ -0,0 +1,55 @@
+"""Add version and updated_at to the catalog tables, and collection versions.
+
+The columns back the ETag and Last-Modified headers of the GET endpoints.
+They are added as nullable columns and backfilled in short batches, and
+the collection_versions table gets one row per list endpoint.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, select
+from sqlalchemy.engine import Engine
+
+from ..operations import add_column, backfill
+
+VERSION = 5
+NAME = "entity versions"
+
+TABLES = ["authors", "publishers", "genres", "books"]
+
+metadata = MetaData()
+
+collection_versions = Table(
+    "collection_versions",
+    metadata,
+    Column("name", String(50), primary_key=True),
+    Column("version", Integer, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+
+def upgrade(engine: Engine) -> None:
+    """Add and backfill the version columns, then seed the collection versions."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    for table_name in TABLES:
+        table = Table(table_name, MetaData(), autoload_with=engine)
+        add_column(engine, table, Column("version", Integer, nullable=True))
+        add_column(engine, table, Column("updated_at", DateTime, nullable=True))
+        
+        table = Table(table_name, MetaData(), autoload_with=engine)
+        backfill(
+            engine,
+            table,
+            values={"version": 1, "updated_at": now},
+            where=table.c.version.is_(None),
+        )
+    
+    metadata.create_all(bind=engine, checkfirst=True)
+    with engine.begin() as connection:
+        existing = set(connection.execute(select(collection_versions.c.name)).scalars())
+        rows = [
+            {"name": name, "version": 1, "updated_at": now}
+            for name in TABLES if name not in existing
+        ]
+        if rows:
+            connection.execute(insert(collection_versions), rows)
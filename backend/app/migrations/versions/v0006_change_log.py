@@ -0,0 +1,30 @@
+"""Create the change log behind the GET /changes delta feed.
+
+AUTOINCREMENT keeps SQLite from reusing the ids of entries deleted by
+`python -m app.cli prune-changes`, since clients hold them as sync tokens. Existing rows are not logged; clients
+start with a full download and then follow the feed.
+"""
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table
+from sqlalchemy.engine import Engine
+
+VERSION = 6
+NAME = "change log"
+
+metadata = MetaData()
+
+Table(
+    "changes",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("collection", String(50), nullable=False),
+    Column("entity_id", Integer, nullable=False),
+    Column("operation", String(10), nullable=False),
+    Column("changed_at", DateTime, nullable=False),
+    sqlite_autoincrement=True,
+)
+
+
+def upgrade(engine: Engine) -> None:
+    """Create the changes table."""
+    metadata.create_all(bind=engine, checkfirst=True)
@@ -0,0 +1,24 @@
+"""Index books by published date for the sorted and date-filtered book list.
+
+The list orders NULL dates before every value, which is SQLite's native
+order. PostgreSQL puts NULLs last by default, so there the index is
+declared NULLS FIRST; scanned backwards it then serves the descending
+order as well. The index is built concurrently on PostgreSQL.
+"""
+
+from sqlalchemy import Index, MetaData, Table
+from sqlalchemy.engine import Engine
+
+from ..operations import create_index
+
+VERSION = 7
+NAME = "book published date index"
+
+
+def upgrade(engine: Engine) -> None:
+    """Create the (published_date, id) index."""
+    books = Table("books", MetaData(), autoload_with=engine)
+    published_date = books.c.published_date
+    if engine.dialect.name == "postgresql":
+        published_date = published_date.asc().nulls_first()
+    create_index(engine, Index("ix_books_published_date_id", published_date, books.c.id))
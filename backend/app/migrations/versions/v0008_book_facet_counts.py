@@ -0,0 +1,65 @@
+"""Create and populate the book facet counts behind GET /books/facets.
+
+The counts are computed from the existing books in one INSERT ... SELECT;
+from then on book writes keep them up to date. The tables and facet names
+are frozen here rather than taken from the repositories, so later changes
+to the counts do not alter what this migration did.
+"""
+
+from sqlalchemy import Column, Date, Integer, MetaData, String, Table, cast, extract, func, insert, literal, select, union_all
+from sqlalchemy.engine import Engine
+
+VERSION = 8
+NAME = "book facet counts"
+
+metadata = MetaData()
+
+book_facet_counts = Table(
+    "book_facet_counts",
+    metadata,
+    Column("facet", String(20), primary_key=True),
+    Column("value", Integer, primary_key=True),
+    Column("book_count", Integer, nullable=False),
+)
+
+# The columns the counts are computed from, as of this version
+existing = MetaData()
+
+books = Table(
+    "books",
+    existing,
+    Column("id", Integer, primary_key=True),
+    Column("published_date", Date, nullable=True),
+    Column("publisher_id", Integer, nullable=True),
+    Column("genre_id", Integer, nullable=True),
+)
+
+book_authors = Table(
+    "book_authors",
+    existing,
+    Column("book_id", Integer, primary_key=True),
+    Column("author_id", Integer, primary_key=True),
+)
+
+
+def upgrade(engine: Engine) -> None:
+    """Create the book_facet_counts table and count the existing books."""
+    metadata.create_all(bind=engine, checkfirst=True)
+    decade = cast(extract("year", books.c.published_date), Integer) // 10 * 10
+    
+    def counts(facet: str, value, *where):
+        return (
+            select(literal(facet, String).label("facet"), value.label("value"), func.count().label("book_count"))
+            .where(*where)
+            .group_by(value)
+        )
+    
+    rows = union_all(
+        counts("genre", books.c.genre_id, books.c.genre_id.isnot(None)),
+        counts("publisher", books.c.publisher_id, books.c.publisher_id.isnot(None)),
+        counts("author", book_authors.c.author_id),
+        counts("decade", decade, books.c.published_date.isnot(None)),
+    )
+    with engine.begin() as connection:
+        connection.execute(book_facet_counts.delete())
+        connection.execute(insert(book_facet_counts).from_select(["facet", "value", "book_count"], rows))
@@ -0,0 +1,24 @@
+"""Index book titles in code point order for the title prefix filter on PostgreSQL.
+
+The filter is a range from the prefix to the prefix followed by U+10FFFF,
+which only holds every title starting with the prefix when titles compare
+by code point. SQLite's default BINARY collation does; PostgreSQL's
+linguistic collations do not, so there the filter compares in the "C"
+collation and this index serves it. The index is built concurrently.
+"""
+
+from sqlalchemy import Index, MetaData, Table
+from sqlalchemy.engine import Engine
+
+from ..operations import create_index
+
+VERSION = 9
+NAME = "book title prefix index"
+
+
+def upgrade(engine: Engine) -> None:
+    """Create the "C" collated title index on PostgreSQL."""
+    if engine.dialect.name != "postgresql":
+        return
+    books = Table("books", MetaData(), autoload_with=engine)
+    create_index(engine, Index("ix_books_title_c", books.c.title.collate("C")))
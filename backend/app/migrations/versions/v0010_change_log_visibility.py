@@ -0,0 +1,33 @@
+"""Stamp change log entries with a transaction id horizon on PostgreSQL.
+
+Writers record in next_xid the first transaction id not yet assigned once
+their entries' ids were taken, and the feed only serves entries up to the
+newest one whose next_xid the oldest running transaction has reached, so
+entries of transactions committing out of order are never skipped. The
+column is added on SQLite too, to match the model, but stays empty there:
+SQLite runs one write transaction at a time, so ids commit in order.
+
+Existing entries are stamped 0, making them final, and the partial index
+lets writers find their own unstamped entries. Needs PostgreSQL 13 or
+later for pg_current_xact_id and pg_current_snapshot.
+"""
+
+from sqlalchemy import BigInteger, Column, Index, MetaData, Table, text
+from sqlalchemy.engine import Engine
+
+from ..operations import add_column, backfill, create_index
+
+VERSION = 10
+NAME = "change log visibility"
+
+
+def upgrade(engine: Engine) -> None:
+    """Add the next_xid column, then stamp existing entries and index unstamped ones on PostgreSQL."""
+    changes = Table("changes", MetaData(), autoload_with=engine)
+    add_column(engine, changes, Column("next_xid", BigInteger, nullable=True))
+    if engine.dialect.name != "postgresql":
+        return
+    
+    changes = Table("changes", MetaData(), autoload_with=engine)
+    backfill(engine, changes, values={"next_xid": 0}, where=changes.c.next_xid.is_(None))
+    create_index(engine, Index("ix_changes_unstamped", changes.c.id, postgresql_where=text("next_xid IS NULL")))
@@ -1,25 +1,46 @@
-from datetime import date
-from sqlalchemy import Column, Integer, String, Date, Text, ForeignKey, Table
+from datetime import date, datetime, timezone
+from enum import Enum
+from sqlalchemy import BigInteger, Column, Integer, String, Date, DateTime, Text, ForeignKey, Table, Index, text
 from sqlalchemy.orm import relationship
 
 from .database import Base
 
+
+def utcnow() -> datetime:
+    """Current UTC time as the naive datetime stored in DateTime columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class Versioned:
+    """Columns behind the ETag and Last-Modified validators of an entity.
+    
+    The services bump both whenever the entity's API representation
+    changes, including changes to related entities it embeds. The columns
+    are nullable in the database only because they were added to existing
+    tables; inserts and the migration backfill always set them.
+    """
+    
+    version = Column(Integer, nullable=True, default=1)
+    updated_at = Column(DateTime, nullable=True, default=utcnow)
+
 # Association table for many-to-many relationship between books and authors
 book_authors = Table(
     "book_authors",
     Base.metadata,
     Column("book_id", Integer, ForeignKey("books.id"), primary_key=True),
     Column("author_id", Integer, ForeignKey("authors.id"), primary_key=True),
+    # Reverse of the primary key, for "books by author" lookups
+    Index("ix_book_authors_author_id_book_id", "author_id", "book_id"),
 )
 
 
-class Author(Base):
+class Author(Versioned, Base):
     """Author model."""
     
     __tablename__ = "authors"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(100), nullable=False)
+    name = Column(String(100), nullable=False, index=True)
     surname = Column(String(100), nullable=False)
     birthyear = Column(Integer, nullable=True)
 
@@ -27,7 +48,7 @@ class Author(Base):
     books = relationship("Book", secondary=book_authors, back_populates="authors")
 
 
-class Publisher(Base):
+class Publisher(Versioned, Base):
     """Publisher model."""
     
     __tablename__ = "publishers"
@@ -42,7 +63,7 @@ class Publisher(Base):
     books = relationship("Book", back_populates="publisher")
 
 
-class Genre(Base):
+class Genre(Versioned, Base):
     """Genre model."""
     
     __tablename__ = "genres"
@@ -55,21 +76,96 @@ class Genre(Base):
     books = relationship("Book", back_populates="genre")
 
 
-class Book(Base):
+class Book(Versioned, Base):
     """Book model."""
     
     __tablename__ = "books"
+    __table_args__ = (
+        # Order of the book list sorted by published date, and its date range filter
+        Index("ix_books_published_date_id", "published_date", "id"),
+        # Title prefix ranges on PostgreSQL, compared in code point order
+        Index("ix_books_title_c", text('title COLLATE "C"')).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String(300), nullable=False)
+    title = Column(String(300), nullable=False, index=True)
     edition = Column(String(50), nullable=True)
     published_date = Column(Date, nullable=True)
+    isbn = Column(String(20), nullable=True, index=True)
+    publication_year = Column(Integer, nullable=True)
     
     # Foreign keys
-    publisher_id = Column(Integer, ForeignKey("publishers.id"), nullable=True)
-    genre_id = Column(Integer, ForeignKey("genres.id"), nullable=True)
+    publisher_id = Column(Integer, ForeignKey("publishers.id"), nullable=True, index=True)
+    genre_id = Column(Integer, ForeignKey("genres.id"), nullable=True, index=True)
 
     # Relationships
     authors = relationship("Author", secondary=book_authors, back_populates="books")
     publisher = relationship("Publisher", back_populates="books")
     genre = relationship("Genre", back_populates="books")
+
+
+class CollectionVersion(Base):
+    """Version of a whole collection, behind the validators of its list endpoint.
+    
+    One row per collection, bumped by every create, update and delete in it.
+    """
+    
+    __tablename__ = "collection_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(DateTime, nullable=False, default=utcnow)
+
+
+class ChangeOperation(str, Enum):
+    """Kinds of entries in the change log."""
+    INSERT = "insert"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class Change(Base):
+    """Entry of the change log read by the GET /changes delta feed.
+    
+    The id only grows, so it doubles as the sync token. An update entry is
+    written whenever a resource's API representation changes, including
+    through a related resource it embeds; a delete entry is a tombstone.
+    """
+    
+    __tablename__ = "changes"
+    __table_args__ = (
+        # Entries whose next_xid the writing transaction has yet to stamp
+        Index("ix_changes_unstamped", "id", postgresql_where=text("next_xid IS NULL")).ddl_if(dialect="postgresql"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True)
+    collection = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    operation = Column(String(10), nullable=False)
+    changed_at = Column(DateTime, nullable=False, default=utcnow)
+    # PostgreSQL only: first transaction id not yet assigned once the entry's id was taken
+    next_xid = Column(BigInteger, nullable=True)
+
+
+class Facet(str, Enum):
+    """Dimensions of the book facet counts."""
+    GENRE = "genre"
+    PUBLISHER = "publisher"
+    AUTHOR = "author"
+    DECADE = "decade"
+
+
+class BookFacetCount(Base):
+    """Number of books with one facet value, e.g. in genre 3 or of the 1990s.
+    
+    Maintained by the book writes in their own transaction, so the
+    unfiltered facet counts are read without scanning the books. The value
+    is the related entity's id, or the first year of the decade.
+    """
+    
+    __tablename__ = "book_facet_counts"
+
+    facet = Column(String(20), primary_key=True)
+    value = Column(Integer, primary_key=True)
+    book_count = Column(Integer, nullable=False, default=0)
@@ -1,13 +1,29 @@
 """Repository module for data access layer."""
 
-from .author_repository import AuthorRepository
-from .book_repository import BookRepository
-from .genre_repository import GenreRepository
-from .publisher_repository import PublisherRepository
+from .author_repository import AuthorRepository, AsyncAuthorRepository
+from .book_repository import BookRepository, AsyncBookRepository
+from .genre_repository import GenreRepository, AsyncGenreRepository
+from .publisher_repository import PublisherRepository, AsyncPublisherRepository
+from .change_repository import ChangeRepository, AsyncChangeRepository
+from .facet_repository import FacetRepository, AsyncFacetRepository, book_facet_keys
+from .search_repository import SearchRepository
+from .version_repository import VersionRepository, AsyncVersionRepository
 
 __all__ = [
     "AuthorRepository",
+    "AsyncAuthorRepository",
     "BookRepository",
+    "AsyncBookRepository",
     "GenreRepository",
+    "AsyncGenreRepository",
     "PublisherRepository",
+    "AsyncPublisherRepository",
+    "ChangeRepository",
+    "AsyncChangeRepository",
+    "FacetRepository",
+    "AsyncFacetRepository",
+    "book_facet_keys",
+    "SearchRepository",
+    "VersionRepository",
+    "AsyncVersionRepository",
 ]
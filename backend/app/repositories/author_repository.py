@@ -1,10 +1,12 @@
 """Author repository for data access operations"""
 
 from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
-from app.models import Author
-from .base_repository import BaseRepository
+from app.models import Author, book_authors
+from .base_repository import AsyncBaseRepository, BaseRepository
+from .search_repository import SearchRepository
 
 
 class AuthorRepository(BaseRepository[Author]):
@@ -20,6 +22,7 @@ class AuthorRepository(BaseRepository[Author]):
             db: The database session.
         """
         super().__init__(Author, db)
+        self.search = SearchRepository(db)
     
     def get_all(self) -> List[Author]:
         """Retrieve all authors with their books eagerly loaded.
@@ -29,7 +32,7 @@ class AuthorRepository(BaseRepository[Author]):
         """
         return (
             self.db.query(Author)
-            .options(joinedload(Author.books))
+            .options(selectinload(Author.books))
             .all()
         )
     
@@ -44,7 +47,7 @@ class AuthorRepository(BaseRepository[Author]):
         """
         return (
             self.db.query(Author)
-            .options(joinedload(Author.books))
+            .options(selectinload(Author.books))
             .filter(Author.id == id)
             .first()
         )
@@ -58,8 +61,7 @@ class AuthorRepository(BaseRepository[Author]):
         Returns:
             True if the author has books, False otherwise.
         """
-        author = self.get_by_id(author_id)
-        return author is not None and len(author.books) > 0
+        return self.exists_where(book_authors.c.author_id == author_id)
     
     def get_by_name(self, name: str) -> Optional[Author]:
         """Find an author by their full name.
@@ -75,3 +77,53 @@ class AuthorRepository(BaseRepository[Author]):
             .filter(Author.name == name)
             .first()
         )
+    
+    def _on_saved(self, entity: Author) -> None:
+        """Refresh the author's search document and those of their books."""
+        self.search.index_author(entity.id)
+        self.search.index_books_by("author_id", entity.id)
+    
+    def _on_deleted(self, entity: Author) -> None:
+        """Remove the author from the search index."""
+        self.search.remove_author(entity.id)
+
+
+class AsyncAuthorRepository(AsyncBaseRepository[Author]):
+    """Async repository for Author entity data access."""
+    
+    load_options = (selectinload(Author.books),)
+    
+    def __init__(self, db: AsyncSession):
+        """Initialize the author repository.
+        
+        Args:
+            db: The async database session.
+        """
+        super().__init__(Author, db)
+    
+    async def has_books(self, author_id: int) -> bool:
+        """Check if an author has any associated books.
+        
+        Args:
+            author_id: The author's primary key.
+            
+        Returns:
+            True if the author has books, False otherwise.
+        """
+        return await self.exists_where(book_authors.c.author_id == author_id)
+    
+    async def _on_saved(self, entity: Author) -> None:
+        """Refresh the author's search document and those of their books."""
+        author_id = entity.id
+        
+        def index(session: Session) -> None:
+            search = SearchRepository(session)
+            search.index_author(author_id)
+            search.index_books_by("author_id", author_id)
+        
+        await self.db.run_sync(index)
+    
+    async def _on_deleted(self, entity: Author) -> None:
+        """Remove the author from the search index."""
+        author_id = entity.id
+        await self.db.run_sync(lambda session: SearchRepository(session).remove_author(author_id))
@@ -1,21 +1,175 @@
 """Base repository providing common data access patterns"""
 
-from typing import TypeVar, Generic, Type, Optional, List
-from sqlalchemy.orm import Session
-from app.models import Base
+from datetime import date
+from typing import Any, TypeVar, Generic, Type, Optional, List, Iterable, Sequence, Tuple, Set
+from pydantic import BaseModel
+from sqlalchemy import and_, exists, inspect, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import MANYTOONE, Session
+from app.core.exceptions import ValidationException
+from app.models import Base, ChangeOperation
+from app.core.pagination import Page, decode_cursor, encode_cursor
+from .change_repository import AsyncChangeRepository, ChangeRepository
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Keeps IN (...) lists well below the bound-parameter limits of SQLite
+IN_CLAUSE_BATCH_SIZE = 500
 
-class BaseRepository(Generic[ModelType]):
+
+class KeysetPaginationMixin:
+    """Keyset pagination helpers shared by the sync and async repositories.
+    
+    Attributes:
+        model: The SQLAlchemy model class being paged.
+        sort_attribute: Name of the column pages are ordered by unless a
+            query asks for another. The primary key is always appended as a
+            tie-breaker.
+    """
+    
+    sort_attribute: str = "id"
+    
+    def _page_statement(
+        self,
+        limit: int,
+        after: Optional[str],
+        projection: Optional[Type[BaseModel]],
+        sort_attribute: Optional[str] = None,
+        descending: bool = False,
+        conditions: Sequence = (),
+    ):
+        """Build the SELECT for one page, fetching one extra row.
+        
+        NULLs in a nullable sort column are ordered before every value, as
+        SQLite does natively, so they come first ascending and last
+        descending.
+        
+        Raises:
+            ValidationException: If the cursor is malformed.
+        """
+        sort_attribute = sort_attribute or self.sort_attribute
+        sort_column = getattr(self.model, sort_attribute)
+        if projection is None:
+            statement = select(self.model)
+        else:
+            statement = select(*self._projection_columns(projection, sort_attribute))
+        statement = statement.where(*conditions)
+        
+        if after is not None:
+            sort_value, last_id = decode_cursor(after)
+            statement = statement.where(
+                _after_condition(sort_column, self.model.id, sort_value, last_id, descending)
+            )
+        
+        id_order = self.model.id.desc() if descending else self.model.id.asc()
+        if sort_attribute == "id":
+            statement = statement.order_by(id_order)
+        elif not sort_column.nullable:
+            statement = statement.order_by(sort_column.desc() if descending else sort_column.asc(), id_order)
+        elif descending:
+            statement = statement.order_by(sort_column.desc().nulls_last(), id_order)
+        else:
+            statement = statement.order_by(sort_column.asc().nulls_first(), id_order)
+        
+        # Fetch one extra row to learn whether another page exists
+        return statement.limit(limit + 1)
+    
+    def _to_page(self, items: list, limit: int, sort_attribute: Optional[str] = None) -> Page:
+        """Trim the extra row fetched by _page_statement and build the cursor."""
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = encode_cursor(getattr(last, sort_attribute or self.sort_attribute), last.id)
+        return Page(items=items, next_cursor=next_cursor)
+    
+    def _projection_columns(self, projection: Type[BaseModel], sort_attribute: Optional[str] = None) -> list:
+        """Map the fields of a Pydantic schema onto this model's columns.
+        
+        The sort and primary key columns are always included so the next
+        page cursor can be built from the last row.
+        
+        Args:
+            projection: The Pydantic schema describing the response shape.
+            sort_attribute: The sort column, if not the default one.
+            
+        Returns:
+            List of column attributes to select.
+            
+        Raises:
+            ValueError: If a schema field is not a column of the model.
+        """
+        table_columns = self.model.__table__.columns
+        names = list(projection.model_fields)
+        for required in ("id", sort_attribute or self.sort_attribute):
+            if required not in names:
+                names.append(required)
+        
+        unknown = [name for name in names if name not in table_columns]
+        if unknown:
+            raise ValueError(
+                f"{projection.__name__} fields {unknown} are not columns of {self.model.__name__}"
+            )
+        return [getattr(self.model, name) for name in names]
+
+
+def _after_condition(sort_column, id_column, sort_value: Any, last_id: int, descending: bool):
+    """Condition selecting the rows after a cursor's (sort value, id) pair.
+    
+    Raises:
+        ValidationException: If the cursor's sort value does not fit the column.
+    """
+    if sort_column.key == id_column.key:
+        return id_column < last_id if descending else id_column > last_id
+    
+    sort_value = _cursor_value(sort_column, sort_value)
+    if sort_value is None:
+        # Past the NULLs: the remaining NULLs, then every value when ascending
+        after_nulls = and_(sort_column.is_(None), id_column < last_id if descending else id_column > last_id)
+        return after_nulls if descending else or_(after_nulls, sort_column.isnot(None))
+    if descending:
+        before = tuple_(sort_column, id_column) < tuple_(sort_value, last_id)
+        return or_(before, sort_column.is_(None)) if sort_column.nullable else before
+    return tuple_(sort_column, id_column) > tuple_(sort_value, last_id)
+
+
+def _cursor_value(sort_column, value: Any) -> Any:
+    """Convert a sort value decoded from JSON back to the column's Python type.
+    
+    Raises:
+        ValidationException: If the value does not fit the column, e.g. a
+            cursor taken from a page with a different sort order.
+    """
+    if value is None:
+        if sort_column.nullable:
+            return None
+        raise ValidationException("Invalid pagination cursor")
+    python_type = sort_column.type.python_type
+    if python_type is date and isinstance(value, str):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise ValidationException("Invalid pagination cursor")
+    if not isinstance(value, python_type) or isinstance(value, bool):
+        raise ValidationException("Invalid pagination cursor")
+    return value
+
+
+class BaseRepository(KeysetPaginationMixin, Generic[ModelType]):
     """Generic base repository with common CRUD operations.
     
     Provides a standard interface for data access operations that can be
     shared across all entity repositories.
     
+    Every create, update and delete also appends an entry for the entity
+    to the change log, in the same transaction. Writes are flushed, not
+    committed: the service's UnitOfWork commits the operation once.
+    
     Attributes:
         model: The SQLAlchemy model class this repository manages.
         db: The database session for operations.
+        sort_attribute: Name of the column pages are ordered by. The primary
+            key is always appended as a tie-breaker.
     """
     
     def __init__(self, model: Type[ModelType], db: Session):
@@ -36,6 +190,49 @@ class BaseRepository(Generic[ModelType]):
         """
         return self.db.query(self.model).all()
     
+    def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Type[BaseModel]] = None,
+        sort_attribute: Optional[str] = None,
+        descending: bool = False,
+        conditions: Sequence = (),
+    ) -> Page:
+        """Retrieve one page of records using keyset pagination.
+        
+        Rows are ordered by (sort_attribute, id) and the cursor carries the
+        last seen pair, so every page is a bounded index range scan no matter
+        how deep into the collection it is.
+        
+        When a projection schema is given, only the columns it declares are
+        selected and plain rows are returned instead of ORM instances, so no
+        identity map entries or relationship loads are created.
+        
+        A cursor is only valid with the sort order and conditions of the
+        page it was taken from.
+        
+        Args:
+            limit: Maximum number of records to return.
+            after: Cursor returned with the previous page, if any.
+            projection: Optional Pydantic schema whose fields select the columns.
+            sort_attribute: Column to order by instead of the repository's default.
+            descending: Order from the largest value down.
+            conditions: SQL expressions every returned record must match.
+            
+        Returns:
+            The page of records and the cursor for the next one.
+            
+        Raises:
+            ValidationException: If the cursor is malformed.
+        """
+        statement = self._page_statement(limit, after, projection, sort_attribute, descending, conditions)
+        if projection is None:
+            items = self.db.scalars(statement).all()
+        else:
+            items = self.db.execute(statement).all()
+        return self._to_page(list(items), limit, sort_attribute)
+    
     def get_by_id(self, id: int) -> Optional[ModelType]:
         """Retrieve a single record by its ID.
         
@@ -47,6 +244,60 @@ class BaseRepository(Generic[ModelType]):
         """
         return self.db.query(self.model).filter(self.model.id == id).first()
     
+    def get_row(self, id: int, projection: Type[BaseModel]):
+        """Retrieve the columns of a projection schema for a single record.
+        
+        Args:
+            id: The primary key value.
+            projection: Pydantic schema whose fields select the columns.
+            
+        Returns:
+            A plain row detached from the session, or None if not found.
+        """
+        statement = select(*self._projection_columns(projection)).where(self.model.id == id)
+        return self.db.execute(statement).first()
+    
+    def get_many(self, ids: Iterable[int]) -> Tuple[List[ModelType], List[int]]:
+        """Retrieve several records by ID with a single IN query per batch.
+        
+        Only the entity rows are loaded; relationships stay lazy so callers
+        that just need references do not pay for eager loading.
+        
+        Args:
+            ids: The primary key values to fetch. Duplicates are ignored.
+            
+        Returns:
+            Tuple of (found entities in the order requested, ids that do not exist).
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        found = {}
+        for start in range(0, len(unique_ids), IN_CLAUSE_BATCH_SIZE):
+            batch = unique_ids[start:start + IN_CLAUSE_BATCH_SIZE]
+            for entity in self.db.query(self.model).filter(self.model.id.in_(batch)):
+                found[entity.id] = entity
+        
+        entities = [found[id] for id in unique_ids if id in found]
+        missing = [id for id in unique_ids if id not in found]
+        return entities, missing
+    
+    def existing_ids(self, ids: Iterable[int]) -> Set[int]:
+        """Check which of several IDs exist, reading only the primary key index.
+        
+        Used to validate many foreign keys at once during bulk operations.
+        
+        Args:
+            ids: The primary key values to check.
+            
+        Returns:
+            The subset of ids that exist.
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        found = set()
+        for start in range(0, len(unique_ids), IN_CLAUSE_BATCH_SIZE):
+            batch = unique_ids[start:start + IN_CLAUSE_BATCH_SIZE]
+            found.update(self.db.scalars(select(self.model.id).where(self.model.id.in_(batch))))
+        return found
+    
     def create(self, entity: ModelType) -> ModelType:
         """Create a new record in the database.
         
@@ -54,11 +305,13 @@ class BaseRepository(Generic[ModelType]):
             entity: The model instance to persist.
             
         Returns:
-            The persisted model instance with updated attributes.
+            The persisted model instance; the flush fills in its generated
+            id from the INSERT, without reading the row back.
         """
         self.db.add(entity)
-        self.db.commit()
-        self.db.refresh(entity)
+        self.db.flush()
+        self._on_saved(entity)
+        ChangeRepository(self.db).record(self.model, [entity.id], ChangeOperation.INSERT)
         return entity
     
     def update(self, entity: ModelType) -> ModelType:
@@ -70,8 +323,13 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             The updated model instance.
         """
-        self.db.commit()
-        self.db.refresh(entity)
+        self.db.flush()
+        # Loaded references still point at the old rows if a foreign key changed
+        references = _reference_keys(self.model)
+        if references:
+            self.db.expire(entity, references)
+        self._on_saved(entity)
+        ChangeRepository(self.db).record(self.model, [entity.id], ChangeOperation.UPDATE)
         return entity
     
     def delete(self, entity: ModelType) -> None:
@@ -81,7 +339,9 @@ class BaseRepository(Generic[ModelType]):
             entity: The model instance to delete.
         """
         self.db.delete(entity)
-        self.db.commit()
+        self.db.flush()
+        self._on_deleted(entity)
+        ChangeRepository(self.db).record(self.model, [entity.id], ChangeOperation.DELETE)
     
     def exists(self, id: int) -> bool:
         """Check if a record exists by its ID.
@@ -92,4 +352,245 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             True if the record exists, False otherwise.
         """
-        return self.db.query(self.model).filter(self.model.id == id).count() > 0
+        return self.exists_where(self.model.id == id)
+    
+    def exists_where(self, condition) -> bool:
+        """Check if any row matches a condition.
+        
+        Runs SELECT EXISTS, which stops at the first matching index entry
+        instead of counting them all.
+        
+        Args:
+            condition: SQL expression, e.g. Book.genre_id == 3.
+            
+        Returns:
+            True if a row matches, False otherwise.
+        """
+        return self.db.scalar(select(exists().where(condition)))
+    
+    def _on_saved(self, entity: ModelType) -> None:
+        """Hook run after an entity is flushed by create or update.
+        
+        Runs inside the same transaction. Subclasses override it to keep
+        derived data such as search indexes in sync.
+        
+        Args:
+            entity: The created or updated model instance.
+        """
+    
+    def _on_deleted(self, entity: ModelType) -> None:
+        """Hook run after an entity's deletion is flushed.
+        
+        Args:
+            entity: The deleted model instance.
+        """
+
+
+class AsyncBaseRepository(KeysetPaginationMixin, Generic[ModelType]):
+    """Generic base repository for an AsyncSession.
+    
+    Mirrors BaseRepository for the async stack. Relationships cannot be
+    lazy loaded outside the session's event loop, so every entity returned
+    is loaded with ``load_options``, and entities of repositories that have
+    them are reloaded with them after create and update.
+    
+    Attributes:
+        model: The SQLAlchemy model class this repository manages.
+        db: The async database session for operations.
+        load_options: Loader options applied to every entity query.
+        sort_attribute: Name of the column pages are ordered by.
+    """
+    
+    load_options: tuple = ()
+    
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
+        """Initialize the repository.
+        
+        Args:
+            model: The SQLAlchemy model class to operate on.
+            db: The async database session.
+        """
+        self.model = model
+        self.db = db
+    
+    async def get_all(self) -> List[ModelType]:
+        """Retrieve all records of this model type.
+        
+        Returns:
+            List of all model instances.
+        """
+        result = await self.db.scalars(select(self.model).options(*self.load_options))
+        return list(result)
+    
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Type[BaseModel]] = None,
+        sort_attribute: Optional[str] = None,
+        descending: bool = False,
+        conditions: Sequence = (),
+    ) -> Page:
+        """Retrieve one page of records using keyset pagination.
+        
+        See BaseRepository.get_page.
+        
+        Args:
+            limit: Maximum number of records to return.
+            after: Cursor returned with the previous page, if any.
+            projection: Optional Pydantic schema whose fields select the columns.
+            sort_attribute: Column to order by instead of the repository's default.
+            descending: Order from the largest value down.
+            conditions: SQL expressions every returned record must match.
+            
+        Returns:
+            The page of records and the cursor for the next one.
+            
+        Raises:
+            ValidationException: If the cursor is malformed.
+        """
+        statement = self._page_statement(limit, after, projection, sort_attribute, descending, conditions)
+        if projection is None:
+            items = (await self.db.scalars(statement.options(*self.load_options))).all()
+        else:
+            items = (await self.db.execute(statement)).all()
+        return self._to_page(list(items), limit, sort_attribute)
+    
+    async def get_by_id(self, id: int) -> Optional[ModelType]:
+        """Retrieve a single record by its ID.
+        
+        Args:
+            id: The primary key value.
+            
+        Returns:
+            The model instance if found, None otherwise.
+        """
+        statement = select(self.model).options(*self.load_options).where(self.model.id == id)
+        return (await self.db.scalars(statement)).first()
+    
+    async def get_row(self, id: int, projection: Type[BaseModel]):
+        """Retrieve the columns of a projection schema for a single record.
+        
+        Args:
+            id: The primary key value.
+            projection: Pydantic schema whose fields select the columns.
+            
+        Returns:
+            A plain row detached from the session, or None if not found.
+        """
+        statement = select(*self._projection_columns(projection)).where(self.model.id == id)
+        return (await self.db.execute(statement)).first()
+    
+    async def get_many(self, ids: Iterable[int]) -> Tuple[List[ModelType], List[int]]:
+        """Retrieve several records by ID with a single IN query per batch.
+        
+        Args:
+            ids: The primary key values to fetch. Duplicates are ignored.
+            
+        Returns:
+            Tuple of (found entities in the order requested, ids that do not exist).
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        found = {}
+        for start in range(0, len(unique_ids), IN_CLAUSE_BATCH_SIZE):
+            batch = unique_ids[start:start + IN_CLAUSE_BATCH_SIZE]
+            for entity in await self.db.scalars(select(self.model).where(self.model.id.in_(batch))):
+                found[entity.id] = entity
+        
+        entities = [found[id] for id in unique_ids if id in found]
+        missing = [id for id in unique_ids if id not in found]
+        return entities, missing
+    
+    async def create(self, entity: ModelType) -> ModelType:
+        """Create a new record in the database.
+        
+        Args:
+            entity: The model instance to persist.
+            
+        Returns:
+            The persisted model instance with its relationships loaded.
+        """
+        self.db.add(entity)
+        await self.db.flush()
+        await self._on_saved(entity)
+        await AsyncChangeRepository(self.db).record(self.model, [entity.id], ChangeOperation.INSERT)
+        return await self._reload(entity)
+    
+    async def update(self, entity: ModelType) -> ModelType:
+        """Update an existing record in the database.
+        
+        Args:
+            entity: The model instance with updated values.
+            
+        Returns:
+            The updated model instance with its relationships loaded.
+        """
+        await self.db.flush()
+        await self._on_saved(entity)
+        await AsyncChangeRepository(self.db).record(self.model, [entity.id], ChangeOperation.UPDATE)
+        return await self._reload(entity)
+    
+    async def delete(self, entity: ModelType) -> None:
+        """Delete a record from the database.
+        
+        Args:
+            entity: The model instance to delete.
+        """
+        await self.db.delete(entity)
+        await self.db.flush()
+        await self._on_deleted(entity)
+        await AsyncChangeRepository(self.db).record(self.model, [entity.id], ChangeOperation.DELETE)
+    
+    async def exists(self, id: int) -> bool:
+        """Check if a record exists by its ID.
+        
+        Args:
+            id: The primary key value to check.
+            
+        Returns:
+            True if the record exists, False otherwise.
+        """
+        return await self.exists_where(self.model.id == id)
+    
+    async def exists_where(self, condition) -> bool:
+        """See BaseRepository.exists_where."""
+        return await self.db.scalar(select(exists().where(condition)))
+    
+    async def _reload(self, entity: ModelType) -> ModelType:
+        """Load an entity's relationships after a flush.
+        
+        Entities without load_options are returned as they are; their
+        columns are current after the flush.
+        """
+        if not self.load_options:
+            return entity
+        statement = (
+            select(self.model)
+            .options(*self.load_options)
+            .where(self.model.id == entity.id)
+            .execution_options(populate_existing=True)
+        )
+        return (await self.db.scalars(statement)).one()
+    
+    async def _on_saved(self, entity: ModelType) -> None:
+        """Hook run after an entity is flushed by create or update.
+        
+        Args:
+            entity: The created or updated model instance.
+        """
+    
+    async def _on_deleted(self, entity: ModelType) -> None:
+        """Hook run after an entity's deletion is flushed, before commit.
+        
+        Args:
+            entity: The deleted model instance.
+        """
+
+
+def _reference_keys(model) -> List[str]:
+    """Names of a model's many-to-one relationships."""
+    return [
+        relationship.key
+        for relationship in inspect(model).relationships
+        if relationship.direction is MANYTOONE
+    ]
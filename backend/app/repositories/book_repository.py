@@ -1,10 +1,21 @@
 """Book repository for data access operations"""
 
-from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
+from typing import Iterable, List, Optional, Type
+from pydantic import BaseModel
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from app.models import Book
-from .base_repository import BaseRepository
+from app.core.pagination import Page, SortOrder
+from app.models import Book, ChangeOperation, book_authors
+from app.schemas import BookQuery
+from .base_repository import AsyncBaseRepository, BaseRepository
+from .change_repository import ChangeRepository
+from .facet_repository import AsyncFacetRepository, FacetRepository
+from .search_repository import SearchRepository
+
+# Appended to a title prefix to build the exclusive end of its range
+TITLE_PREFIX_UPPER_BOUND = "\U0010ffff"
 
 
 class BookRepository(BaseRepository[Book]):
@@ -20,6 +31,7 @@ class BookRepository(BaseRepository[Book]):
             db: The database session.
         """
         super().__init__(Book, db)
+        self.search = SearchRepository(db)
     
     def get_all(self) -> List[Book]:
         """Retrieve all books with related entities eagerly loaded.
@@ -30,7 +42,7 @@ class BookRepository(BaseRepository[Book]):
         return (
             self.db.query(Book)
             .options(
-                joinedload(Book.authors),
+                selectinload(Book.authors),
                 joinedload(Book.genre),
                 joinedload(Book.publisher)
             )
@@ -49,7 +61,7 @@ class BookRepository(BaseRepository[Book]):
         return (
             self.db.query(Book)
             .options(
-                joinedload(Book.authors),
+                selectinload(Book.authors),
                 joinedload(Book.genre),
                 joinedload(Book.publisher)
             )
@@ -57,6 +69,77 @@ class BookRepository(BaseRepository[Book]):
             .first()
         )
     
+    def iter_all(self, batch_size: int = 1000) -> Iterable[Book]:
+        """Stream every book with related entities, one batch at a time.
+        
+        Rows are read through a server-side cursor in batches of
+        ``batch_size``; authors are loaded per batch with a single IN query,
+        so memory stays bounded by the batch rather than the catalog.
+        
+        Args:
+            batch_size: Number of books fetched per round trip.
+            
+        Returns:
+            Iterable over books ordered by id.
+        """
+        return (
+            self.db.query(Book)
+            .options(
+                selectinload(Book.authors),
+                joinedload(Book.genre),
+                joinedload(Book.publisher)
+            )
+            .order_by(Book.id)
+            .yield_per(batch_size)
+        )
+    
+    def get_query_page(
+        self,
+        query: BookQuery,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Type[BaseModel]] = None
+    ) -> Page:
+        """Retrieve one page of the books matching a query, in its sort order.
+        
+        The filters and the keyset condition are compiled into one SELECT.
+        Foreign key filters use their secondary indexes, the author filter
+        the reverse book_authors index, and the title prefix and date range
+        are index range conditions.
+        
+        Args:
+            query: The filters and sort order.
+            limit: Maximum number of books to return.
+            after: Cursor returned with the previous page of the same query.
+            projection: Optional Pydantic schema whose fields select the columns.
+            
+        Returns:
+            The page of books and the cursor for the next one.
+        """
+        return self.get_page(
+            limit=limit,
+            after=after,
+            projection=projection,
+            sort_attribute=query.sort_by.value,
+            descending=query.order == SortOrder.DESC,
+            conditions=_query_conditions(query, self.db.get_bind().dialect.name),
+        )
+    
+    def get_facet_counts(self, query: BookQuery, limit: int) -> list:
+        """Count the books matching a query's filters per facet value.
+        
+        Without filters the stored counts are read; otherwise they are
+        grouped from the matching books. The sort order is ignored.
+        
+        Args:
+            query: The filters.
+            limit: Maximum number of values per facet.
+            
+        Returns:
+            (facet, value, book_count, name) rows, see FacetRepository.get_counts.
+        """
+        return FacetRepository(self.db).get_counts(_query_conditions(query, self.db.get_bind().dialect.name), limit)
+    
     def get_by_author(self, author_id: int) -> List[Book]:
         """Retrieve all books by a specific author.
         
@@ -69,12 +152,12 @@ class BookRepository(BaseRepository[Book]):
         return (
             self.db.query(Book)
             .options(
-                joinedload(Book.authors),
+                selectinload(Book.authors),
                 joinedload(Book.genre),
                 joinedload(Book.publisher)
             )
-            .join(Book.authors)
-            .filter(Book.authors.any(id=author_id))
+            .join(book_authors, book_authors.c.book_id == Book.id)
+            .filter(book_authors.c.author_id == author_id)
             .all()
         )
     
@@ -90,7 +173,7 @@ class BookRepository(BaseRepository[Book]):
         return (
             self.db.query(Book)
             .options(
-                joinedload(Book.authors),
+                selectinload(Book.authors),
                 joinedload(Book.genre),
                 joinedload(Book.publisher)
             )
@@ -110,7 +193,7 @@ class BookRepository(BaseRepository[Book]):
         return (
             self.db.query(Book)
             .options(
-                joinedload(Book.authors),
+                selectinload(Book.authors),
                 joinedload(Book.genre),
                 joinedload(Book.publisher)
             )
@@ -133,32 +216,127 @@ class BookRepository(BaseRepository[Book]):
             .first()
         )
     
-    def count_by_genre(self, genre_id: int) -> int:
-        """Count books in a specific genre.
+    def bulk_create(self, books: List[dict], author_ids: List[List[int]]) -> List[int]:
+        """Insert many books and their author links without building ORM objects.
+        
+        Books are inserted with a single executemany using RETURNING to
+        collect the generated ids, followed by one executemany for the
+        association rows. The new books are added to the search index and
+        the change log.
+        The caller owns the transaction.
         
         Args:
-            genre_id: The genre's primary key.
+            books: Column values for each book.
+            author_ids: Author ids for each book, aligned with ``books``.
             
         Returns:
-            Number of books in the genre.
+            The generated book ids, in the order the books were given.
         """
-        return (
-            self.db.query(Book)
-            .filter(Book.genre_id == genre_id)
-            .count()
+        if not books:
+            return []
+        
+        book_ids = list(
+            self.db.scalars(
+                insert(Book).returning(Book.id, sort_by_parameter_order=True),
+                books,
+            )
         )
+        links = [
+            {"book_id": book_id, "author_id": author_id}
+            for book_id, ids in zip(book_ids, author_ids)
+            for author_id in ids
+        ]
+        if links:
+            self.db.execute(insert(book_authors), links)
+        self.search.index_books(book_ids)
+        ChangeRepository(self.db).record(Book, book_ids, ChangeOperation.INSERT)
+        return book_ids
+    
+    def _on_saved(self, entity: Book) -> None:
+        """Refresh the book's search document."""
+        self.search.index_books([entity.id])
     
-    def count_by_publisher(self, publisher_id: int) -> int:
-        """Count books from a specific publisher.
+    def _on_deleted(self, entity: Book) -> None:
+        """Remove the book from the search index."""
+        self.search.remove_book(entity.id)
+
+
+class AsyncBookRepository(AsyncBaseRepository[Book]):
+    """Async repository for Book entity data access."""
+    
+    load_options = (
+        selectinload(Book.authors),
+        joinedload(Book.genre),
+        joinedload(Book.publisher),
+    )
+    
+    def __init__(self, db: AsyncSession):
+        """Initialize the book repository.
         
         Args:
-            publisher_id: The publisher's primary key.
-            
-        Returns:
-            Number of books from the publisher.
+            db: The async database session.
         """
-        return (
-            self.db.query(Book)
-            .filter(Book.publisher_id == publisher_id)
-            .count()
+        super().__init__(Book, db)
+    
+    async def get_query_page(
+        self,
+        query: BookQuery,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Type[BaseModel]] = None
+    ) -> Page:
+        """See BookRepository.get_query_page."""
+        return await self.get_page(
+            limit=limit,
+            after=after,
+            projection=projection,
+            sort_attribute=query.sort_by.value,
+            descending=query.order == SortOrder.DESC,
+            conditions=_query_conditions(query, self.db.get_bind().dialect.name),
+        )
+    
+    async def get_facet_counts(self, query: BookQuery, limit: int) -> list:
+        """See BookRepository.get_facet_counts."""
+        return await AsyncFacetRepository(self.db).get_counts(_query_conditions(query, self.db.get_bind().dialect.name), limit)
+    
+    async def _on_saved(self, entity: Book) -> None:
+        """Refresh the book's search document."""
+        book_id = entity.id
+        await self.db.run_sync(lambda session: SearchRepository(session).index_books([book_id]))
+    
+    async def _on_deleted(self, entity: Book) -> None:
+        """Remove the book from the search index."""
+        book_id = entity.id
+        await self.db.run_sync(lambda session: SearchRepository(session).remove_book(book_id))
+
+
+def _query_conditions(query: BookQuery, dialect_name: str) -> list:
+    """WHERE conditions of the filters set in a book query.
+    
+    Args:
+        query: The filters.
+        dialect_name: Name of the database dialect, sqlite or postgresql.
+    """
+    conditions = []
+    if query.author_id is not None:
+        conditions.append(
+            Book.id.in_(select(book_authors.c.book_id).where(book_authors.c.author_id == query.author_id))
         )
+    if query.genre_id is not None:
+        conditions.append(Book.genre_id == query.genre_id)
+    if query.publisher_id is not None:
+        conditions.append(Book.publisher_id == query.publisher_id)
+    if query.published_from is not None:
+        conditions.append(Book.published_date >= query.published_from)
+    if query.published_to is not None:
+        conditions.append(Book.published_date <= query.published_to)
+    if query.title:
+        # A range rather than LIKE, which SQLite only serves from an index
+        # when it is case-insensitive; U+10FFFF sorts after any other character
+        # in code point order. SQLite compares titles that way; PostgreSQL's
+        # linguistic collations do not, so there both bounds use the "C"
+        # collation of ix_books_title_c.
+        title = Book.title.collate("C") if dialect_name == "postgresql" else Book.title
+        conditions.append(title >= query.title)
+        conditions.append(title < query.title + TITLE_PREFIX_UPPER_BOUND)
+    return conditions
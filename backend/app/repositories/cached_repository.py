@@ -0,0 +1,127 @@
+"""Read-through caching for repositories of rarely changing reference data"""
+
+from typing import Optional, Type
+from pydantic import BaseModel
+
+from app.caching import invalidation_bus
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.pagination import Page
+
+
+def reference_cache(name: str) -> TTLCache:
+    """Create a process-wide cache sized by the reference cache settings.
+    
+    The cache is cleared by every invalidation of its namespace, including
+    those published by other workers.
+    
+    Args:
+        name: Name reported in the cache stats, and invalidation namespace.
+    
+    Returns:
+        The cache.
+    """
+    settings = get_settings()
+    cache = TTLCache(name, max_size=settings.reference_cache_size, ttl=settings.reference_cache_ttl)
+    invalidation_bus.subscribe(name, lambda ids: cache.clear())
+    return cache
+
+
+class CachedReadsMixin:
+    """Serve projected reads of a BaseRepository from a TTL and LRU cache.
+    
+    Only projected pages and rows are cached: they are plain rows, safe to
+    share between sessions. Entity reads, which feed updates and deletes,
+    always go to the database. The cache is cleared by every write in this
+    process, and again by the service layer's invalidation once the write
+    commits, which also reaches other processes.
+    
+    Attributes:
+        cache: The process-wide cache, shared by every instance of the class.
+    """
+    
+    cache: TTLCache
+    
+    def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Type[BaseModel]] = None
+    ) -> Page:
+        """Retrieve one page, from the cache when a projection is given."""
+        load = super().get_page
+        if projection is None:
+            return load(limit=limit, after=after)
+        return self.cache.get_or_load(
+            ("page", projection.__name__, limit, after),
+            lambda: load(limit=limit, after=after, projection=projection),
+        )
+    
+    def get_row(self, id: int, projection: Type[BaseModel]):
+        """Retrieve a projected row from the cache or the database."""
+        load = super().get_row
+        return self.cache.get_or_load(("row", projection.__name__, id), lambda: load(id, projection))
+    
+    def create(self, entity):
+        """Create the record, then invalidate the cache."""
+        result = super().create(entity)
+        self.cache.clear()
+        return result
+    
+    def update(self, entity):
+        """Update the record, then invalidate the cache."""
+        result = super().update(entity)
+        self.cache.clear()
+        return result
+    
+    def delete(self, entity) -> None:
+        """Delete the record, then invalidate the cache."""
+        super().delete(entity)
+        self.cache.clear()
+
+
+class AsyncCachedReadsMixin:
+    """CachedReadsMixin for an AsyncBaseRepository.
+    
+    Attributes:
+        cache: The process-wide cache, shared with the sync repository.
+    """
+    
+    cache: TTLCache
+    
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Type[BaseModel]] = None
+    ) -> Page:
+        """Retrieve one page, from the cache when a projection is given."""
+        load = super().get_page
+        if projection is None:
+            return await load(limit=limit, after=after)
+        return await self.cache.get_or_load_async(
+            ("page", projection.__name__, limit, after),
+            lambda: load(limit=limit, after=after, projection=projection),
+        )
+    
+    async def get_row(self, id: int, projection: Type[BaseModel]):
+        """Retrieve a projected row from the cache or the database."""
+        load = super().get_row
+        return await self.cache.get_or_load_async(("row", projection.__name__, id), lambda: load(id, projection))
+    
+    async def create(self, entity):
+        """Create the record, then invalidate the cache."""
+        result = await super().create(entity)
+        self.cache.clear()
+        return result
+    
+    async def update(self, entity):
+        """Update the record, then invalidate the cache."""
+        result = await super().update(entity)
+        self.cache.clear()
+        return result
+    
+    async def delete(self, entity) -> None:
+        """Delete the record, then invalidate the cache."""
+        await super().delete(entity)
+        self.cache.clear()
@@ -0,0 +1,195 @@
+"""Change repository for the change log behind the delta feed"""
+
+from datetime import datetime
+from typing import Iterable, List, Type
+from sqlalchemy import BigInteger, Text, cast, delete, func, insert, literal, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import Base, Change, ChangeOperation, utcnow
+
+# On PostgreSQL ids are taken when a transaction inserts and become visible
+# when it commits, possibly out of order, so the feed stops short of any id
+# a running transaction may still hold. Writers take a transaction id before
+# their entries' ids, then stamp the entries with the first transaction id
+# not yet assigned. Every transaction that took a smaller id began before
+# that, so once the oldest running transaction is at or past an entry's
+# stamp, the entry and every earlier one are final.
+ASSIGN_XID = text("SELECT pg_current_xact_id()")
+
+NEXT_XID = cast(cast(func.pg_snapshot_xmax(func.pg_current_snapshot()), Text), BigInteger)
+
+OLDEST_RUNNING_XID = cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger)
+
+STAMP_NEXT_XID = (
+    update(Change)
+    .where(Change.next_xid.is_(None))
+    .values(next_xid=NEXT_XID)
+    .execution_options(synchronize_session=False)
+)
+
+
+class ChangeRepository:
+    """Appends to and reads the change log.
+    
+    Entries are written inside the caller's transaction, so a change is
+    logged exactly when the write it describes commits.
+    
+    Attributes:
+        db: The database session for operations.
+    """
+    
+    def __init__(self, db: Session):
+        """Initialize the change repository.
+        
+        Args:
+            db: The database session.
+        """
+        self.db = db
+    
+    def record(self, model: Type[Base], ids: Iterable[int], operation: ChangeOperation) -> None:
+        """Log the same operation on several entities.
+        
+        Args:
+            model: The changed model class; its table names the collection.
+            ids: Primary keys of the changed entities.
+            operation: What happened to them.
+        """
+        entries = _entries(model, ids, operation)
+        if entries:
+            self._log(insert(Change), entries)
+    
+    def record_where(self, model: Type[Base], condition, operation: ChangeOperation) -> None:
+        """Log an operation on every entity matching a condition, with one INSERT ... SELECT.
+        
+        Args:
+            model: The changed model class.
+            condition: SQL expression selecting the entities, e.g. Book.genre_id == 3.
+            operation: What happened to them.
+        """
+        self._log(_insert_where(model, condition, operation))
+    
+    def _log(self, statement, entries: List[dict] = None) -> None:
+        """Insert entries, stamping them with the next transaction id on PostgreSQL."""
+        postgresql = self.db.get_bind().dialect.name == "postgresql"
+        if postgresql:
+            self.db.execute(ASSIGN_XID)
+        self.db.execute(statement, entries)
+        if postgresql:
+            # A new statement, so its snapshot is taken after the ids
+            self.db.execute(STAMP_NEXT_XID)
+    
+    def get_since(self, since: int, limit: int) -> List[Change]:
+        """Retrieve the entries logged after a token, oldest first.
+        
+        Args:
+            since: Id of the last entry the client has seen; 0 for all.
+            limit: Maximum number of entries to return.
+        
+        Returns:
+            The entries.
+        """
+        statement = select(Change).where(Change.id > since).order_by(Change.id).limit(limit)
+        if self.db.get_bind().dialect.name == "postgresql":
+            statement = statement.where(Change.id <= _final_id())
+        return list(self.db.scalars(statement))
+    
+    def get_latest_token(self) -> int:
+        """Retrieve the id of the newest entry the feed serves, or 0 if there is none.
+        
+        On PostgreSQL that is the newest entry no running transaction can
+        still precede, so a client syncing from it misses nothing.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            return self.db.scalar(select(_final_id())) or 0
+        return self.db.scalar(select(Change.id).order_by(Change.id.desc()).limit(1)) or 0
+    
+    def get_oldest_token(self) -> int:
+        """Retrieve the id of the oldest entry still logged, or 0 if the log is empty."""
+        return self.db.scalar(select(func.min(Change.id))) or 0
+    
+    def delete_before(self, cutoff: datetime, limit: int) -> int:
+        """Delete the oldest entries logged before a time, never the newest entry.
+        
+        Keeping the newest entry keeps get_latest_token valid after a prune.
+        
+        Args:
+            cutoff: Entries logged before this time are deleted.
+            limit: Maximum number of entries to delete.
+        
+        Returns:
+            Number of entries deleted.
+        """
+        ids = (
+            select(Change.id)
+            .where(Change.changed_at < cutoff, Change.id < self.get_latest_token())
+            .order_by(Change.id)
+            .limit(limit)
+        )
+        statement = delete(Change).where(Change.id.in_(ids)).execution_options(synchronize_session=False)
+        return self.db.execute(statement).rowcount
+
+
+class AsyncChangeRepository:
+    """Async variant of ChangeRepository for the writes of the async stack."""
+    
+    def __init__(self, db: AsyncSession):
+        """Initialize the change repository.
+        
+        Args:
+            db: The async database session.
+        """
+        self.db = db
+    
+    async def record(self, model: Type[Base], ids: Iterable[int], operation: ChangeOperation) -> None:
+        """See ChangeRepository.record."""
+        entries = _entries(model, ids, operation)
+        if entries:
+            await self._log(insert(Change), entries)
+    
+    async def record_where(self, model: Type[Base], condition, operation: ChangeOperation) -> None:
+        """See ChangeRepository.record_where."""
+        await self._log(_insert_where(model, condition, operation))
+    
+    async def _log(self, statement, entries: List[dict] = None) -> None:
+        """See ChangeRepository._log."""
+        postgresql = self.db.get_bind().dialect.name == "postgresql"
+        if postgresql:
+            await self.db.execute(ASSIGN_XID)
+        await self.db.execute(statement, entries)
+        if postgresql:
+            await self.db.execute(STAMP_NEXT_XID)
+
+
+def _entries(model: Type[Base], ids: Iterable[int], operation: ChangeOperation) -> List[dict]:
+    """Parameter sets logging an operation on each id."""
+    now = utcnow()
+    return [
+        {"collection": model.__tablename__, "entity_id": id, "operation": operation.value, "changed_at": now}
+        for id in dict.fromkeys(ids)
+    ]
+
+
+def _insert_where(model: Type[Base], condition, operation: ChangeOperation):
+    """INSERT ... SELECT logging an operation on every row matching a condition."""
+    rows = select(
+        literal(model.__tablename__),
+        model.id,
+        literal(operation.value),
+        literal(utcnow()),
+    ).where(condition)
+    return insert(Change).from_select(
+        [Change.collection, Change.entity_id, Change.operation, Change.changed_at], rows
+    )
+
+
+def _final_id():
+    """Scalar subquery of the newest id no running transaction can still precede."""
+    return (
+        select(Change.id)
+        .where(Change.next_xid <= OLDEST_RUNNING_XID)
+        .order_by(Change.id.desc())
+        .limit(1)
+        .correlate(None)
+        .scalar_subquery()
+    )
@@ -0,0 +1,207 @@
+"""Facet repository for the book counts behind GET /books/facets"""
+
+from collections import Counter
+from datetime import date
+from typing import Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import Integer, String, cast, delete, extract, func, insert, literal, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import Author, Book, BookFacetCount, Facet, Genre, Publisher, book_authors
+
+# A facet value of a book, e.g. (Facet.GENRE, 3) or (Facet.DECADE, 1990)
+FacetKey = Tuple[Facet, int]
+
+
+def book_facet_keys(
+    genre_id: Optional[int],
+    publisher_id: Optional[int],
+    author_ids: Iterable[int],
+    published_date: Optional[date],
+) -> List[FacetKey]:
+    """List the facet values a book is counted under.
+    
+    Args:
+        genre_id: The book's genre, if any.
+        publisher_id: The book's publisher, if any.
+        author_ids: The book's authors.
+        published_date: The book's publication date, if known.
+    
+    Returns:
+        One key per facet value; books without a genre, publisher or date
+        are not counted under that facet.
+    """
+    keys = []
+    if genre_id is not None:
+        keys.append((Facet.GENRE, genre_id))
+    if publisher_id is not None:
+        keys.append((Facet.PUBLISHER, publisher_id))
+    keys.extend((Facet.AUTHOR, author_id) for author_id in dict.fromkeys(author_ids))
+    if published_date is not None:
+        keys.append((Facet.DECADE, published_date.year // 10 * 10))
+    return keys
+
+
+class FacetRepository:
+    """Maintains and reads the per-facet book counts.
+    
+    The counts of the whole catalog live in the book_facet_counts table.
+    Book writes adjust them with one upsert per write, inside the write's
+    transaction, so reading them costs one pass over the facet values
+    instead of a scan of the books. Counts of a filtered book list are
+    computed from the matching books in one grouped query.
+    
+    Attributes:
+        db: The database session for operations.
+    """
+    
+    def __init__(self, db: Session):
+        """Initialize the facet repository.
+        
+        Args:
+            db: The database session.
+        """
+        self.db = db
+    
+    def apply(self, added: Iterable[FacetKey] = (), removed: Iterable[FacetKey] = ()) -> None:
+        """Adjust the counts for books gaining and losing facet values.
+        
+        Keys present in both cancel out, so an update can pass the book's
+        keys before and after the write.
+        
+        Args:
+            added: One key per book and facet value it is now counted under.
+            removed: One key per book and facet value it no longer is.
+        """
+        deltas = _deltas(added, removed)
+        if deltas:
+            self.db.execute(_upsert(self.db.get_bind().dialect.name), deltas)
+    
+    def get_counts(self, conditions: Sequence, limit: int) -> list:
+        """Retrieve the most frequent values of every facet.
+        
+        Args:
+            conditions: WHERE conditions on books; empty for the whole catalog.
+            limit: Maximum number of values per facet.
+        
+        Returns:
+            (facet, value, book_count, name) rows, by facet and then by
+            descending count. name is None for decades.
+        """
+        return list(self.db.execute(_ranked_counts(conditions, limit)))
+    
+    def rebuild(self) -> None:
+        """Recompute the stored counts from the books."""
+        self.db.execute(delete(BookFacetCount))
+        self.db.execute(_insert_counts())
+
+
+class AsyncFacetRepository:
+    """Async variant of FacetRepository for an AsyncSession."""
+    
+    def __init__(self, db: AsyncSession):
+        """Initialize the facet repository.
+        
+        Args:
+            db: The async database session.
+        """
+        self.db = db
+    
+    async def apply(self, added: Iterable[FacetKey] = (), removed: Iterable[FacetKey] = ()) -> None:
+        """See FacetRepository.apply."""
+        deltas = _deltas(added, removed)
+        if deltas:
+            await self.db.execute(_upsert(self.db.get_bind().dialect.name), deltas)
+    
+    async def get_counts(self, conditions: Sequence, limit: int) -> list:
+        """See FacetRepository.get_counts."""
+        return list(await self.db.execute(_ranked_counts(conditions, limit)))
+
+
+def _deltas(added: Iterable[FacetKey], removed: Iterable[FacetKey]) -> List[dict]:
+    """Parameter sets of the upsert, one per facet value whose count changes."""
+    counts = Counter(added)
+    counts.subtract(removed)
+    return [
+        {"facet": facet.value, "value": value, "book_count": delta}
+        for (facet, value), delta in counts.items() if delta
+    ]
+
+
+def _upsert(dialect_name: str):
+    """INSERT ... ON CONFLICT adding each delta to its facet value's count.
+    
+    Concurrent writes to the same value serialize on its row instead of
+    overwriting each other's counts.
+    """
+    dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    statement = dialect_insert(BookFacetCount)
+    return statement.on_conflict_do_update(
+        index_elements=[BookFacetCount.facet, BookFacetCount.value],
+        set_={"book_count": BookFacetCount.book_count + statement.excluded.book_count},
+    )
+
+
+def _grouped_counts(conditions: Sequence):
+    """UNION of one GROUP BY per facet over the books matching the conditions."""
+    books = (
+        select(Book.id, Book.genre_id, Book.publisher_id, Book.published_date)
+        .where(*conditions)
+        .cte("matching_books")
+    )
+    decade = cast(extract("year", books.c.published_date), Integer) // 10 * 10
+    
+    def counts(facet: Facet, value, *where):
+        return (
+            select(
+                literal(facet.value, String).label("facet"),
+                value.label("value"),
+                func.count().label("book_count"),
+            )
+            .where(*where)
+            .group_by(value)
+        )
+    
+    return union_all(
+        counts(Facet.GENRE, books.c.genre_id, books.c.genre_id.isnot(None)),
+        counts(Facet.PUBLISHER, books.c.publisher_id, books.c.publisher_id.isnot(None)),
+        counts(Facet.AUTHOR, book_authors.c.author_id, book_authors.c.book_id == books.c.id),
+        counts(Facet.DECADE, decade, books.c.published_date.isnot(None)),
+    )
+
+
+def _ranked_counts(conditions: Sequence, limit: int):
+    """SELECT of the top values of each facet with the name of their entity."""
+    if conditions:
+        counts = _grouped_counts(conditions).subquery("counts")
+    else:
+        counts = (
+            select(BookFacetCount.facet, BookFacetCount.value, BookFacetCount.book_count)
+            .where(BookFacetCount.book_count > 0)
+            .subquery("counts")
+        )
+    rank = func.row_number().over(
+        partition_by=counts.c.facet,
+        order_by=(counts.c.book_count.desc(), counts.c.value),
+    )
+    ranked = select(counts, rank.label("rank")).subquery("ranked")
+    name = func.coalesce(Genre.name, Publisher.name, Author.name + " " + Author.surname)
+    return (
+        select(ranked.c.facet, ranked.c.value, ranked.c.book_count, name.label("name"))
+        .select_from(ranked)
+        .outerjoin(Genre, (ranked.c.facet == Facet.GENRE.value) & (Genre.id == ranked.c.value))
+        .outerjoin(Publisher, (ranked.c.facet == Facet.PUBLISHER.value) & (Publisher.id == ranked.c.value))
+        .outerjoin(Author, (ranked.c.facet == Facet.AUTHOR.value) & (Author.id == ranked.c.value))
+        .where(ranked.c.rank <= limit)
+        .order_by(ranked.c.facet, ranked.c.rank)
+    )
+
+
+def _insert_counts():
+    """INSERT ... SELECT storing the counts of the whole catalog."""
+    counts = _grouped_counts(()).subquery("counts")
+    return insert(BookFacetCount).from_select(
+        [BookFacetCount.facet, BookFacetCount.value, BookFacetCount.book_count],
+        select(counts.c.facet, counts.c.value, counts.c.book_count),
+    )
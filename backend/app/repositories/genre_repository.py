@@ -1,18 +1,29 @@
 """Genre repository for data access operations"""
 
 from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.models import Genre
-from .base_repository import BaseRepository
+from app.caching import GENRES
+from app.models import Book, Genre
+from .base_repository import AsyncBaseRepository, BaseRepository
+from .cached_repository import AsyncCachedReadsMixin, CachedReadsMixin, reference_cache
+from .search_repository import SearchRepository
 
+GENRE_CACHE = reference_cache(GENRES)
 
-class GenreRepository(BaseRepository[Genre]):
+
+class GenreRepository(CachedReadsMixin, BaseRepository[Genre]):
     """Repository for Genre entity data access.
     
-    Extends BaseRepository with genre-specific query methods.
+    Extends BaseRepository with genre-specific query methods. Projected
+    reads are served from GENRE_CACHE.
     """
     
+    cache = GENRE_CACHE
+    sort_attribute = "name"
+    
     def __init__(self, db: Session):
         """Initialize the genre repository.
         
@@ -20,6 +31,7 @@ class GenreRepository(BaseRepository[Genre]):
             db: The database session.
         """
         super().__init__(Genre, db)
+        self.search = SearchRepository(db)
     
     def get_by_name(self, name: str) -> Optional[Genre]:
         """Find a genre by its name.
@@ -47,3 +59,50 @@ class GenreRepository(BaseRepository[Genre]):
             .order_by(Genre.name)
             .all()
         )
+    
+    def has_books(self, genre_id: int) -> bool:
+        """Check if a genre has any associated books.
+        
+        Args:
+            genre_id: The genre's primary key.
+            
+        Returns:
+            True if the genre has books, False otherwise.
+        """
+        return self.exists_where(Book.genre_id == genre_id)
+    
+    def _on_saved(self, entity: Genre) -> None:
+        """Refresh the search documents of books in this genre."""
+        self.search.index_books_by("genre_id", entity.id)
+
+
+class AsyncGenreRepository(AsyncCachedReadsMixin, AsyncBaseRepository[Genre]):
+    """Async repository for Genre entity data access."""
+    
+    cache = GENRE_CACHE
+    sort_attribute = "name"
+    
+    def __init__(self, db: AsyncSession):
+        """Initialize the genre repository.
+        
+        Args:
+            db: The async database session.
+        """
+        super().__init__(Genre, db)
+    
+    async def get_all_sorted(self) -> List[Genre]:
+        """Retrieve all genres sorted alphabetically by name.
+        
+        Returns:
+            List of all genres sorted by name.
+        """
+        return list(await self.db.scalars(select(Genre).order_by(Genre.name)))
+    
+    async def has_books(self, genre_id: int) -> bool:
+        """See GenreRepository.has_books."""
+        return await self.exists_where(Book.genre_id == genre_id)
+    
+    async def _on_saved(self, entity: Genre) -> None:
+        """Refresh the search documents of books in this genre."""
+        genre_id = entity.id
+        await self.db.run_sync(lambda session: SearchRepository(session).index_books_by("genre_id", genre_id))
@@ -1,18 +1,29 @@
 """Publisher repository for data access operations"""
 
 from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.models import Publisher
-from .base_repository import BaseRepository
+from app.caching import PUBLISHERS
+from app.models import Book, Publisher
+from .base_repository import AsyncBaseRepository, BaseRepository
+from .cached_repository import AsyncCachedReadsMixin, CachedReadsMixin, reference_cache
+from .search_repository import SearchRepository
 
+PUBLISHER_CACHE = reference_cache(PUBLISHERS)
 
-class PublisherRepository(BaseRepository[Publisher]):
+
+class PublisherRepository(CachedReadsMixin, BaseRepository[Publisher]):
     """Repository for Publisher entity data access.
     
-    Extends BaseRepository with publisher-specific query methods.
+    Extends BaseRepository with publisher-specific query methods. Projected
+    reads are served from PUBLISHER_CACHE.
     """
     
+    cache = PUBLISHER_CACHE
+    sort_attribute = "name"
+    
     def __init__(self, db: Session):
         """Initialize the publisher repository.
         
@@ -20,6 +31,7 @@ class PublisherRepository(BaseRepository[Publisher]):
             db: The database session.
         """
         super().__init__(Publisher, db)
+        self.search = SearchRepository(db)
     
     def get_by_name(self, name: str) -> Optional[Publisher]:
         """Find a publisher by its name.
@@ -47,3 +59,50 @@ class PublisherRepository(BaseRepository[Publisher]):
             .order_by(Publisher.name)
             .all()
         )
+    
+    def has_books(self, publisher_id: int) -> bool:
+        """Check if a publisher has any associated books.
+        
+        Args:
+            publisher_id: The publisher's primary key.
+            
+        Returns:
+            True if the publisher has books, False otherwise.
+        """
+        return self.exists_where(Book.publisher_id == publisher_id)
+    
+    def _on_saved(self, entity: Publisher) -> None:
+        """Refresh the search documents of books from this publisher."""
+        self.search.index_books_by("publisher_id", entity.id)
+
+
+class AsyncPublisherRepository(AsyncCachedReadsMixin, AsyncBaseRepository[Publisher]):
+    """Async repository for Publisher entity data access."""
+    
+    cache = PUBLISHER_CACHE
+    sort_attribute = "name"
+    
+    def __init__(self, db: AsyncSession):
+        """Initialize the publisher repository.
+        
+        Args:
+            db: The async database session.
+        """
+        super().__init__(Publisher, db)
+    
+    async def get_all_sorted(self) -> List[Publisher]:
+        """Retrieve all publishers sorted alphabetically by name.
+        
+        Returns:
+            List of all publishers sorted by name.
+        """
+        return list(await self.db.scalars(select(Publisher).order_by(Publisher.name)))
+    
+    async def has_books(self, publisher_id: int) -> bool:
+        """See PublisherRepository.has_books."""
+        return await self.exists_where(Book.publisher_id == publisher_id)
+    
+    async def _on_saved(self, entity: Publisher) -> None:
+        """Refresh the search documents of books from this publisher."""
+        publisher_id = entity.id
+        await self.db.run_sync(lambda session: SearchRepository(session).index_books_by("publisher_id", publisher_id))
@@ -0,0 +1,257 @@
+"""Search repository backed by SQLite FTS5 or PostgreSQL full-text indexes"""
+
+import re
+from typing import Iterable, List, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .base_repository import IN_CLAUSE_BATCH_SIZE
+
+# Aggregates the author names of each book into one string
+AUTHOR_NAMES_AGGREGATE = {
+    "sqlite": "group_concat(a.name || ' ' || a.surname, ' ')",
+    "postgresql": "string_agg(a.name || ' ' || a.surname, ' ')",
+}
+
+BOOK_DOCUMENTS_SELECT = """
+SELECT
+    b.id,
+    b.title,
+    coalesce(b.edition, ''),
+    coalesce((
+        SELECT {author_names}
+        FROM book_authors ba JOIN authors a ON a.id = ba.author_id
+        WHERE ba.book_id = b.id
+    ), ''),
+    coalesce(g.name, ''),
+    coalesce(p.name, '')
+FROM books b
+LEFT JOIN genres g ON g.id = b.genre_id
+LEFT JOIN publishers p ON p.id = b.publisher_id
+"""
+
+# Turns the columns of BOOK_DOCUMENTS_SELECT into a weighted tsvector:
+# title A, authors B, genre and publisher C, edition D
+POSTGRESQL_BOOK_DOCUMENT = """
+SELECT
+    id,
+    setweight(to_tsvector('catalog_search', title), 'A')
+        || setweight(to_tsvector('catalog_search', authors), 'B')
+        || setweight(to_tsvector('catalog_search', genre || ' ' || publisher), 'C')
+        || setweight(to_tsvector('catalog_search', edition), 'D')
+FROM ({documents}) AS documents(id, title, edition, authors, genre, publisher)
+"""
+
+POSTGRESQL_AUTHOR_DOCUMENT = "SELECT id, to_tsvector('catalog_search', name || ' ' || surname) FROM authors"
+
+# Column weights for bm25: title, edition, authors, genre, publisher
+BOOK_RANK = "bm25(books_fts, 10.0, 1.0, 5.0, 2.0, 2.0)"
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class SearchRepository:
+    """Repository for full-text search over books and authors.
+    
+    Maintains the books_fts and authors_fts tables: FTS5 virtual tables on
+    SQLite, tsvector tables with GIN indexes on PostgreSQL. Entity
+    repositories call the index methods from their write paths inside the
+    same transaction, so the index never drifts from the catalog.
+    
+    Attributes:
+        db: The database session for operations.
+        dialect: Name of the database dialect, sqlite or postgresql.
+    """
+    
+    def __init__(self, db: Session):
+        """Initialize the search repository.
+        
+        Args:
+            db: The database session.
+        """
+        self.db = db
+        self.dialect = db.get_bind().dialect.name
+        if self.dialect not in AUTHOR_NAMES_AGGREGATE:
+            raise ValueError(f"Full-text search is not supported on {self.dialect}")
+    
+    @property
+    def _postgresql(self) -> bool:
+        """Whether the index uses PostgreSQL tsvector tables."""
+        return self.dialect == "postgresql"
+    
+    def rebuild(self) -> None:
+        """Repopulate both FTS tables from the catalog tables."""
+        self.db.execute(text("DELETE FROM books_fts"))
+        self.db.execute(text("DELETE FROM authors_fts"))
+        self.db.execute(text(self._insert_books()))
+        self.db.execute(text(self._insert_authors()))
+    
+    def index_books(self, book_ids: Iterable[int]) -> None:
+        """Refresh the search documents of the given books.
+        
+        Args:
+            book_ids: Primary keys of books that were created or changed.
+        """
+        for batch in _batches(book_ids):
+            params = {f"id{i}": id for i, id in enumerate(batch)}
+            placeholders = ", ".join(f":{name}" for name in params)
+            self.db.execute(text(f"DELETE FROM books_fts WHERE rowid IN ({placeholders})"), params)
+            self.db.execute(text(self._insert_books(f"WHERE b.id IN ({placeholders})")), params)
+    
+    def index_books_by(self, column: str, value: int) -> None:
+        """Refresh the documents of every book referencing a related entity.
+        
+        Args:
+            column: The referencing column, one of author_id, genre_id or publisher_id.
+            value: The related entity's primary key.
+        """
+        if column == "author_id":
+            condition = "b.id IN (SELECT book_id FROM book_authors WHERE author_id = :value)"
+        elif column in ("genre_id", "publisher_id"):
+            condition = f"b.{column} = :value"
+        else:
+            raise ValueError(f"Cannot index books by {column}")
+        
+        self.db.execute(
+            text(f"DELETE FROM books_fts WHERE rowid IN (SELECT b.id FROM books b WHERE {condition})"),
+            {"value": value},
+        )
+        self.db.execute(text(self._insert_books(f"WHERE {condition}")), {"value": value})
+    
+    def remove_book(self, book_id: int) -> None:
+        """Drop a deleted book from the index.
+        
+        Args:
+            book_id: The book's primary key.
+        """
+        self.db.execute(text("DELETE FROM books_fts WHERE rowid = :id"), {"id": book_id})
+    
+    def index_author(self, author_id: int) -> None:
+        """Refresh an author's search document.
+        
+        Args:
+            author_id: The author's primary key.
+        """
+        self.remove_author(author_id)
+        self.db.execute(text(self._insert_authors("WHERE id = :id")), {"id": author_id})
+    
+    def remove_author(self, author_id: int) -> None:
+        """Drop an author from the index.
+        
+        Args:
+            author_id: The author's primary key.
+        """
+        self.db.execute(text("DELETE FROM authors_fts WHERE rowid = :id"), {"id": author_id})
+    
+    def search_books(self, terms: Sequence[str], limit: int) -> List:
+        """Find books matching every term, best matches first.
+        
+        Args:
+            terms: Words to match; each is treated as a prefix.
+            limit: Maximum number of results.
+        
+        Returns:
+            Rows with id and title.
+        """
+        if self._postgresql:
+            return self.db.execute(
+                text(
+                    "SELECT b.id, b.title FROM books_fts JOIN books b ON b.id = books_fts.rowid, "
+                    "to_tsquery('catalog_search', :query) AS query "
+                    "WHERE books_fts.document @@ query "
+                    "ORDER BY ts_rank(books_fts.document, query) DESC, b.id LIMIT :limit"
+                ),
+                {"query": build_tsquery(terms), "limit": limit},
+            ).all()
+        return self.db.execute(
+            text(
+                "SELECT b.id, b.title FROM books_fts JOIN books b ON b.id = books_fts.rowid "
+                f"WHERE books_fts MATCH :query ORDER BY {BOOK_RANK} LIMIT :limit"
+            ),
+            {"query": build_match_query(terms), "limit": limit},
+        ).all()
+    
+    def search_authors(self, terms: Sequence[str], limit: int) -> List:
+        """Find authors matching every term, best matches first.
+        
+        Args:
+            terms: Words to match; each is treated as a prefix.
+            limit: Maximum number of results.
+        
+        Returns:
+            Rows with id, name and surname.
+        """
+        if self._postgresql:
+            return self.db.execute(
+                text(
+                    "SELECT a.id, a.name, a.surname FROM authors_fts JOIN authors a ON a.id = authors_fts.rowid, "
+                    "to_tsquery('catalog_search', :query) AS query "
+                    "WHERE authors_fts.document @@ query "
+                    "ORDER BY ts_rank(authors_fts.document, query) DESC, a.id LIMIT :limit"
+                ),
+                {"query": build_tsquery(terms), "limit": limit},
+            ).all()
+        return self.db.execute(
+            text(
+                "SELECT a.id, a.name, a.surname FROM authors_fts JOIN authors a ON a.id = authors_fts.rowid "
+                "WHERE authors_fts MATCH :query ORDER BY rank LIMIT :limit"
+            ),
+            {"query": build_match_query(terms), "limit": limit},
+        ).all()
+    
+    def _insert_books(self, where: str = "") -> str:
+        """Build the statement indexing the books selected by a WHERE clause."""
+        documents = BOOK_DOCUMENTS_SELECT.format(author_names=AUTHOR_NAMES_AGGREGATE[self.dialect]) + where
+        if self._postgresql:
+            return "INSERT INTO books_fts(rowid, document) " + POSTGRESQL_BOOK_DOCUMENT.format(documents=documents)
+        return "INSERT INTO books_fts(rowid, title, edition, authors, genre, publisher) " + documents
+    
+    def _insert_authors(self, where: str = "") -> str:
+        """Build the statement indexing the authors selected by a WHERE clause."""
+        if self._postgresql:
+            return f"INSERT INTO authors_fts(rowid, document) {POSTGRESQL_AUTHOR_DOCUMENT} {where}"
+        return f"INSERT INTO authors_fts(rowid, name, surname) SELECT id, name, surname FROM authors {where}"
+
+
+def tokenize_query(query: str) -> List[str]:
+    """Split free text into searchable words, dropping FTS operators.
+    
+    Args:
+        query: The raw user query.
+    
+    Returns:
+        The words in the query.
+    """
+    return WORD_PATTERN.findall(query)
+
+
+def build_match_query(terms: Sequence[str]) -> str:
+    """Build an FTS5 MATCH expression requiring every term as a prefix.
+    
+    Args:
+        terms: Words produced by tokenize_query.
+    
+    Returns:
+        The MATCH expression.
+    """
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def build_tsquery(terms: Sequence[str]) -> str:
+    """Build a PostgreSQL tsquery requiring every term as a prefix.
+    
+    Args:
+        terms: Words produced by tokenize_query.
+    
+    Returns:
+        The tsquery text.
+    """
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def _batches(ids: Iterable[int]) -> Iterable[List[int]]:
+    """Split ids into lists small enough for an IN clause."""
+    ids = list(ids)
+    for start in range(0, len(ids), IN_CLAUSE_BATCH_SIZE):
+        yield ids[start:start + IN_CLAUSE_BATCH_SIZE]
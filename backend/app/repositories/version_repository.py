@@ -0,0 +1,140 @@
+"""Version repository for the rows behind HTTP validators"""
+
+from typing import Iterable, Type
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import CollectionVersion, Versioned, utcnow
+from .base_repository import IN_CLAUSE_BATCH_SIZE
+
+
+class VersionRepository:
+    """Reads and bumps entity and collection versions.
+    
+    Reads select two columns by primary key, so a conditional GET costs one
+    index lookup. Bumps are plain UPDATE statements that join the caller's
+    transaction and are committed with the write they describe.
+    
+    Attributes:
+        db: The database session for operations.
+    """
+    
+    def __init__(self, db: Session):
+        """Initialize the version repository.
+        
+        Args:
+            db: The database session.
+        """
+        self.db = db
+    
+    def get_entity(self, model: Type[Versioned], id: int):
+        """Retrieve the version and updated_at of an entity.
+        
+        Args:
+            model: The versioned model class.
+            id: The entity's primary key.
+        
+        Returns:
+            A (version, updated_at) row, or None if the entity doesn't exist.
+        """
+        statement = select(model.version, model.updated_at).where(model.id == id)
+        return self.db.execute(statement).first()
+    
+    def get_collection(self, name: str):
+        """Retrieve the version and updated_at of a collection.
+        
+        Args:
+            name: The collection's table name.
+        
+        Returns:
+            A (version, updated_at) row, or None before migrations ran.
+        """
+        statement = (
+            select(CollectionVersion.version, CollectionVersion.updated_at)
+            .where(CollectionVersion.name == name)
+        )
+        return self.db.execute(statement).first()
+    
+    def bump_entities(self, model: Type[Versioned], ids: Iterable[int]) -> None:
+        """Bump the version of several entities.
+        
+        Args:
+            model: The versioned model class.
+            ids: Primary keys of the entities whose representation changed.
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        for start in range(0, len(unique_ids), IN_CLAUSE_BATCH_SIZE):
+            batch = unique_ids[start:start + IN_CLAUSE_BATCH_SIZE]
+            self.db.execute(_bump(model, model.id.in_(batch)))
+    
+    def bump_entities_where(self, model: Type[Versioned], condition) -> None:
+        """Bump the version of every entity matching a condition.
+        
+        Args:
+            model: The versioned model class.
+            condition: SQL expression selecting the entities, e.g. Book.genre_id == 3.
+        """
+        self.db.execute(_bump(model, condition))
+    
+    def bump_collection(self, name: str) -> None:
+        """Bump the version of a collection.
+        
+        Args:
+            name: The collection's table name.
+        """
+        self.db.execute(_bump(CollectionVersion, CollectionVersion.name == name))
+
+
+class AsyncVersionRepository:
+    """Async variant of VersionRepository for an AsyncSession."""
+    
+    def __init__(self, db: AsyncSession):
+        """Initialize the version repository.
+        
+        Args:
+            db: The async database session.
+        """
+        self.db = db
+    
+    async def get_entity(self, model: Type[Versioned], id: int):
+        """See VersionRepository.get_entity."""
+        statement = select(model.version, model.updated_at).where(model.id == id)
+        return (await self.db.execute(statement)).first()
+    
+    async def get_collection(self, name: str):
+        """See VersionRepository.get_collection."""
+        statement = (
+            select(CollectionVersion.version, CollectionVersion.updated_at)
+            .where(CollectionVersion.name == name)
+        )
+        return (await self.db.execute(statement)).first()
+    
+    async def bump_entities(self, model: Type[Versioned], ids: Iterable[int]) -> None:
+        """See VersionRepository.bump_entities."""
+        unique_ids = list(dict.fromkeys(ids))
+        for start in range(0, len(unique_ids), IN_CLAUSE_BATCH_SIZE):
+            batch = unique_ids[start:start + IN_CLAUSE_BATCH_SIZE]
+            await self.db.execute(_bump(model, model.id.in_(batch)))
+    
+    async def bump_entities_where(self, model: Type[Versioned], condition) -> None:
+        """See VersionRepository.bump_entities_where."""
+        await self.db.execute(_bump(model, condition))
+    
+    async def bump_collection(self, name: str) -> None:
+        """See VersionRepository.bump_collection."""
+        await self.db.execute(_bump(CollectionVersion, CollectionVersion.name == name))
+
+
+def _bump(model, condition):
+    """UPDATE incrementing version and stamping updated_at on matching rows.
+    
+    The session is not synchronized: loaded entities keep their old version
+    until they are refreshed after commit.
+    """
+    return (
+        update(model)
+        .where(condition)
+        .values(version=model.version + 1, updated_at=utcnow())
+        .execution_options(synchronize_session=False)
+    )
@@ -1,29 +1,59 @@
 """Author API endpoints"""
 
-from typing import List
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..database import get_db
+from ..core.conditional import is_not_modified, not_modified_response, set_validator_headers
+from ..core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_next_cursor_header
+from ..core.responses import ModelResponse
+from ..database import get_async_db, get_db
 from ..schemas import AuthorCreate, AuthorUpdate, AuthorSummary, AuthorWithBooks
-from ..services import AuthorService
+from ..services import AuthorService, AsyncAuthorService
 
 
 router = APIRouter(prefix="/authors", tags=["Authors"])
 
+# Same endpoints on an AsyncSession, served when DATABASE_ASYNC is enabled
+async_router = APIRouter(prefix="/authors", tags=["Authors"])
+
 
 def get_author_service(db: Session = Depends(get_db)) -> AuthorService:
     """Dependency injection for AuthorService."""
     return AuthorService(db)
 
 
+def get_async_author_service(db: AsyncSession = Depends(get_async_db)) -> AsyncAuthorService:
+    """Dependency injection for AsyncAuthorService."""
+    return AsyncAuthorService(db)
+
+
 @router.get("", response_model=List[AuthorSummary])
-def get_authors(service: AuthorService = Depends(get_author_service)):
+def get_authors(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="Cursor from the previous page"),
+    service: AuthorService = Depends(get_author_service)
+):
     """Get list of all authors.
     
-    Returns a list of all authors with summary information.
+    Returns one page of authors with summary information. When more
+    authors remain, the cursor for the next page is sent in the
+    X-Next-Cursor response header and can be passed back as `after`.
+    
+    Args:
+        limit: Maximum number of authors to return.
+        after: Cursor returned with the previous page, if any.
     """
-    return service.get_all_authors()
+    validator = service.get_authors_validator()
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    page = service.get_authors_page(limit=limit, after=after, projection=AuthorSummary)
+    response = ModelResponse(page.items, List[AuthorSummary])
+    set_next_cursor_header(response, page)
+    set_validator_headers(response, validator)
+    return response
 
 
 @router.post("", response_model=AuthorWithBooks, status_code=201)
@@ -45,17 +75,26 @@ def create_author(
 @router.get("/{author_id}", response_model=AuthorWithBooks)
 def get_author(
     author_id: int,
+    request: Request,
     service: AuthorService = Depends(get_author_service)
 ):
     """Get a specific author by ID with their books.
     
+    The response is served from the entity cache when the cached copy
+    has the author's current version, the one its ETag is built from.
+    
     Args:
         author_id: The author's primary key.
         
     Returns:
         The author with their associated books.
     """
-    return service.get_author_by_id(author_id)
+    validator = service.get_author_validator(author_id)
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    response = Response(content=service.get_author(author_id, validator.etag), media_type="application/json")
+    set_validator_headers(response, validator)
+    return response
 
 
 @router.put("/{author_id}", response_model=AuthorWithBooks)
@@ -90,3 +129,105 @@ def delete_author(
     """
     service.delete_author(author_id)
     return None
+
+
+@async_router.get("", response_model=List[AuthorSummary])
+async def get_authors_async(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="Cursor from the previous page"),
+    service: AsyncAuthorService = Depends(get_async_author_service)
+):
+    """Get list of all authors.
+    
+    Returns one page of authors with summary information. When more
+    authors remain, the cursor for the next page is sent in the
+    X-Next-Cursor response header and can be passed back as `after`.
+    
+    Args:
+        limit: Maximum number of authors to return.
+        after: Cursor returned with the previous page, if any.
+    """
+    validator = await service.get_authors_validator()
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    page = await service.get_authors_page(limit=limit, after=after, projection=AuthorSummary)
+    response = ModelResponse(page.items, List[AuthorSummary])
+    set_next_cursor_header(response, page)
+    set_validator_headers(response, validator)
+    return response
+
+
+@async_router.post("", response_model=AuthorWithBooks, status_code=201)
+async def create_author_async(
+    author: AuthorCreate,
+    service: AsyncAuthorService = Depends(get_async_author_service)
+):
+    """Create a new author.
+    
+    Args:
+        author: The author data to create.
+        
+    Returns:
+        The newly created author with their books.
+    """
+    return await service.create_author(author)
+
+
+@async_router.get("/{author_id}", response_model=AuthorWithBooks)
+async def get_author_async(
+    author_id: int,
+    request: Request,
+    service: AsyncAuthorService = Depends(get_async_author_service)
+):
+    """Get a specific author by ID with their books.
+    
+    The response is served from the entity cache when the cached copy
+    has the author's current version, the one its ETag is built from.
+    
+    Args:
+        author_id: The author's primary key.
+        
+    Returns:
+        The author with their associated books.
+    """
+    validator = await service.get_author_validator(author_id)
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    response = Response(content=await service.get_author(author_id, validator.etag), media_type="application/json")
+    set_validator_headers(response, validator)
+    return response
+
+
+@async_router.put("/{author_id}", response_model=AuthorWithBooks)
+async def update_author_async(
+    author_id: int,
+    author: AuthorUpdate,
+    service: AsyncAuthorService = Depends(get_async_author_service)
+):
+    """Update an existing author.
+    
+    Args:
+        author_id: The author's primary key.
+        author: The updated author data.
+        
+    Returns:
+        The updated author with their books.
+    """
+    return await service.update_author(author_id, author)
+
+
+@async_router.delete("/{author_id}", status_code=204)
+async def delete_author_async(
+    author_id: int,
+    service: AsyncAuthorService = Depends(get_async_author_service)
+):
+    """Delete an author.
+    
+    Fails if the author has associated books.
+    
+    Args:
+        author_id: The author's primary key.
+    """
+    await service.delete_author(author_id)
+    return None
@@ -4,30 +4,110 @@ This module defines thin REST API endpoints for Book operations.
 Business logic is delegated to the BookService.
 """
 
-from typing import List
-from fastapi import APIRouter, Depends
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..database import get_db
-from ..schemas import BookCreate, BookUpdate, BookSummary, BookResponse
-from ..services import BookService
+from ..core.conditional import is_not_modified, not_modified_response, set_validator_headers
+from ..core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SortOrder, set_next_cursor_header
+from ..core.responses import ModelResponse
+from ..database import get_async_db, get_db
+from ..schemas import (
+    BookCreate,
+    BookUpdate,
+    BookSummary,
+    BookResponse,
+    BookImportResult,
+    BookFacets,
+    BookQuery,
+    BookSortField,
+)
+from ..services import BookService, AsyncBookService, BookImportService, ImportFormat, book_fields_schema
 
 
 router = APIRouter(prefix="/books", tags=["Books"])
 
+# Same endpoints on an AsyncSession, served when DATABASE_ASYNC is enabled
+async_router = APIRouter(prefix="/books", tags=["Books"])
+
 
 def get_book_service(db: Session = Depends(get_db)) -> BookService:
     """Dependency injection for BookService."""
     return BookService(db)
 
 
+def get_async_book_service(db: AsyncSession = Depends(get_async_db)) -> AsyncBookService:
+    """Dependency injection for AsyncBookService."""
+    return AsyncBookService(db)
+
+
+def get_book_import_service(db: Session = Depends(get_db)) -> BookImportService:
+    """Dependency injection for BookImportService."""
+    return BookImportService(db)
+
+
+def get_book_filters(
+    author_id: Optional[int] = Query(None, description="Only books by this author"),
+    genre_id: Optional[int] = Query(None, description="Only books in this genre"),
+    publisher_id: Optional[int] = Query(None, description="Only books from this publisher"),
+    published_from: Optional[date] = Query(None, description="Only books published on or after this date"),
+    published_to: Optional[date] = Query(None, description="Only books published on or before this date"),
+    title: Optional[str] = Query(None, min_length=1, description="Only titles starting with this text, case-sensitive"),
+) -> BookQuery:
+    """Collect the filter parameters of the book list and facets."""
+    return BookQuery(
+        author_id=author_id,
+        genre_id=genre_id,
+        publisher_id=publisher_id,
+        published_from=published_from,
+        published_to=published_to,
+        title=title,
+    )
+
+
+def get_book_query(
+    filters: BookQuery = Depends(get_book_filters),
+    sort_by: BookSortField = Query(BookSortField.ID),
+    order: SortOrder = Query(SortOrder.ASC),
+) -> BookQuery:
+    """Collect the filter and sort parameters of the book list."""
+    return filters.model_copy(update={"sort_by": sort_by, "order": order})
+
+
 @router.get("", response_model=List[BookSummary])
-def get_books(service: BookService = Depends(get_book_service)):
+def get_books(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="Cursor from the previous page"),
+    query: BookQuery = Depends(get_book_query),
+    fields: Optional[str] = Query(None, description="Comma-separated book columns to return"),
+    service: BookService = Depends(get_book_service)
+):
     """Get list of all books.
     
-    Returns a list of all books with summary information.
+    Returns one page of books matching the filters, with summary
+    information or the columns listed in `fields`. When more books
+    remain, the cursor for the next page is sent in the X-Next-Cursor
+    response header and can be passed back as `after` with the same
+    filters and sort order.
+    
+    Args:
+        limit: Maximum number of books to return.
+        after: Cursor returned with the previous page, if any.
+        query: Filters and sort order.
+        fields: Sparse fieldset replacing the summary, e.g. `id,title,isbn`.
     """
-    return service.get_all_books()
+    schema = BookSummary if fields is None else book_fields_schema(fields)
+    validator = service.get_books_validator()
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    page = service.get_books_page(limit=limit, after=after, projection=schema, query=query)
+    response = ModelResponse(page.items, List[schema])
+    set_next_cursor_header(response, page)
+    set_validator_headers(response, validator)
+    return response
 
 
 @router.post("", response_model=BookResponse, status_code=201)
@@ -46,20 +126,81 @@ def create_book(
     return service.create_book(book)
 
 
+@router.post("/bulk", response_model=BookImportResult)
+@async_router.post("/bulk", response_model=BookImportResult)
+def import_books(
+    file: UploadFile = File(...),
+    format: Optional[ImportFormat] = Query(None, description="Defaults from the file extension"),
+    service: BookImportService = Depends(get_book_import_service)
+):
+    """Bulk import books from an NDJSON or CSV upload.
+    
+    Rows use the same fields as a single book create; in CSV the
+    author_ids column holds semicolon-separated ids. Valid rows are
+    inserted in batches and invalid rows are reported by line number.
+    
+    Args:
+        file: The NDJSON or CSV feed.
+        format: The feed format, overriding the file extension.
+        
+    Returns:
+        Counts of imported and failed rows with per-row errors.
+    """
+    import_format = format or ImportFormat.from_filename(file.filename)
+    return service.import_books(file.file, import_format)
+
+
+@router.get("/facets", response_model=BookFacets)
+def get_book_facets(
+    request: Request,
+    query: BookQuery = Depends(get_book_filters),
+    limit: int = Query(10, ge=1, le=100, description="Most frequent values returned per facet"),
+    service: BookService = Depends(get_book_service)
+):
+    """Count the books matching the filters per facet value.
+    
+    Takes the same filters as the book list and returns the number of
+    matching books per genre, publisher, author and publication decade.
+    Unfiltered counts are read from incrementally maintained totals.
+    
+    Args:
+        query: Filters.
+        limit: Maximum number of values per facet, the most frequent first.
+        
+    Returns:
+        The counts of each facet.
+    """
+    validator = service.get_facets_validator()
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    response = ModelResponse(service.get_facets(query, limit), BookFacets)
+    set_validator_headers(response, validator)
+    return response
+
+
 @router.get("/{book_id}", response_model=BookResponse)
 def get_book(
     book_id: int,
+    request: Request,
     service: BookService = Depends(get_book_service)
 ):
     """Get a specific book by ID.
     
+    The response is served from the entity cache when the cached copy
+    has the book's current version, the one its ETag is built from.
+    
     Args:
         book_id: The book's primary key.
         
     Returns:
         The book with all related information.
     """
-    return service.get_book_by_id(book_id)
+    validator = service.get_book_validator(book_id)
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    response = Response(content=service.get_book(book_id, validator.etag), media_type="application/json")
+    set_validator_headers(response, validator)
+    return response
 
 
 @router.put("/{book_id}", response_model=BookResponse)
@@ -92,3 +233,138 @@ def delete_book(
     """
     service.delete_book(book_id)
     return None
+
+
+@async_router.get("", response_model=List[BookSummary])
+async def get_books_async(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="Cursor from the previous page"),
+    query: BookQuery = Depends(get_book_query),
+    fields: Optional[str] = Query(None, description="Comma-separated book columns to return"),
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Get list of all books.
+    
+    Returns one page of books matching the filters, with summary
+    information or the columns listed in `fields`. When more books
+    remain, the cursor for the next page is sent in the X-Next-Cursor
+    response header and can be passed back as `after` with the same
+    filters and sort order.
+    
+    Args:
+        limit: Maximum number of books to return.
+        after: Cursor returned with the previous page, if any.
+        query: Filters and sort order.
+        fields: Sparse fieldset replacing the summary, e.g. `id,title,isbn`.
+    """
+    schema = BookSummary if fields is None else book_fields_schema(fields)
+    validator = await service.get_books_validator()
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    page = await service.get_books_page(limit=limit, after=after, projection=schema, query=query)
+    response = ModelResponse(page.items, List[schema])
+    set_next_cursor_header(response, page)
+    set_validator_headers(response, validator)
+    return response
+
+
+@async_router.post("", response_model=BookResponse, status_code=201)
+async def create_book_async(
+    book: BookCreate,
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Create a new book.
+    
+    Args:
+        book: The book data to create.
+        
+    Returns:
+        The newly created book with all details.
+    """
+    return await service.create_book(book)
+
+
+@async_router.get("/facets", response_model=BookFacets)
+async def get_book_facets_async(
+    request: Request,
+    query: BookQuery = Depends(get_book_filters),
+    limit: int = Query(10, ge=1, le=100, description="Most frequent values returned per facet"),
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Count the books matching the filters per facet value.
+    
+    Takes the same filters as the book list and returns the number of
+    matching books per genre, publisher, author and publication decade.
+    Unfiltered counts are read from incrementally maintained totals.
+    
+    Args:
+        query: Filters.
+        limit: Maximum number of values per facet, the most frequent first.
+        
+    Returns:
+        The counts of each facet.
+    """
+    validator = await service.get_facets_validator()
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    response = ModelResponse(await service.get_facets(query, limit), BookFacets)
+    set_validator_headers(response, validator)
+    return response
+
+
+@async_router.get("/{book_id}", response_model=BookResponse)
+async def get_book_async(
+    book_id: int,
+    request: Request,
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Get a specific book by ID.
+    
+    The response is served from the entity cache when the cached copy
+    has the book's current version, the one its ETag is built from.
+    
+    Args:
+        book_id: The book's primary key.
+        
+    Returns:
+        The book with all related information.
+    """
+    validator = await service.get_book_validator(book_id)
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    response = Response(content=await service.get_book(book_id, validator.etag), media_type="application/json")
+    set_validator_headers(response, validator)
+    return response
+
+
+@async_router.put("/{book_id}", response_model=BookResponse)
+async def update_book_async(
+    book_id: int,
+    book: BookUpdate,
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Update an existing book.
+    
+    Args:
+        book_id: The book's primary key.
+        book: The updated book data.
+        
+    Returns:
+        The updated book with all details.
+    """
+    return await service.update_book(book_id, book)
+
+
+@async_router.delete("/{book_id}", status_code=204)
+async def delete_book_async(
+    book_id: int,
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Delete a book.
+    
+    Args:
+        book_id: The book's primary key.
+    """
+    await service.delete_book(book_id)
+    return None
@@ -0,0 +1,49 @@
+"""Change feed API endpoints.
+
+This module defines thin REST API endpoints for delta sync.
+Business logic is delegated to the ChangeService.
+"""
+
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..schemas import ChangeFeed
+from ..services import ChangeService
+
+
+router = APIRouter(prefix="/changes", tags=["Changes"])
+
+# Changes per response by default and at most
+DEFAULT_CHANGES_LIMIT = 1000
+MAX_CHANGES_LIMIT = 10000
+
+
+def get_change_service(db: Session = Depends(get_db)) -> ChangeService:
+    """Dependency injection for ChangeService."""
+    return ChangeService(db)
+
+
+@router.get("", response_model=ChangeFeed)
+def get_changes(
+    since: Optional[int] = Query(None, ge=0, description="next_token of the previous call"),
+    limit: int = Query(DEFAULT_CHANGES_LIMIT, ge=1, le=MAX_CHANGES_LIMIT),
+    service: ChangeService = Depends(get_change_service)
+):
+    """Get the inserts, updates and deletes since a sync token.
+    
+    Without `since`, returns the current token only: record it, download
+    the lists, then poll with it. Each change names a collection and id to
+    refetch, or to drop for a delete. While `has_more` is true, call again
+    with `next_token` right away. A `410` means the changes after `since`
+    were pruned: download the lists again and sync from a new token.
+    
+    Args:
+        since: Token returned as next_token by the previous call.
+        limit: Maximum number of changes to return.
+    
+    Returns:
+        The changes, oldest first, and the next token.
+    """
+    return service.get_changes(since, limit)
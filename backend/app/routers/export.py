@@ -0,0 +1,43 @@
+"""Export API endpoints.
+
+This module defines streaming endpoints that dump whole collections in a
+single request. Business logic is delegated to the BookExportService.
+"""
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..services import BookExportService, ExportFormat
+
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+
+def get_book_export_service(db: Session = Depends(get_db)) -> BookExportService:
+    """Dependency injection for BookExportService."""
+    return BookExportService(db)
+
+
+@router.get("/books")
+def export_books(
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    service: BookExportService = Depends(get_book_export_service)
+):
+    """Stream the full book catalog.
+    
+    Each NDJSON line has the same shape as GET /books/{id}. The CSV
+    variant flattens publisher, genre and authors into columns.
+    
+    Args:
+        format: The export format, `ndjson` or `csv`.
+    
+    Returns:
+        A streaming download of every book.
+    """
+    return StreamingResponse(
+        service.stream_books(format),
+        media_type=format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="books.{format.value}"'},
+    )
@@ -4,30 +4,60 @@ This module defines thin REST API endpoints for Genre operations.
 Business logic is delegated to the GenreService.
 """
 
-from typing import List
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..database import get_db
+from ..core.conditional import is_not_modified, not_modified_response, set_validator_headers
+from ..core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_next_cursor_header
+from ..core.responses import ModelResponse
+from ..database import get_async_db, get_db
 from ..schemas import GenreCreate, GenreUpdate, GenreSummary, GenreResponse
-from ..services import GenreService
+from ..services import GenreService, AsyncGenreService
 
 
 router = APIRouter(prefix="/genres", tags=["Genres"])
 
+# Same endpoints on an AsyncSession, served when DATABASE_ASYNC is enabled
+async_router = APIRouter(prefix="/genres", tags=["Genres"])
+
 
 def get_genre_service(db: Session = Depends(get_db)) -> GenreService:
     """Dependency injection for GenreService."""
     return GenreService(db)
 
 
+def get_async_genre_service(db: AsyncSession = Depends(get_async_db)) -> AsyncGenreService:
+    """Dependency injection for AsyncGenreService."""
+    return AsyncGenreService(db)
+
+
 @router.get("", response_model=List[GenreSummary])
-def get_genres(service: GenreService = Depends(get_genre_service)):
+def get_genres(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="Cursor from the previous page"),
+    service: GenreService = Depends(get_genre_service)
+):
     """Get list of all genres sorted by name.
     
-    Returns a list of all genres with summary information.
+    Returns one page of genres with summary information. When more
+    genres remain, the cursor for the next page is sent in the
+    X-Next-Cursor response header and can be passed back as `after`.
+    
+    Args:
+        limit: Maximum number of genres to return.
+        after: Cursor returned with the previous page, if any.
     """
-    return service.get_all_genres()
+    validator = service.get_genres_validator()
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    page = service.get_genres_page(limit=limit, after=after, projection=GenreSummary)
+    response = ModelResponse(page.items, List[GenreSummary])
+    set_next_cursor_header(response, page)
+    set_validator_headers(response, validator)
+    return response
 
 
 @router.post("", response_model=GenreResponse, status_code=201)
@@ -49,6 +79,7 @@ def create_genre(
 @router.get("/{genre_id}", response_model=GenreResponse)
 def get_genre(
     genre_id: int,
+    request: Request,
     service: GenreService = Depends(get_genre_service)
 ):
     """Get a specific genre by ID.
@@ -59,7 +90,12 @@ def get_genre(
     Returns:
         The genre details.
     """
-    return service.get_genre_by_id(genre_id)
+    validator = service.get_genre_validator(genre_id)
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    response = ModelResponse(service.get_genre(genre_id), GenreResponse)
+    set_validator_headers(response, validator)
+    return response
 
 
 @router.put("/{genre_id}", response_model=GenreResponse)
@@ -94,3 +130,102 @@ def delete_genre(
     """
     service.delete_genre(genre_id)
     return None
+
+
+@async_router.get("", response_model=List[GenreSummary])
+async def get_genres_async(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="Cursor from the previous page"),
+    service: AsyncGenreService = Depends(get_async_genre_service)
+):
+    """Get list of all genres sorted by name.
+    
+    Returns one page of genres with summary information. When more
+    genres remain, the cursor for the next page is sent in the
+    X-Next-Cursor response header and can be passed back as `after`.
+    
+    Args:
+        limit: Maximum number of genres to return.
+        after: Cursor returned with the previous page, if any.
+    """
+    validator = await service.get_genres_validator()
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    page = await service.get_genres_page(limit=limit, after=after, projection=GenreSummary)
+    response = ModelResponse(page.items, List[GenreSummary])
+    set_next_cursor_header(response, page)
+    set_validator_headers(response, validator)
+    return response
+
+
+@async_router.post("", response_model=GenreResponse, status_code=201)
+async def create_genre_async(
+    genre: GenreCreate,
+    service: AsyncGenreService = Depends(get_async_genre_service)
+):
+    """Create a new genre.
+    
+    Args:
+        genre: The genre data to create.
+        
+    Returns:
+        The newly created genre.
+    """
+    return await service.create_genre(genre)
+
+
+@async_router.get("/{genre_id}", response_model=GenreResponse)
+async def get_genre_async(
+    genre_id: int,
+    request: Request,
+    service: AsyncGenreService = Depends(get_async_genre_service)
+):
+    """Get a specific genre by ID.
+    
+    Args:
+        genre_id: The genre's primary key.
+        
+    Returns:
+        The genre details.
+    """
+    validator = await service.get_genre_validator(genre_id)
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    response = ModelResponse(await service.get_genre(genre_id), GenreResponse)
+    set_validator_headers(response, validator)
+    return response
+
+
+@async_router.put("/{genre_id}", response_model=GenreResponse)
+async def update_genre_async(
+    genre_id: int,
+    genre: GenreUpdate,
+    service: AsyncGenreService = Depends(get_async_genre_service)
+):
+    """Update an existing genre.
+    
+    Args:
+        genre_id: The genre's primary key.
+        genre: The updated genre data.
+        
+    Returns:
+        The updated genre.
+    """
+    return await service.update_genre(genre_id, genre)
+
+
+@async_router.delete("/{genre_id}", status_code=204)
+async def delete_genre_async(
+    genre_id: int,
+    service: AsyncGenreService = Depends(get_async_genre_service)
+):
+    """Delete a genre.
+    
+    Fails if the genre has associated books.
+    
+    Args:
+        genre_id: The genre's primary key.
+    """
+    await service.delete_genre(genre_id)
+    return None
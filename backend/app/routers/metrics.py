@@ -0,0 +1,35 @@
+"""Metrics endpoint.
+
+This module exposes the process metrics in the Prometheus text format.
+Collection is done by app.core.metrics.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from ..caching import entity_cache
+from ..core.metrics import CONTENT_TYPE, render_metrics
+from ..repositories import GenreRepository, PublisherRepository
+
+
+router = APIRouter(tags=["Monitoring"])
+
+
+@router.get("/metrics", response_class=Response)
+async def get_metrics():
+    """Get the metrics of this worker process in the Prometheus text format.
+    
+    Reports request rates, latency histograms per route and in-flight
+    requests, database pool usage, SQLite lock errors and cache hit
+    ratios. Each worker keeps its own counters, so scrape every worker,
+    or run one worker per scrape target.
+    
+    Returns:
+        The metrics, rendered without touching the database.
+    """
+    caches = [
+        *entity_cache.stats().values(),
+        GenreRepository.cache.stats(),
+        PublisherRepository.cache.stats(),
+    ]
+    return Response(render_metrics(caches), media_type=CONTENT_TYPE)
@@ -4,30 +4,60 @@ This module defines thin REST API endpoints for Publisher operations.
 Business logic is delegated to the PublisherService.
 """
 
-from typing import List
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..database import get_db
+from ..core.conditional import is_not_modified, not_modified_response, set_validator_headers
+from ..core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_next_cursor_header
+from ..core.responses import ModelResponse
+from ..database import get_async_db, get_db
 from ..schemas import PublisherCreate, PublisherUpdate, PublisherSummary, PublisherResponse
-from ..services import PublisherService
+from ..services import PublisherService, AsyncPublisherService
 
 
 router = APIRouter(prefix="/publishers", tags=["Publishers"])
 
+# Same endpoints on an AsyncSession, served when DATABASE_ASYNC is enabled
+async_router = APIRouter(prefix="/publishers", tags=["Publishers"])
+
 
 def get_publisher_service(db: Session = Depends(get_db)) -> PublisherService:
     """Dependency injection for PublisherService."""
     return PublisherService(db)
 
 
+def get_async_publisher_service(db: AsyncSession = Depends(get_async_db)) -> AsyncPublisherService:
+    """Dependency injection for AsyncPublisherService."""
+    return AsyncPublisherService(db)
+
+
 @router.get("", response_model=List[PublisherSummary])
-def get_publishers(service: PublisherService = Depends(get_publisher_service)):
+def get_publishers(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="Cursor from the previous page"),
+    service: PublisherService = Depends(get_publisher_service)
+):
     """Get list of all publishers sorted by name.
     
-    Returns a list of all publishers with summary information.
+    Returns one page of publishers with summary information. When more
+    publishers remain, the cursor for the next page is sent in the
+    X-Next-Cursor response header and can be passed back as `after`.
+    
+    Args:
+        limit: Maximum number of publishers to return.
+        after: Cursor returned with the previous page, if any.
     """
-    return service.get_all_publishers()
+    validator = service.get_publishers_validator()
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    page = service.get_publishers_page(limit=limit, after=after, projection=PublisherSummary)
+    response = ModelResponse(page.items, List[PublisherSummary])
+    set_next_cursor_header(response, page)
+    set_validator_headers(response, validator)
+    return response
 
 
 @router.post("", response_model=PublisherResponse, status_code=201)
@@ -49,6 +79,7 @@ def create_publisher(
 @router.get("/{publisher_id}", response_model=PublisherResponse)
 def get_publisher(
     publisher_id: int,
+    request: Request,
     service: PublisherService = Depends(get_publisher_service)
 ):
     """Get a specific publisher by ID.
@@ -59,7 +90,12 @@ def get_publisher(
     Returns:
         The publisher details.
     """
-    return service.get_publisher_by_id(publisher_id)
+    validator = service.get_publisher_validator(publisher_id)
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    response = ModelResponse(service.get_publisher(publisher_id), PublisherResponse)
+    set_validator_headers(response, validator)
+    return response
 
 
 @router.put("/{publisher_id}", response_model=PublisherResponse)
@@ -94,3 +130,102 @@ def delete_publisher(
     """
     service.delete_publisher(publisher_id)
     return None
+
+
+@async_router.get("", response_model=List[PublisherSummary])
+async def get_publishers_async(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="Cursor from the previous page"),
+    service: AsyncPublisherService = Depends(get_async_publisher_service)
+):
+    """Get list of all publishers sorted by name.
+    
+    Returns one page of publishers with summary information. When more
+    publishers remain, the cursor for the next page is sent in the
+    X-Next-Cursor response header and can be passed back as `after`.
+    
+    Args:
+        limit: Maximum number of publishers to return.
+        after: Cursor returned with the previous page, if any.
+    """
+    validator = await service.get_publishers_validator()
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    page = await service.get_publishers_page(limit=limit, after=after, projection=PublisherSummary)
+    response = ModelResponse(page.items, List[PublisherSummary])
+    set_next_cursor_header(response, page)
+    set_validator_headers(response, validator)
+    return response
+
+
+@async_router.post("", response_model=PublisherResponse, status_code=201)
+async def create_publisher_async(
+    publisher: PublisherCreate,
+    service: AsyncPublisherService = Depends(get_async_publisher_service)
+):
+    """Create a new publisher.
+    
+    Args:
+        publisher: The publisher data to create.
+        
+    Returns:
+        The newly created publisher.
+    """
+    return await service.create_publisher(publisher)
+
+
+@async_router.get("/{publisher_id}", response_model=PublisherResponse)
+async def get_publisher_async(
+    publisher_id: int,
+    request: Request,
+    service: AsyncPublisherService = Depends(get_async_publisher_service)
+):
+    """Get a specific publisher by ID.
+    
+    Args:
+        publisher_id: The publisher's primary key.
+        
+    Returns:
+        The publisher details.
+    """
+    validator = await service.get_publisher_validator(publisher_id)
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    response = ModelResponse(await service.get_publisher(publisher_id), PublisherResponse)
+    set_validator_headers(response, validator)
+    return response
+
+
+@async_router.put("/{publisher_id}", response_model=PublisherResponse)
+async def update_publisher_async(
+    publisher_id: int,
+    publisher: PublisherUpdate,
+    service: AsyncPublisherService = Depends(get_async_publisher_service)
+):
+    """Update an existing publisher.
+    
+    Args:
+        publisher_id: The publisher's primary key.
+        publisher: The updated publisher data.
+        
+    Returns:
+        The updated publisher.
+    """
+    return await service.update_publisher(publisher_id, publisher)
+
+
+@async_router.delete("/{publisher_id}", status_code=204)
+async def delete_publisher_async(
+    publisher_id: int,
+    service: AsyncPublisherService = Depends(get_async_publisher_service)
+):
+    """Delete a publisher.
+    
+    Fails if the publisher has associated books.
+    
+    Args:
+        publisher_id: The publisher's primary key.
+    """
+    await service.delete_publisher(publisher_id)
+    return None
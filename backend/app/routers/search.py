@@ -0,0 +1,42 @@
+"""Search API endpoints.
+
+This module defines thin REST API endpoints for full-text search.
+Business logic is delegated to the SearchService.
+"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..schemas import SearchResults
+from ..services import SearchService
+
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+def get_search_service(db: Session = Depends(get_db)) -> SearchService:
+    """Dependency injection for SearchService."""
+    return SearchService(db)
+
+
+@router.get("", response_model=SearchResults)
+def search(
+    q: str = Query(..., min_length=1, description="Words to search for; each matches as a prefix"),
+    limit: int = Query(20, ge=1, le=100),
+    service: SearchService = Depends(get_search_service)
+):
+    """Search books and authors.
+    
+    Books are matched on title, edition, author names, genre and
+    publisher; authors on name and surname. Results are ranked by
+    relevance.
+    
+    Args:
+        q: The search text.
+        limit: Maximum number of books and of authors to return.
+        
+    Returns:
+        Ranked book and author matches.
+    """
+    return service.search(q, limit)
@@ -1,7 +1,11 @@
-from datetime import date
+from datetime import date, datetime
+from enum import Enum
 from typing import Optional
 from pydantic import BaseModel, ConfigDict
 
+from .core.pagination import SortOrder
+from .models import ChangeOperation
+
 # ============== Author Schemas ==============
 class AuthorBase(BaseModel):
     """Base author schema."""
@@ -113,6 +117,8 @@ class BookBase(BaseModel):
     title: str
     edition: Optional[str] = None
     published_date: Optional[date] = None
+    isbn: Optional[str] = None
+    publication_year: Optional[int] = None
     publisher_id: Optional[int] = None
     genre_id: Optional[int] = None
 
@@ -145,5 +151,86 @@ class BookResponse(BookBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class BookSortField(str, Enum):
+    """Columns the book list can be sorted by."""
+    ID = "id"
+    TITLE = "title"
+    PUBLISHED_DATE = "published_date"
+
+
+class BookQuery(BaseModel):
+    """Filters and sort order of the book list.
+    
+    Every filter that is set must match. title matches as a case-sensitive
+    prefix; the published date range is inclusive.
+    """
+    author_id: Optional[int] = None
+    genre_id: Optional[int] = None
+    publisher_id: Optional[int] = None
+    published_from: Optional[date] = None
+    published_to: Optional[date] = None
+    title: Optional[str] = None
+    sort_by: BookSortField = BookSortField.ID
+    order: SortOrder = SortOrder.ASC
+
+
+class FacetValue(BaseModel):
+    """Number of matching books related to one genre, publisher or author."""
+    id: int
+    name: str
+    count: int
+
+
+class DecadeFacetValue(BaseModel):
+    """Number of matching books published in one decade."""
+    decade: int
+    count: int
+
+
+class BookFacets(BaseModel):
+    """Counts of the books matching a filter, per facet value."""
+    genres: list[FacetValue] = []
+    publishers: list[FacetValue] = []
+    authors: list[FacetValue] = []
+    decades: list[DecadeFacetValue] = []
+
+
+class BookImportError(BaseModel):
+    """A row rejected during bulk import."""
+    line: int
+    message: str
+
+
+class BookImportResult(BaseModel):
+    """Outcome of a bulk book import."""
+    imported: int = 0
+    failed: int = 0
+    errors: list[BookImportError] = []
+
+
+# ============== Search Schemas ==============
+class SearchResults(BaseModel):
+    """Ranked full-text search matches."""
+    books: list[BookSummary] = []
+    authors: list[AuthorSummary] = []
+
+
+# ============== Change Feed Schemas ==============
+class ChangeResponse(BaseModel):
+    """An insert, update or tombstone in the change log."""
+    token: int
+    collection: str
+    id: int
+    operation: ChangeOperation
+    changed_at: datetime
+
+
+class ChangeFeed(BaseModel):
+    """Changes since a sync token, oldest first."""
+    changes: list[ChangeResponse] = []
+    next_token: int
+    has_more: bool = False
+
+
 # Rebuild models for forward references
 AuthorWithBooks.model_rebuild()
@@ -2,6 +2,7 @@ from datetime import date
 from sqlalchemy.orm import Session
 
 from .models import Author, Book, Genre, Publisher
+from .repositories import FacetRepository, SearchRepository
 
 
 def seed_database(db: Session) -> None:
@@ -124,4 +125,9 @@ def seed_database(db: Session) -> None:
         ),
     ]
     db.add_all(books)
+    db.flush()
+    
+    # Sample rows bypass the repositories, so index and count them in one pass
+    SearchRepository(db).rebuild()
+    FacetRepository(db).rebuild()
     db.commit()
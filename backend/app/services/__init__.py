@@ -1,13 +1,28 @@
 """Service module for business logic layer."""
 
-from .author_service import AuthorService
-from .book_service import BookService
-from .genre_service import GenreService
-from .publisher_service import PublisherService
+from .author_service import AuthorService, AsyncAuthorService
+from .book_service import BookService, AsyncBookService, book_fields_schema
+from .book_import_service import BookImportService, ImportFormat
+from .book_export_service import BookExportService, ExportFormat
+from .change_service import ChangeService
+from .genre_service import GenreService, AsyncGenreService
+from .publisher_service import PublisherService, AsyncPublisherService
+from .search_service import SearchService
 
 __all__ = [
     "AuthorService",
+    "AsyncAuthorService",
     "BookService",
+    "AsyncBookService",
+    "book_fields_schema",
+    "BookImportService",
+    "ImportFormat",
+    "BookExportService",
+    "ExportFormat",
+    "ChangeService",
     "GenreService",
+    "AsyncGenreService",
     "PublisherService",
+    "AsyncPublisherService",
+    "SearchService",
 ]
@@ -1,11 +1,32 @@
 """Author service for business logic operations."""
 
-from typing import List
+from typing import List, Optional, Type
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.models import Author
-from app.schemas import AuthorCreate, AuthorUpdate
-from app.repositories import AuthorRepository
+from app.caching import (
+    AUTHORS,
+    BOOKS,
+    entity_cache,
+    publish_invalidations,
+    publish_invalidations_async,
+)
+from app.core.conditional import Validator
+from app.core.invalidation import Invalidation
+from app.core.unit_of_work import AsyncUnitOfWork, UnitOfWork
+from app.core.serializers import serializer_for
+from app.models import Author, Book, ChangeOperation
+from app.schemas import AuthorCreate, AuthorUpdate, AuthorWithBooks
+from app.repositories import (
+    AuthorRepository,
+    AsyncAuthorRepository,
+    VersionRepository,
+    AsyncVersionRepository,
+    ChangeRepository,
+    AsyncChangeRepository,
+)
+from app.core.pagination import Page
 from app.core.exceptions import NotFoundException, DeletionNotAllowedException
 
 
@@ -22,7 +43,10 @@ class AuthorService:
         Args:
             db: The database session.
         """
+        self.db = db
         self.repository = AuthorRepository(db)
+        self.versions = VersionRepository(db)
+        self.changes = ChangeRepository(db)
     
     def get_all_authors(self) -> List[Author]:
         """Retrieve all authors.
@@ -32,6 +56,49 @@ class AuthorService:
         """
         return self.repository.get_all()
     
+    def get_authors_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Type[BaseModel]] = None
+    ) -> Page:
+        """Retrieve one page of authors.
+        
+        Args:
+            limit: Maximum number of authors to return.
+            after: Cursor returned with the previous page, if any.
+            projection: Optional schema limiting the columns that are loaded.
+            
+        Returns:
+            The page of authors and the cursor for the next one.
+        """
+        return self.repository.get_page(limit=limit, after=after, projection=projection)
+    
+    def get_authors_validator(self) -> Validator:
+        """Retrieve the ETag and Last-Modified of the author list.
+        
+        Returns:
+            The validators, changed by every author create, update and delete.
+        """
+        return Validator.from_version(*self.versions.get_collection(Author.__tablename__))
+    
+    def get_author_validator(self, author_id: int) -> Validator:
+        """Retrieve the ETag and Last-Modified of an author without loading them.
+        
+        Args:
+            author_id: The author's primary key.
+            
+        Returns:
+            The validators of the author's AuthorWithBooks response.
+            
+        Raises:
+            NotFoundException: If the author doesn't exist.
+        """
+        row = self.versions.get_entity(Author, author_id)
+        if not row:
+            raise NotFoundException("Author", author_id)
+        return Validator.from_version(*row)
+    
     def get_author_by_id(self, author_id: int) -> Author:
         """Retrieve a specific author by ID.
         
@@ -49,6 +116,27 @@ class AuthorService:
             raise NotFoundException("Author", author_id)
         return author
     
+    def get_author(self, author_id: int, version: str) -> bytes:
+        """Retrieve an author for display, served from the entity cache.
+        
+        Use get_author_by_id instead when the author is going to be modified.
+        
+        Args:
+            author_id: The author's primary key.
+            version: ETag of the author's current version, from
+                get_author_validator; a cached copy of another version is not
+                served, so the body matches the validators.
+            
+        Returns:
+            The author serialized as AuthorWithBooks JSON.
+            
+        Raises:
+            NotFoundException: If the author doesn't exist.
+        """
+        return entity_cache.get_or_load(
+            AUTHORS, author_id, version, lambda: _serialize(self.get_author_by_id(author_id))
+        )
+    
     def create_author(self, author_data: AuthorCreate) -> Author:
         """Create a new author.
         
@@ -63,7 +151,10 @@ class AuthorService:
             surname=author_data.surname,
             birthyear=author_data.birthyear
         )
-        return self.repository.create(author)
+        with UnitOfWork(self.db):
+            self.versions.bump_collection(Author.__tablename__)
+            author = self.repository.create(author)
+        return author
     
     def update_author(self, author_id: int, author_data: AuthorUpdate) -> Author:
         """Update an existing author.
@@ -84,7 +175,15 @@ class AuthorService:
         for field, value in update_data.items():
             setattr(author, field, value)
         
-        return self.repository.update(author)
+        # Books embed the author's name
+        with UnitOfWork(self.db):
+            self.versions.bump_entities(Author, [author_id])
+            self.versions.bump_entities(Book, [book.id for book in author.books])
+            self.versions.bump_collection(Author.__tablename__)
+            self.changes.record(Book, [book.id for book in author.books], ChangeOperation.UPDATE)
+            author = self.repository.update(author)
+        publish_invalidations(*_invalidations_of(author))
+        return author
     
     def delete_author(self, author_id: int) -> None:
         """Delete an author.
@@ -104,4 +203,122 @@ class AuthorService:
                 "author has associated books. Remove book associations first."
             )
         
-        self.repository.delete(author)
+        with UnitOfWork(self.db):
+            self.versions.bump_collection(Author.__tablename__)
+            self.repository.delete(author)
+        publish_invalidations(Invalidation(AUTHORS, (author_id,)))
+
+
+class AsyncAuthorService:
+    """Async variant of AuthorService for an AsyncSession.
+    
+    Applies the same business rules through the async repositories.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        """Initialize the author service.
+        
+        Args:
+            db: The async database session.
+        """
+        self.db = db
+        self.repository = AsyncAuthorRepository(db)
+        self.versions = AsyncVersionRepository(db)
+        self.changes = AsyncChangeRepository(db)
+    
+    async def get_all_authors(self) -> List[Author]:
+        """See AuthorService.get_all_authors."""
+        return await self.repository.get_all()
+    
+    async def get_authors_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Type[BaseModel]] = None
+    ) -> Page:
+        """See AuthorService.get_authors_page."""
+        return await self.repository.get_page(limit=limit, after=after, projection=projection)
+    
+    async def get_authors_validator(self) -> Validator:
+        """See AuthorService.get_authors_validator."""
+        return Validator.from_version(*await self.versions.get_collection(Author.__tablename__))
+    
+    async def get_author_validator(self, author_id: int) -> Validator:
+        """See AuthorService.get_author_validator."""
+        row = await self.versions.get_entity(Author, author_id)
+        if not row:
+            raise NotFoundException("Author", author_id)
+        return Validator.from_version(*row)
+    
+    async def get_author_by_id(self, author_id: int) -> Author:
+        """See AuthorService.get_author_by_id."""
+        author = await self.repository.get_by_id(author_id)
+        if not author:
+            raise NotFoundException("Author", author_id)
+        return author
+    
+    async def get_author(self, author_id: int, version: str) -> bytes:
+        """See AuthorService.get_author."""
+        
+        async def load() -> bytes:
+            return _serialize(await self.get_author_by_id(author_id))
+        
+        return await entity_cache.get_or_load_async(AUTHORS, author_id, version, load)
+    
+    async def create_author(self, author_data: AuthorCreate) -> Author:
+        """See AuthorService.create_author."""
+        author = Author(
+            name=author_data.name,
+            surname=author_data.surname,
+            birthyear=author_data.birthyear
+        )
+        async with AsyncUnitOfWork(self.db):
+            await self.versions.bump_collection(Author.__tablename__)
+            author = await self.repository.create(author)
+        return author
+    
+    async def update_author(self, author_id: int, author_data: AuthorUpdate) -> Author:
+        """See AuthorService.update_author."""
+        author = await self.get_author_by_id(author_id)
+        
+        update_data = author_data.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(author, field, value)
+        
+        # Books embed the author's name
+        async with AsyncUnitOfWork(self.db):
+            await self.versions.bump_entities(Author, [author_id])
+            await self.versions.bump_entities(Book, [book.id for book in author.books])
+            await self.versions.bump_collection(Author.__tablename__)
+            await self.changes.record(Book, [book.id for book in author.books], ChangeOperation.UPDATE)
+            author = await self.repository.update(author)
+        await publish_invalidations_async(*_invalidations_of(author))
+        return author
+    
+    async def delete_author(self, author_id: int) -> None:
+        """See AuthorService.delete_author."""
+        author = await self.get_author_by_id(author_id)
+        
+        if await self.repository.has_books(author_id):
+            raise DeletionNotAllowedException(
+                "Author",
+                "author has associated books. Remove book associations first."
+            )
+        
+        async with AsyncUnitOfWork(self.db):
+            await self.versions.bump_collection(Author.__tablename__)
+            await self.repository.delete(author)
+        await publish_invalidations_async(Invalidation(AUTHORS, (author_id,)))
+
+
+def _serialize(author: Author) -> bytes:
+    """Serialize an author as the AuthorWithBooks JSON cached for GET /authors/{id}."""
+    return serializer_for(AuthorWithBooks).dump_json(author)
+
+
+def _invalidations_of(author: Author) -> tuple:
+    """Invalidations of a changed author and of their books, which embed the name."""
+    return (
+        Invalidation(AUTHORS, (author.id,)),
+        Invalidation(BOOKS, tuple(book.id for book in author.books)),
+    )
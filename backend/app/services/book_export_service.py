@@ -0,0 +1,121 @@
+"""Full-catalog book export service."""
+
+import csv
+import io
+from enum import Enum
+from typing import Iterator
+
+from sqlalchemy.orm import Session
+
+from app.core.serializers import serializer_for
+from app.models import Book
+from app.schemas import BookResponse
+from app.repositories import BookRepository
+
+# Books fetched per database round trip and written per response chunk
+EXPORT_BATCH_SIZE = 1000
+
+CSV_COLUMNS = [
+    "id",
+    "title",
+    "edition",
+    "published_date",
+    "isbn",
+    "publication_year",
+    "publisher_id",
+    "publisher",
+    "genre_id",
+    "genre",
+    "author_ids",
+    "authors",
+]
+
+
+class ExportFormat(str, Enum):
+    """Supported export formats."""
+    NDJSON = "ndjson"
+    CSV = "csv"
+    
+    @property
+    def media_type(self) -> str:
+        """The HTTP content type for this format."""
+        return "text/csv" if self == ExportFormat.CSV else "application/x-ndjson"
+
+
+class BookExportService:
+    """Service class for streaming the whole book catalog.
+    
+    Books are read through a server-side cursor and serialized in chunks,
+    so an export runs in a single request with constant memory.
+    """
+    
+    def __init__(self, db: Session):
+        """Initialize the book export service.
+        
+        Args:
+            db: The database session.
+        """
+        self.repository = BookRepository(db)
+    
+    def stream_books(self, format: ExportFormat) -> Iterator[str]:
+        """Stream every book in the requested format.
+        
+        NDJSON lines are BookResponse objects. CSV rows flatten the related
+        entities; author ids and names are separated by semicolons, matching
+        the bulk import format.
+        
+        Args:
+            format: The export format.
+        
+        Returns:
+            Iterator over text chunks of the export.
+        """
+        if format == ExportFormat.CSV:
+            return self._stream_csv()
+        return self._stream_ndjson()
+    
+    def _stream_ndjson(self) -> Iterator[str]:
+        """Yield NDJSON chunks of BookResponse objects."""
+        serializer = serializer_for(BookResponse)
+        lines = []
+        for book in self.repository.iter_all(batch_size=EXPORT_BATCH_SIZE):
+            lines.append(serializer.dump_json(book).decode())
+            if len(lines) >= EXPORT_BATCH_SIZE:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+    
+    def _stream_csv(self) -> Iterator[str]:
+        """Yield CSV chunks, starting with the header row."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_COLUMNS)
+        
+        rows = 0
+        for book in self.repository.iter_all(batch_size=EXPORT_BATCH_SIZE):
+            writer.writerow(_csv_row(book))
+            rows += 1
+            if rows % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+
+def _csv_row(book: Book) -> list:
+    """Flatten a book and its relations into CSV column values."""
+    return [
+        book.id,
+        book.title,
+        book.edition,
+        book.published_date.isoformat() if book.published_date else None,
+        book.isbn,
+        book.publication_year,
+        book.publisher_id,
+        book.publisher.name if book.publisher else None,
+        book.genre_id,
+        book.genre.name if book.genre else None,
+        ";".join(str(author.id) for author in book.authors),
+        ";".join(f"{author.name} {author.surname}" for author in book.authors),
+    ]
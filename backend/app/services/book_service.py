@@ -1,13 +1,62 @@
 """Book service for business logic operations"""
 
-from typing import List
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple, Type
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.models import Book, Author
-from app.schemas import BookCreate, BookUpdate
-from app.repositories import BookRepository, AuthorRepository, GenreRepository, PublisherRepository
+from app.caching import (
+    AUTHORS,
+    BOOKS,
+    entity_cache,
+    publish_invalidations,
+    publish_invalidations_async,
+)
+from app.core.conditional import Validator
+from app.core.invalidation import Invalidation
+from app.core.serializers import serializer_for
+from app.core.unit_of_work import AsyncUnitOfWork, UnitOfWork
+from app.models import Book, Author, ChangeOperation, Facet, Genre, Publisher
+from app.schemas import (
+    BookCreate,
+    BookUpdate,
+    BookQuery,
+    BookResponse,
+    BookFacets,
+    DecadeFacetValue,
+    FacetValue,
+)
+from app.repositories import (
+    BookRepository,
+    AuthorRepository,
+    GenreRepository,
+    PublisherRepository,
+    AsyncBookRepository,
+    AsyncAuthorRepository,
+    AsyncGenreRepository,
+    AsyncPublisherRepository,
+    VersionRepository,
+    AsyncVersionRepository,
+    ChangeRepository,
+    AsyncChangeRepository,
+    FacetRepository,
+    AsyncFacetRepository,
+    book_facet_keys,
+)
+from app.core.pagination import Page
 from app.core.exceptions import NotFoundException, ValidationException
 
+# Book columns a client can pick with fields=, in response order. Related
+# entities are left out: they would need joins the list query avoids.
+BOOK_FIELDS = tuple(name for name in BookResponse.model_fields if name in Book.__table__.columns)
+
+# Collections whose writes change the facet counts or the names they show
+FACET_COLLECTIONS = (Book, Genre, Publisher, Author)
+
+# BookFacets list of each facet of related entities
+FACET_FIELDS = {Facet.GENRE: "genres", Facet.PUBLISHER: "publishers", Facet.AUTHOR: "authors"}
+
 
 class BookService:
     """Service class for Book business logic"""
@@ -23,6 +72,9 @@ class BookService:
         self.author_repository = AuthorRepository(db)
         self.genre_repository = GenreRepository(db)
         self.publisher_repository = PublisherRepository(db)
+        self.versions = VersionRepository(db)
+        self.changes = ChangeRepository(db)
+        self.facets = FacetRepository(db)
     
     def get_all_books(self) -> List[Book]:
         """Retrieve all books.
@@ -32,6 +84,77 @@ class BookService:
         """
         return self.repository.get_all()
     
+    def get_books_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Type[BaseModel]] = None,
+        query: Optional[BookQuery] = None
+    ) -> Page:
+        """Retrieve one page of books.
+        
+        Args:
+            limit: Maximum number of books to return.
+            after: Cursor returned with the previous page, if any.
+            projection: Optional schema limiting the columns that are loaded.
+            query: Optional filters and sort order; all books by id otherwise.
+            
+        Returns:
+            The page of books and the cursor for the next one.
+        """
+        return self.repository.get_query_page(
+            query or BookQuery(), limit=limit, after=after, projection=projection
+        )
+    
+    def get_books_validator(self) -> Validator:
+        """Retrieve the ETag and Last-Modified of the book list.
+        
+        Returns:
+            The validators, changed by every book create, update and delete.
+        """
+        return Validator.from_version(*self.versions.get_collection(Book.__tablename__))
+    
+    def get_facets(self, query: Optional[BookQuery] = None, limit: int = 10) -> BookFacets:
+        """Count the books matching the filters per genre, publisher, author and decade.
+        
+        Args:
+            query: Optional filters; the whole catalog otherwise.
+            limit: Maximum number of values per facet, the most frequent first.
+            
+        Returns:
+            The counts; decades are listed in chronological order.
+        """
+        return _facets(self.repository.get_facet_counts(query or BookQuery(), limit))
+    
+    def get_facets_validator(self) -> Validator:
+        """Retrieve the ETag and Last-Modified of the facet counts.
+        
+        Returns:
+            The validators, changed by every book write and by every write
+            to the genres, publishers and authors whose names are listed.
+        """
+        return Validator.combine([
+            Validator.from_version(*self.versions.get_collection(model.__tablename__))
+            for model in FACET_COLLECTIONS
+        ])
+    
+    def get_book_validator(self, book_id: int) -> Validator:
+        """Retrieve the ETag and Last-Modified of a book without loading it.
+        
+        Args:
+            book_id: The book's primary key.
+            
+        Returns:
+            The validators of the book's BookResponse.
+            
+        Raises:
+            NotFoundException: If the book doesn't exist.
+        """
+        row = self.versions.get_entity(Book, book_id)
+        if not row:
+            raise NotFoundException("Book", book_id)
+        return Validator.from_version(*row)
+    
     def get_book_by_id(self, book_id: int) -> Book:
         """Retrieve a specific book by ID.
         
@@ -49,6 +172,27 @@ class BookService:
             raise NotFoundException("Book", book_id)
         return book
     
+    def get_book(self, book_id: int, version: str) -> bytes:
+        """Retrieve a book for display, served from the entity cache.
+        
+        Use get_book_by_id instead when the book is going to be modified.
+        
+        Args:
+            book_id: The book's primary key.
+            version: ETag of the book's current version, from
+                get_book_validator; a cached copy of another version is not
+                served, so the body matches the validators.
+            
+        Returns:
+            The book serialized as BookResponse JSON.
+            
+        Raises:
+            NotFoundException: If the book doesn't exist.
+        """
+        return entity_cache.get_or_load(
+            BOOKS, book_id, version, lambda: _serialize(self.get_book_by_id(book_id))
+        )
+    
     def create_book(self, book_data: BookCreate) -> Book:
         """Create a new book.
         
@@ -72,16 +216,15 @@ class BookService:
         # Validate all authors exist
         authors = self._get_and_validate_authors(book_data.author_ids)
         
-        book = Book(
-            title=book_data.title,
-            isbn=book_data.isbn,
-            publication_year=book_data.publication_year,
-            genre_id=book_data.genre_id,
-            publisher_id=book_data.publisher_id
-        )
+        book = Book(**book_data.model_dump(exclude={"author_ids"}))
         book.authors = authors
         
-        return self.repository.create(book)
+        with UnitOfWork(self.db):
+            self._bump_versions(author_ids=[author.id for author in authors])
+            self.facets.apply(added=_facet_keys(book))
+            book = self.repository.create(book)
+        publish_invalidations(_authors_of(book))
+        return book
     
     def update_book(self, book_id: int, book_data: BookUpdate) -> Book:
         """Update an existing book.
@@ -98,6 +241,8 @@ class BookService:
             ValidationException: If genre, publisher, or any author doesn't exist.
         """
         book = self.get_book_by_id(book_id)
+        previous_authors = _authors_of(book)
+        previous_facets = _facet_keys(book)
         
         update_data = book_data.model_dump(exclude_unset=True)
         
@@ -118,7 +263,12 @@ class BookService:
         for field, value in update_data.items():
             setattr(book, field, value)
         
-        return self.repository.update(book)
+        with UnitOfWork(self.db):
+            self._bump_versions(book_id, [*previous_authors.ids, *(author.id for author in book.authors)])
+            self.facets.apply(added=_facet_keys(book), removed=previous_facets)
+            book = self.repository.update(book)
+        publish_invalidations(Invalidation(BOOKS, (book_id,)), previous_authors, _authors_of(book))
+        return book
     
     def delete_book(self, book_id: int) -> None:
         """Delete a book.
@@ -130,7 +280,29 @@ class BookService:
             NotFoundException: If the book doesn't exist.
         """
         book = self.get_book_by_id(book_id)
-        self.repository.delete(book)
+        authors = _authors_of(book)
+        with UnitOfWork(self.db):
+            self._bump_versions(author_ids=authors.ids)
+            self.facets.apply(removed=_facet_keys(book))
+            self.repository.delete(book)
+        publish_invalidations(Invalidation(BOOKS, (book_id,)), authors)
+    
+    def _bump_versions(self, book_id: Optional[int] = None, author_ids: Iterable[int] = ()) -> None:
+        """Bump the versions a book write changes, in the write's transaction.
+        
+        The book list changes on every write, and the authors' responses
+        list their books, so they are also logged as updated.
+        
+        Args:
+            book_id: The updated book, if any.
+            author_ids: Authors of the book before and after the write.
+        """
+        author_ids = list(author_ids)
+        if book_id is not None:
+            self.versions.bump_entities(Book, [book_id])
+        self.versions.bump_entities(Author, author_ids)
+        self.versions.bump_collection(Book.__tablename__)
+        self.changes.record(Author, author_ids, ChangeOperation.UPDATE)
     
     def _get_and_validate_authors(self, author_ids: List[int]) -> List[Author]:
         """Validate and retrieve authors by their IDs.
@@ -147,11 +319,233 @@ class BookService:
         if not author_ids:
             raise ValidationException("At least one author is required")
         
-        authors = []
-        for author_id in author_ids:
-            author = self.author_repository.get_by_id(author_id)
-            if not author:
-                raise ValidationException(f"Author with id {author_id} not found")
-            authors.append(author)
+        authors, missing_ids = self.author_repository.get_many(author_ids)
+        if len(missing_ids) == 1:
+            raise ValidationException(f"Author with id {missing_ids[0]} not found")
+        if missing_ids:
+            raise ValidationException(f"Authors with ids {missing_ids} not found")
         
         return authors
+
+
+class AsyncBookService:
+    """Async variant of BookService for an AsyncSession.
+    
+    Applies the same business rules through the async repositories.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        """Initialize the book service.
+        
+        Args:
+            db: The async database session.
+        """
+        self.db = db
+        self.repository = AsyncBookRepository(db)
+        self.author_repository = AsyncAuthorRepository(db)
+        self.genre_repository = AsyncGenreRepository(db)
+        self.publisher_repository = AsyncPublisherRepository(db)
+        self.versions = AsyncVersionRepository(db)
+        self.changes = AsyncChangeRepository(db)
+        self.facets = AsyncFacetRepository(db)
+    
+    async def get_all_books(self) -> List[Book]:
+        """See BookService.get_all_books."""
+        return await self.repository.get_all()
+    
+    async def get_books_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Type[BaseModel]] = None,
+        query: Optional[BookQuery] = None
+    ) -> Page:
+        """See BookService.get_books_page."""
+        return await self.repository.get_query_page(
+            query or BookQuery(), limit=limit, after=after, projection=projection
+        )
+    
+    async def get_books_validator(self) -> Validator:
+        """See BookService.get_books_validator."""
+        return Validator.from_version(*await self.versions.get_collection(Book.__tablename__))
+    
+    async def get_facets(self, query: Optional[BookQuery] = None, limit: int = 10) -> BookFacets:
+        """See BookService.get_facets."""
+        return _facets(await self.repository.get_facet_counts(query or BookQuery(), limit))
+    
+    async def get_facets_validator(self) -> Validator:
+        """See BookService.get_facets_validator."""
+        return Validator.combine([
+            Validator.from_version(*await self.versions.get_collection(model.__tablename__))
+            for model in FACET_COLLECTIONS
+        ])
+    
+    async def get_book_validator(self, book_id: int) -> Validator:
+        """See BookService.get_book_validator."""
+        row = await self.versions.get_entity(Book, book_id)
+        if not row:
+            raise NotFoundException("Book", book_id)
+        return Validator.from_version(*row)
+    
+    async def get_book_by_id(self, book_id: int) -> Book:
+        """See BookService.get_book_by_id."""
+        book = await self.repository.get_by_id(book_id)
+        if not book:
+            raise NotFoundException("Book", book_id)
+        return book
+    
+    async def get_book(self, book_id: int, version: str) -> bytes:
+        """See BookService.get_book."""
+        
+        async def load() -> bytes:
+            return _serialize(await self.get_book_by_id(book_id))
+        
+        return await entity_cache.get_or_load_async(BOOKS, book_id, version, load)
+    
+    async def create_book(self, book_data: BookCreate) -> Book:
+        """See BookService.create_book."""
+        # Validate genre exists
+        if not await self.genre_repository.exists(book_data.genre_id):
+            raise ValidationException(f"Genre with id {book_data.genre_id} not found")
+        
+        # Validate publisher exists
+        if not await self.publisher_repository.exists(book_data.publisher_id):
+            raise ValidationException(f"Publisher with id {book_data.publisher_id} not found")
+        
+        # Validate all authors exist
+        authors = await self._get_and_validate_authors(book_data.author_ids)
+        
+        book = Book(**book_data.model_dump(exclude={"author_ids"}))
+        book.authors = authors
+        
+        async with AsyncUnitOfWork(self.db):
+            await self._bump_versions(author_ids=[author.id for author in authors])
+            await self.facets.apply(added=_facet_keys(book))
+            book = await self.repository.create(book)
+        await publish_invalidations_async(_authors_of(book))
+        return book
+    
+    async def update_book(self, book_id: int, book_data: BookUpdate) -> Book:
+        """See BookService.update_book."""
+        book = await self.get_book_by_id(book_id)
+        previous_authors = _authors_of(book)
+        previous_facets = _facet_keys(book)
+        
+        update_data = book_data.model_dump(exclude_unset=True)
+        
+        # Validate genre if being updated
+        if "genre_id" in update_data and not await self.genre_repository.exists(update_data["genre_id"]):
+            raise ValidationException(f"Genre with id {update_data['genre_id']} not found")
+        
+        # Validate publisher if being updated
+        if "publisher_id" in update_data and not await self.publisher_repository.exists(update_data["publisher_id"]):
+            raise ValidationException(f"Publisher with id {update_data['publisher_id']} not found")
+        
+        # Handle authors separately
+        if "author_ids" in update_data:
+            author_ids = update_data.pop("author_ids")
+            book.authors = await self._get_and_validate_authors(author_ids)
+        
+        # Update remaining fields
+        for field, value in update_data.items():
+            setattr(book, field, value)
+        
+        async with AsyncUnitOfWork(self.db):
+            await self._bump_versions(book_id, [*previous_authors.ids, *(author.id for author in book.authors)])
+            await self.facets.apply(added=_facet_keys(book), removed=previous_facets)
+            book = await self.repository.update(book)
+        await publish_invalidations_async(Invalidation(BOOKS, (book_id,)), previous_authors, _authors_of(book))
+        return book
+    
+    async def delete_book(self, book_id: int) -> None:
+        """See BookService.delete_book."""
+        book = await self.get_book_by_id(book_id)
+        authors = _authors_of(book)
+        async with AsyncUnitOfWork(self.db):
+            await self._bump_versions(author_ids=authors.ids)
+            await self.facets.apply(removed=_facet_keys(book))
+            await self.repository.delete(book)
+        await publish_invalidations_async(Invalidation(BOOKS, (book_id,)), authors)
+    
+    async def _bump_versions(self, book_id: Optional[int] = None, author_ids: Iterable[int] = ()) -> None:
+        """See BookService._bump_versions."""
+        author_ids = list(author_ids)
+        if book_id is not None:
+            await self.versions.bump_entities(Book, [book_id])
+        await self.versions.bump_entities(Author, author_ids)
+        await self.versions.bump_collection(Book.__tablename__)
+        await self.changes.record(Author, author_ids, ChangeOperation.UPDATE)
+    
+    async def _get_and_validate_authors(self, author_ids: List[int]) -> List[Author]:
+        """See BookService._get_and_validate_authors."""
+        if not author_ids:
+            raise ValidationException("At least one author is required")
+        
+        authors, missing_ids = await self.author_repository.get_many(author_ids)
+        if len(missing_ids) == 1:
+            raise ValidationException(f"Author with id {missing_ids[0]} not found")
+        if missing_ids:
+            raise ValidationException(f"Authors with ids {missing_ids} not found")
+        
+        return authors
+
+
+def book_fields_schema(fields: str) -> Type[BaseModel]:
+    """Build the response schema of a sparse fieldset.
+    
+    Args:
+        fields: Comma-separated names from BOOK_FIELDS, e.g. "id,title,isbn".
+        
+    Returns:
+        A schema with the requested fields in BOOK_FIELDS order; identical
+        requests share one schema.
+        
+    Raises:
+        ValidationException: If a name is not a selectable field.
+    """
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested - set(BOOK_FIELDS))
+    if unknown:
+        raise ValidationException(f"Unknown fields {unknown}; expected some of {list(BOOK_FIELDS)}")
+    if not requested:
+        raise ValidationException("fields must name at least one field")
+    return _sparse_schema(tuple(name for name in BOOK_FIELDS if name in requested))
+
+
+@lru_cache(maxsize=None)
+def _sparse_schema(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Subset of BookResponse with the given fields, created once per combination."""
+    return create_model(
+        "BookFields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (BookResponse.model_fields[name].annotation, ...) for name in fields},
+    )
+
+
+def _serialize(book: Book) -> bytes:
+    """Serialize a book as the BookResponse JSON cached for GET /books/{id}."""
+    return serializer_for(BookResponse).dump_json(book)
+
+
+def _authors_of(book: Book) -> Invalidation:
+    """Invalidation of the cached authors of a book, whose book lists embed it."""
+    return Invalidation(AUTHORS, tuple(author.id for author in book.authors))
+
+
+def _facet_keys(book: Book) -> list:
+    """Facet values a book is counted under, from its current attributes."""
+    return book_facet_keys(
+        book.genre_id, book.publisher_id, (author.id for author in book.authors), book.published_date
+    )
+
+
+def _facets(rows) -> BookFacets:
+    """Group (facet, value, book_count, name) rows into the facets response."""
+    facets = BookFacets()
+    for facet, value, book_count, name in rows:
+        if facet == Facet.DECADE:
+            facets.decades.append(DecadeFacetValue(decade=value, count=book_count))
+        else:
+            getattr(facets, FACET_FIELDS[Facet(facet)]).append(FacetValue(id=value, name=name, count=book_count))
+    facets.decades.sort(key=lambda decade: decade.decade)
+    return facets
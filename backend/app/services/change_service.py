@@ -0,0 +1,98 @@
+"""Change feed service for delta sync"""
+
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import GoneException
+from app.core.unit_of_work import UnitOfWork
+from app.models import utcnow
+from app.schemas import ChangeFeed, ChangeResponse
+from app.repositories import ChangeRepository
+
+# Entries deleted per transaction when pruning the log
+PRUNE_BATCH_SIZE = 10000
+
+
+class ChangeService:
+    """Service class for the change feed mirrored catalogs sync from.
+    
+    Every write logs the resources whose API representation it changed, so
+    a client only refetches those, or drops them on a delete tombstone.
+    """
+    
+    def __init__(self, db: Session):
+        """Initialize the change service.
+        
+        Args:
+            db: The database session.
+        """
+        self.db = db
+        self.repository = ChangeRepository(db)
+    
+    def get_changes(self, since: Optional[int], limit: int) -> ChangeFeed:
+        """Retrieve the changes logged after a sync token.
+        
+        Without a token no changes are returned, only the current token,
+        which a client records before a full download and then syncs from.
+        
+        Args:
+            since: Token returned by the previous call, if any.
+            limit: Maximum number of changes to return.
+        
+        Returns:
+            The changes, oldest first, and the token to pass next time.
+        
+        Raises:
+            GoneException: If entries after the token have been pruned.
+        """
+        if since is None:
+            return ChangeFeed(next_token=self.repository.get_latest_token())
+        
+        # The token must reach at least the entry before the oldest one kept
+        if since < self.repository.get_oldest_token() - 1:
+            raise GoneException(
+                f"Changes after token {since} have been pruned; download the catalog again and sync from a new token"
+            )
+        
+        entries = self.repository.get_since(since, limit + 1)
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        return ChangeFeed(
+            changes=[
+                ChangeResponse(
+                    token=entry.id,
+                    collection=entry.collection,
+                    id=entry.entity_id,
+                    operation=entry.operation,
+                    changed_at=entry.changed_at,
+                )
+                for entry in entries
+            ],
+            next_token=entries[-1].id if entries else since,
+            has_more=has_more,
+        )
+    
+    def prune(self, retention: timedelta) -> int:
+        """Delete the entries logged longer ago than the retention period.
+        
+        Entries are deleted in batches, each in its own transaction, so
+        writers are only briefly blocked. The newest entry is always kept.
+        Clients whose token predates the remaining entries get a 410 and
+        must download the catalog again.
+        
+        Args:
+            retention: How long entries are kept.
+        
+        Returns:
+            Number of entries deleted.
+        """
+        cutoff = utcnow() - retention
+        deleted = 0
+        while True:
+            with UnitOfWork(self.db):
+                count = self.repository.delete_before(cutoff, PRUNE_BATCH_SIZE)
+            deleted += count
+            if count < PRUNE_BATCH_SIZE:
+                return deleted
@@ -1,11 +1,30 @@
 """Genre service for business logic operations"""
 
-from typing import List
+from typing import List, Optional, Type
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.models import Genre
-from app.schemas import GenreCreate, GenreUpdate
-from app.repositories import GenreRepository, BookRepository
+from app.caching import (
+    BOOKS,
+    GENRES,
+    publish_invalidations,
+    publish_invalidations_async,
+)
+from app.core.conditional import Validator
+from app.core.invalidation import Invalidation
+from app.core.unit_of_work import AsyncUnitOfWork, UnitOfWork
+from app.models import Book, ChangeOperation, Genre
+from app.schemas import GenreCreate, GenreUpdate, GenreResponse
+from app.repositories import (
+    GenreRepository,
+    AsyncGenreRepository,
+    VersionRepository,
+    AsyncVersionRepository,
+    ChangeRepository,
+    AsyncChangeRepository,
+)
+from app.core.pagination import Page
 from app.core.exceptions import NotFoundException, DeletionNotAllowedException
 
 
@@ -22,8 +41,10 @@ class GenreService:
         Args:
             db: The database session.
         """
+        self.db = db
         self.repository = GenreRepository(db)
-        self.book_repository = BookRepository(db)
+        self.versions = VersionRepository(db)
+        self.changes = ChangeRepository(db)
     
     def get_all_genres(self) -> List[Genre]:
         """Retrieve all genres sorted by name.
@@ -33,6 +54,49 @@ class GenreService:
         """
         return self.repository.get_all_sorted()
     
+    def get_genres_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Type[BaseModel]] = None
+    ) -> Page:
+        """Retrieve one page of genres sorted by name.
+        
+        Args:
+            limit: Maximum number of genres to return.
+            after: Cursor returned with the previous page, if any.
+            projection: Optional schema limiting the columns that are loaded.
+            
+        Returns:
+            The page of genres and the cursor for the next one.
+        """
+        return self.repository.get_page(limit=limit, after=after, projection=projection)
+    
+    def get_genres_validator(self) -> Validator:
+        """Retrieve the ETag and Last-Modified of the genre list.
+        
+        Returns:
+            The validators, changed by every genre create, update and delete.
+        """
+        return Validator.from_version(*self.versions.get_collection(Genre.__tablename__))
+    
+    def get_genre_validator(self, genre_id: int) -> Validator:
+        """Retrieve the ETag and Last-Modified of a genre without loading it.
+        
+        Args:
+            genre_id: The genre's primary key.
+            
+        Returns:
+            The validators of the genre's GenreResponse.
+            
+        Raises:
+            NotFoundException: If the genre doesn't exist.
+        """
+        row = self.versions.get_entity(Genre, genre_id)
+        if not row:
+            raise NotFoundException("Genre", genre_id)
+        return Validator.from_version(*row)
+    
     def get_genre_by_id(self, genre_id: int) -> Genre:
         """Retrieve a specific genre by ID.
         
@@ -50,6 +114,25 @@ class GenreService:
             raise NotFoundException("Genre", genre_id)
         return genre
     
+    def get_genre(self, genre_id: int):
+        """Retrieve a genre for display, served from the reference cache.
+        
+        Use get_genre_by_id instead when the genre is going to be modified.
+        
+        Args:
+            genre_id: The genre's primary key.
+            
+        Returns:
+            A row with the GenreResponse fields.
+            
+        Raises:
+            NotFoundException: If the genre doesn't exist.
+        """
+        genre = self.repository.get_row(genre_id, GenreResponse)
+        if not genre:
+            raise NotFoundException("Genre", genre_id)
+        return genre
+    
     def create_genre(self, genre_data: GenreCreate) -> Genre:
         """Create a new genre.
         
@@ -60,7 +143,11 @@ class GenreService:
             The newly created genre.
         """
         genre = Genre(name=genre_data.name)
-        return self.repository.create(genre)
+        with UnitOfWork(self.db):
+            self.versions.bump_collection(Genre.__tablename__)
+            genre = self.repository.create(genre)
+        publish_invalidations(Invalidation(GENRES))
+        return genre
     
     def update_genre(self, genre_id: int, genre_data: GenreUpdate) -> Genre:
         """Update an existing genre.
@@ -81,7 +168,15 @@ class GenreService:
         for field, value in update_data.items():
             setattr(genre, field, value)
         
-        return self.repository.update(genre)
+        # Books embed the genre name
+        with UnitOfWork(self.db):
+            self.versions.bump_entities(Genre, [genre_id])
+            self.versions.bump_entities_where(Book, Book.genre_id == genre_id)
+            self.versions.bump_collection(Genre.__tablename__)
+            self.changes.record_where(Book, Book.genre_id == genre_id, ChangeOperation.UPDATE)
+            genre = self.repository.update(genre)
+        publish_invalidations(Invalidation(GENRES), Invalidation(BOOKS))
+        return genre
     
     def delete_genre(self, genre_id: int) -> None:
         """Delete a genre.
@@ -95,11 +190,110 @@ class GenreService:
         """
         genre = self.get_genre_by_id(genre_id)
         
-        book_count = self.book_repository.count_by_genre(genre_id)
-        if book_count > 0:
+        if self.repository.has_books(genre_id):
+            raise DeletionNotAllowedException(
+                "Genre",
+                "genre has associated books. Reassign or delete books first."
+            )
+        
+        with UnitOfWork(self.db):
+            self.versions.bump_collection(Genre.__tablename__)
+            self.repository.delete(genre)
+        publish_invalidations(Invalidation(GENRES))
+
+
+class AsyncGenreService:
+    """Async variant of GenreService for an AsyncSession.
+    
+    Applies the same business rules through the async repositories.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        """Initialize the genre service.
+        
+        Args:
+            db: The async database session.
+        """
+        self.db = db
+        self.repository = AsyncGenreRepository(db)
+        self.versions = AsyncVersionRepository(db)
+        self.changes = AsyncChangeRepository(db)
+    
+    async def get_all_genres(self) -> List[Genre]:
+        """See GenreService.get_all_genres."""
+        return await self.repository.get_all_sorted()
+    
+    async def get_genres_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Type[BaseModel]] = None
+    ) -> Page:
+        """See GenreService.get_genres_page."""
+        return await self.repository.get_page(limit=limit, after=after, projection=projection)
+    
+    async def get_genres_validator(self) -> Validator:
+        """See GenreService.get_genres_validator."""
+        return Validator.from_version(*await self.versions.get_collection(Genre.__tablename__))
+    
+    async def get_genre_validator(self, genre_id: int) -> Validator:
+        """See GenreService.get_genre_validator."""
+        row = await self.versions.get_entity(Genre, genre_id)
+        if not row:
+            raise NotFoundException("Genre", genre_id)
+        return Validator.from_version(*row)
+    
+    async def get_genre_by_id(self, genre_id: int) -> Genre:
+        """See GenreService.get_genre_by_id."""
+        genre = await self.repository.get_by_id(genre_id)
+        if not genre:
+            raise NotFoundException("Genre", genre_id)
+        return genre
+    
+    async def get_genre(self, genre_id: int):
+        """See GenreService.get_genre."""
+        genre = await self.repository.get_row(genre_id, GenreResponse)
+        if not genre:
+            raise NotFoundException("Genre", genre_id)
+        return genre
+    
+    async def create_genre(self, genre_data: GenreCreate) -> Genre:
+        """See GenreService.create_genre."""
+        genre = Genre(name=genre_data.name)
+        async with AsyncUnitOfWork(self.db):
+            await self.versions.bump_collection(Genre.__tablename__)
+            genre = await self.repository.create(genre)
+        await publish_invalidations_async(Invalidation(GENRES))
+        return genre
+    
+    async def update_genre(self, genre_id: int, genre_data: GenreUpdate) -> Genre:
+        """See GenreService.update_genre."""
+        genre = await self.get_genre_by_id(genre_id)
+        
+        update_data = genre_data.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(genre, field, value)
+        
+        async with AsyncUnitOfWork(self.db):
+            await self.versions.bump_entities(Genre, [genre_id])
+            await self.versions.bump_entities_where(Book, Book.genre_id == genre_id)
+            await self.versions.bump_collection(Genre.__tablename__)
+            await self.changes.record_where(Book, Book.genre_id == genre_id, ChangeOperation.UPDATE)
+            genre = await self.repository.update(genre)
+        await publish_invalidations_async(Invalidation(GENRES), Invalidation(BOOKS))
+        return genre
+    
+    async def delete_genre(self, genre_id: int) -> None:
+        """See GenreService.delete_genre."""
+        genre = await self.get_genre_by_id(genre_id)
+        
+        if await self.repository.has_books(genre_id):
             raise DeletionNotAllowedException(
                 "Genre",
-                f"genre has {book_count} associated book(s). Reassign or delete books first."
+                "genre has associated books. Reassign or delete books first."
             )
         
-        self.repository.delete(genre)
+        async with AsyncUnitOfWork(self.db):
+            await self.versions.bump_collection(Genre.__tablename__)
+            await self.repository.delete(genre)
+        await publish_invalidations_async(Invalidation(GENRES))
@@ -1,11 +1,30 @@
 """Service layer for Publisher business logic."""
 
-from typing import List
+from typing import List, Optional, Type
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.models import Publisher
-from app.schemas import PublisherCreate, PublisherUpdate
-from app.repositories import PublisherRepository, BookRepository
+from app.caching import (
+    BOOKS,
+    PUBLISHERS,
+    publish_invalidations,
+    publish_invalidations_async,
+)
+from app.core.conditional import Validator
+from app.core.invalidation import Invalidation
+from app.core.unit_of_work import AsyncUnitOfWork, UnitOfWork
+from app.models import Book, ChangeOperation, Publisher
+from app.schemas import PublisherCreate, PublisherUpdate, PublisherResponse
+from app.repositories import (
+    PublisherRepository,
+    AsyncPublisherRepository,
+    VersionRepository,
+    AsyncVersionRepository,
+    ChangeRepository,
+    AsyncChangeRepository,
+)
+from app.core.pagination import Page
 from app.core.exceptions import NotFoundException, DeletionNotAllowedException
 
 
@@ -22,8 +41,10 @@ class PublisherService:
         Args:
             db: The database session.
         """
+        self.db = db
         self.repository = PublisherRepository(db)
-        self.book_repository = BookRepository(db)
+        self.versions = VersionRepository(db)
+        self.changes = ChangeRepository(db)
     
     def get_all_publishers(self) -> List[Publisher]:
         """Retrieve all publishers sorted by name.
@@ -33,6 +54,49 @@ class PublisherService:
         """
         return self.repository.get_all_sorted()
     
+    def get_publishers_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Type[BaseModel]] = None
+    ) -> Page:
+        """Retrieve one page of publishers sorted by name.
+        
+        Args:
+            limit: Maximum number of publishers to return.
+            after: Cursor returned with the previous page, if any.
+            projection: Optional schema limiting the columns that are loaded.
+            
+        Returns:
+            The page of publishers and the cursor for the next one.
+        """
+        return self.repository.get_page(limit=limit, after=after, projection=projection)
+    
+    def get_publishers_validator(self) -> Validator:
+        """Retrieve the ETag and Last-Modified of the publisher list.
+        
+        Returns:
+            The validators, changed by every publisher create, update and delete.
+        """
+        return Validator.from_version(*self.versions.get_collection(Publisher.__tablename__))
+    
+    def get_publisher_validator(self, publisher_id: int) -> Validator:
+        """Retrieve the ETag and Last-Modified of a publisher without loading it.
+        
+        Args:
+            publisher_id: The publisher's primary key.
+            
+        Returns:
+            The validators of the publisher's PublisherResponse.
+            
+        Raises:
+            NotFoundException: If the publisher doesn't exist.
+        """
+        row = self.versions.get_entity(Publisher, publisher_id)
+        if not row:
+            raise NotFoundException("Publisher", publisher_id)
+        return Validator.from_version(*row)
+    
     def get_publisher_by_id(self, publisher_id: int) -> Publisher:
         """Retrieve a specific publisher by ID.
         
@@ -50,6 +114,25 @@ class PublisherService:
             raise NotFoundException("Publisher", publisher_id)
         return publisher
     
+    def get_publisher(self, publisher_id: int):
+        """Retrieve a publisher for display, served from the reference cache.
+        
+        Use get_publisher_by_id instead when the publisher is going to be modified.
+        
+        Args:
+            publisher_id: The publisher's primary key.
+            
+        Returns:
+            A row with the PublisherResponse fields.
+            
+        Raises:
+            NotFoundException: If the publisher doesn't exist.
+        """
+        publisher = self.repository.get_row(publisher_id, PublisherResponse)
+        if not publisher:
+            raise NotFoundException("Publisher", publisher_id)
+        return publisher
+    
     def create_publisher(self, publisher_data: PublisherCreate) -> Publisher:
         """Create a new publisher.
         
@@ -60,7 +143,11 @@ class PublisherService:
             The newly created publisher.
         """
         publisher = Publisher(name=publisher_data.name)
-        return self.repository.create(publisher)
+        with UnitOfWork(self.db):
+            self.versions.bump_collection(Publisher.__tablename__)
+            publisher = self.repository.create(publisher)
+        publish_invalidations(Invalidation(PUBLISHERS))
+        return publisher
     
     def update_publisher(self, publisher_id: int, publisher_data: PublisherUpdate) -> Publisher:
         """Update an existing publisher.
@@ -81,7 +168,15 @@ class PublisherService:
         for field, value in update_data.items():
             setattr(publisher, field, value)
         
-        return self.repository.update(publisher)
+        # Books embed the publisher name
+        with UnitOfWork(self.db):
+            self.versions.bump_entities(Publisher, [publisher_id])
+            self.versions.bump_entities_where(Book, Book.publisher_id == publisher_id)
+            self.versions.bump_collection(Publisher.__tablename__)
+            self.changes.record_where(Book, Book.publisher_id == publisher_id, ChangeOperation.UPDATE)
+            publisher = self.repository.update(publisher)
+        publish_invalidations(Invalidation(PUBLISHERS), Invalidation(BOOKS))
+        return publisher
     
     def delete_publisher(self, publisher_id: int) -> None:
         """Delete a publisher.
@@ -95,11 +190,110 @@ class PublisherService:
         """
         publisher = self.get_publisher_by_id(publisher_id)
         
-        book_count = self.book_repository.count_by_publisher(publisher_id)
-        if book_count > 0:
+        if self.repository.has_books(publisher_id):
+            raise DeletionNotAllowedException(
+                "Publisher",
+                "publisher has associated books. Reassign or delete books first."
+            )
+        
+        with UnitOfWork(self.db):
+            self.versions.bump_collection(Publisher.__tablename__)
+            self.repository.delete(publisher)
+        publish_invalidations(Invalidation(PUBLISHERS))
+
+
+class AsyncPublisherService:
+    """Async variant of PublisherService for an AsyncSession.
+    
+    Applies the same business rules through the async repositories.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        """Initialize the publisher service.
+        
+        Args:
+            db: The async database session.
+        """
+        self.db = db
+        self.repository = AsyncPublisherRepository(db)
+        self.versions = AsyncVersionRepository(db)
+        self.changes = AsyncChangeRepository(db)
+    
+    async def get_all_publishers(self) -> List[Publisher]:
+        """See PublisherService.get_all_publishers."""
+        return await self.repository.get_all_sorted()
+    
+    async def get_publishers_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Type[BaseModel]] = None
+    ) -> Page:
+        """See PublisherService.get_publishers_page."""
+        return await self.repository.get_page(limit=limit, after=after, projection=projection)
+    
+    async def get_publishers_validator(self) -> Validator:
+        """See PublisherService.get_publishers_validator."""
+        return Validator.from_version(*await self.versions.get_collection(Publisher.__tablename__))
+    
+    async def get_publisher_validator(self, publisher_id: int) -> Validator:
+        """See PublisherService.get_publisher_validator."""
+        row = await self.versions.get_entity(Publisher, publisher_id)
+        if not row:
+            raise NotFoundException("Publisher", publisher_id)
+        return Validator.from_version(*row)
+    
+    async def get_publisher_by_id(self, publisher_id: int) -> Publisher:
+        """See PublisherService.get_publisher_by_id."""
+        publisher = await self.repository.get_by_id(publisher_id)
+        if not publisher:
+            raise NotFoundException("Publisher", publisher_id)
+        return publisher
+    
+    async def get_publisher(self, publisher_id: int):
+        """See PublisherService.get_publisher."""
+        publisher = await self.repository.get_row(publisher_id, PublisherResponse)
+        if not publisher:
+            raise NotFoundException("Publisher", publisher_id)
+        return publisher
+    
+    async def create_publisher(self, publisher_data: PublisherCreate) -> Publisher:
+        """See PublisherService.create_publisher."""
+        publisher = Publisher(name=publisher_data.name)
+        async with AsyncUnitOfWork(self.db):
+            await self.versions.bump_collection(Publisher.__tablename__)
+            publisher = await self.repository.create(publisher)
+        await publish_invalidations_async(Invalidation(PUBLISHERS))
+        return publisher
+    
+    async def update_publisher(self, publisher_id: int, publisher_data: PublisherUpdate) -> Publisher:
+        """See PublisherService.update_publisher."""
+        publisher = await self.get_publisher_by_id(publisher_id)
+        
+        update_data = publisher_data.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(publisher, field, value)
+        
+        async with AsyncUnitOfWork(self.db):
+            await self.versions.bump_entities(Publisher, [publisher_id])
+            await self.versions.bump_entities_where(Book, Book.publisher_id == publisher_id)
+            await self.versions.bump_collection(Publisher.__tablename__)
+            await self.changes.record_where(Book, Book.publisher_id == publisher_id, ChangeOperation.UPDATE)
+            publisher = await self.repository.update(publisher)
+        await publish_invalidations_async(Invalidation(PUBLISHERS), Invalidation(BOOKS))
+        return publisher
+    
+    async def delete_publisher(self, publisher_id: int) -> None:
+        """See PublisherService.delete_publisher."""
+        publisher = await self.get_publisher_by_id(publisher_id)
+        
+        if await self.repository.has_books(publisher_id):
             raise DeletionNotAllowedException(
                 "Publisher",
-                f"publisher has {book_count} associated book(s). Reassign or delete books first."
+                "publisher has associated books. Reassign or delete books first."
             )
         
-        self.repository.delete(publisher)
+        async with AsyncUnitOfWork(self.db):
+            await self.versions.bump_collection(Publisher.__tablename__)
+            await self.repository.delete(publisher)
+        await publish_invalidations_async(Invalidation(PUBLISHERS))
@@ -0,0 +1,46 @@
+"""Search service for business logic operations"""
+
+from sqlalchemy.orm import Session
+
+from app.schemas import SearchResults
+from app.repositories import SearchRepository
+from app.repositories.search_repository import tokenize_query
+from app.core.exceptions import ValidationException
+
+
+class SearchService:
+    """Service class for full-text search over the catalog.
+    
+    Books match on title, edition, author names, genre and publisher;
+    authors match on name and surname. Every word is matched as a prefix.
+    """
+    
+    def __init__(self, db: Session):
+        """Initialize the search service.
+        
+        Args:
+            db: The database session.
+        """
+        self.repository = SearchRepository(db)
+    
+    def search(self, query: str, limit: int) -> SearchResults:
+        """Search books and authors.
+        
+        Args:
+            query: Free text; every word must match.
+            limit: Maximum number of books and of authors to return.
+            
+        Returns:
+            Ranked book and author matches.
+            
+        Raises:
+            ValidationException: If the query contains no searchable words.
+        """
+        terms = tokenize_query(query)
+        if not terms:
+            raise ValidationException("Search query must contain at least one word")
+        
+        return SearchResults(
+            books=self.repository.search_books(terms, limit),
+            authors=self.repository.search_authors(terms, limit),
+        )
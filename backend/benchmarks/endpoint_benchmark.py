@@ -0,0 +1,398 @@
+"""Benchmark the CRUD endpoints in-process and over a real uvicorn server.
+
+Generates a throwaway SQLite catalog for each requested size and drives
+the list, detail, create, update and delete endpoints of books, authors,
+genres and publishers at each concurrency level, reporting latency
+percentiles and throughput. The asgi transport calls the application
+in-process through httpx, without sockets; the uvicorn transport starts a
+server on a free local port and sends real HTTP requests. Each catalog is
+served by a fresh process, so caches do not carry over between sizes.
+
+Results can be saved as a baseline and later runs compared against it:
+an endpoint whose p50 or p95 latency grew by more than the threshold is
+reported as a regression and the command exits with status 1. Baselines
+only compare like for like, so record them on the machine that checks.
+
+The sync or async stack is selected by DATABASE_ASYNC, as for the API.
+
+Usage:
+    python -m benchmarks.endpoint_benchmark --books 10000 100000 --concurrency 1 8 32
+    python -m benchmarks.endpoint_benchmark --save-baseline baseline.json
+    python -m benchmarks.endpoint_benchmark --baseline baseline.json --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+from sqlalchemy import create_engine
+
+from app.core.config import get_settings
+from app.generator import CatalogSize
+from app.migrations import MIGRATIONS, migrate
+from benchmarks.index_benchmark import populate
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TRANSPORTS = ("asgi", "uvicorn")
+
+# Unmeasured requests sent to each read endpoint before timing it
+WARMUP_REQUESTS = 10
+
+SERVER_START_TIMEOUT = 30
+
+# (method, path, JSON body) of one request
+Request = Tuple[str, str, Optional[dict]]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Requests to one endpoint, timed together.
+    
+    Attributes:
+        name: Method and route, e.g. "GET /books/{id}".
+        request: Builds the i-th request.
+        on_response: Called with each successful response, e.g. to collect created ids.
+        read_only: Whether the requests can be repeated to warm up.
+    """
+    name: str
+    request: Callable[[int], Request]
+    on_response: Optional[Callable[[httpx.Response], None]] = None
+    read_only: bool = False
+
+
+@dataclass(frozen=True)
+class Stats:
+    """Latency percentiles and throughput of a scenario.
+    
+    Attributes:
+        p50_ms: Median latency in milliseconds.
+        p95_ms: 95th percentile latency in milliseconds.
+        p99_ms: 99th percentile latency in milliseconds.
+        requests_per_second: Completed requests per second of wall time.
+        failures: Requests answered with an error status.
+    """
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    requests_per_second: float
+    failures: int
+
+
+def scenarios(size: CatalogSize, tag: str, seed: int) -> List[Scenario]:
+    """Build the list, detail, create, update and delete scenarios of every resource.
+    
+    Updates and deletes target the rows created by the create scenario of
+    the same resource, so they always succeed and leave the generated
+    catalog as it was.
+    
+    Args:
+        size: The catalog being benchmarked, to pick existing ids.
+        tag: Distinguishes names created by different runs on the same catalog.
+        seed: Random seed of the ids and references of the requests.
+    
+    Returns:
+        The scenarios, in the order they must run.
+    """
+    rng = random.Random(f"{seed}-{tag}")
+    
+    def book(name: str) -> dict:
+        return {
+            "title": name,
+            "edition": "1st Edition",
+            "published_date": "2020-01-01",
+            "genre_id": rng.randint(1, size.genres),
+            "publisher_id": rng.randint(1, size.publishers),
+            "author_ids": rng.sample(range(1, size.authors + 1), rng.randint(1, 2)),
+        }
+    
+    resources = [
+        ("/books", size.books, book),
+        ("/authors", size.authors, lambda name: {"name": name, "surname": "Benchmark", "birthyear": 1970}),
+        ("/genres", size.genres, lambda name: {"name": name, "description": "Benchmark genre"}),
+        ("/publishers", size.publishers, lambda name: {"name": name, "website": "https://benchmark.example.com"}),
+    ]
+    result = []
+    for path, count, payload in resources:
+        created: List[int] = []
+        result += [
+            Scenario(f"GET {path}", lambda i, path=path: ("GET", path, None), read_only=True),
+            Scenario(
+                f"GET {path}/{{id}}",
+                lambda i, path=path, count=count: ("GET", f"{path}/{rng.randint(1, count)}", None),
+                read_only=True,
+            ),
+            Scenario(
+                f"POST {path}",
+                lambda i, path=path, payload=payload: ("POST", path, payload(f"Benchmark {tag} {i}")),
+                on_response=lambda response, created=created: created.append(response.json()["id"]),
+            ),
+            Scenario(
+                f"PUT {path}/{{id}}",
+                lambda i, path=path, payload=payload, created=created: (
+                    "PUT", f"{path}/{created[i % len(created)]}", payload(f"Benchmark {tag} {i} revised"),
+                ),
+            ),
+            Scenario(
+                f"DELETE {path}/{{id}}",
+                lambda i, path=path, created=created: ("DELETE", f"{path}/{created[i]}", None),
+            ),
+        ]
+    return result
+
+
+async def measure(client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int) -> Stats:
+    """Send a scenario's requests from concurrent clients and time each one.
+    
+    Args:
+        client: Client bound to the application under test.
+        scenario: The requests to send.
+        requests: Number of requests.
+        concurrency: Number of requests in flight at once.
+    
+    Returns:
+        The latency percentiles and throughput.
+    """
+    latencies: List[float] = []
+    failures = 0
+    indexes = iter(range(requests))
+    
+    async def run_client() -> None:
+        nonlocal failures
+        for i in indexes:
+            method, path, body = scenario.request(i)
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.is_error:
+                failures += 1
+            elif scenario.on_response is not None:
+                scenario.on_response(response)
+    
+    if scenario.read_only:
+        for i in range(WARMUP_REQUESTS):
+            method, path, body = scenario.request(i)
+            await client.request(method, path, json=body)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return Stats(
+        p50_ms=percentiles[49] * 1000,
+        p95_ms=percentiles[94] * 1000,
+        p99_ms=percentiles[98] * 1000,
+        requests_per_second=requests / elapsed,
+        failures=failures,
+    )
+
+
+async def run_suite(
+    client: httpx.AsyncClient,
+    transport: str,
+    books: int,
+    concurrency_levels: Sequence[int],
+    requests: int,
+    seed: int,
+) -> Dict[str, dict]:
+    """Measure every scenario at every concurrency level against one catalog.
+    
+    Returns:
+        Stats keyed by transport, stack, catalog size, concurrency and endpoint.
+    """
+    stack = "async" if get_settings().async_database else "sync"
+    size = CatalogSize.for_books(books)
+    results = {}
+    for concurrency in concurrency_levels:
+        for scenario in scenarios(size, f"{transport}-{concurrency}", seed):
+            stats = await measure(client, scenario, requests, concurrency)
+            results[f"{transport} {stack} books={books} c={concurrency} {scenario.name}"] = asdict(stats)
+    return results
+
+
+async def run_asgi(books: int, concurrency_levels: Sequence[int], requests: int, seed: int) -> Dict[str, dict]:
+    """Run the suite in-process against the app configured by DATABASE_URL."""
+    # Imported here: the application reads its settings when first imported
+    from app.main import app
+    
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60) as client:
+            return await run_suite(client, "asgi", books, concurrency_levels, requests, seed)
+
+
+def run_asgi_worker(database_url: str, args: argparse.Namespace, books: int) -> Dict[str, dict]:
+    """Run the asgi transport in a new process serving the given catalog."""
+    command = [
+        sys.executable, "-m", "benchmarks.endpoint_benchmark", "--asgi-worker",
+        "--books", str(books),
+        "--concurrency", *map(str, args.concurrency),
+        "--requests", str(args.requests),
+        "--seed", str(args.seed),
+    ]
+    completed = subprocess.run(
+        command,
+        cwd=BACKEND_DIR,
+        env={**os.environ, "DATABASE_URL": database_url},
+        stdout=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+async def run_uvicorn(database_url: str, args: argparse.Namespace, books: int) -> Dict[str, dict]:
+    """Start a uvicorn server on the given catalog and run the suite over HTTP."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(args.workers),
+            "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "DATABASE_URL": database_url},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            await wait_until_ready(client, server)
+            return await run_suite(client, "uvicorn", books, args.concurrency, args.requests, args.seed)
+    finally:
+        server.terminate()
+        server.wait(timeout=SERVER_START_TIMEOUT)
+
+
+async def wait_until_ready(client: httpx.AsyncClient, server: subprocess.Popen) -> None:
+    """Poll the health check until the server answers.
+    
+    Raises:
+        RuntimeError: If the server exits or does not answer in time.
+    """
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {server.returncode}")
+        try:
+            if (await client.get("/")).is_success:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"uvicorn did not start within {SERVER_START_TIMEOUT}s")
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """List the endpoints whose latency regressed against a baseline.
+    
+    Args:
+        results: Stats of this run.
+        baseline: Stats of the baseline run.
+        threshold: Allowed relative growth of p50 and p95, e.g. 0.2 for 20%.
+    
+    Returns:
+        One line per regressed percentile; results missing from either side are skipped.
+    """
+    regressions = []
+    for key, stats in results.items():
+        if key not in baseline:
+            continue
+        for percentile in ("p50_ms", "p95_ms"):
+            before, after = baseline[key][percentile], stats[percentile]
+            if after > before * (1 + threshold):
+                regressions.append(f"{key} {percentile[:3]}: {before:.2f} -> {after:.2f} ms ({after / before - 1:+.0%})")
+    return regressions
+
+
+def print_report(results: Dict[str, dict], baseline: Optional[Dict[str, dict]]) -> None:
+    """Print one row per measured scenario, with the p50 change against the baseline."""
+    print(f"{'scenario':<64}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'fail':>6}{'p50 vs base':>13}")
+    for key, stats in results.items():
+        change = ""
+        if baseline and key in baseline:
+            change = f"{stats['p50_ms'] / baseline[key]['p50_ms'] - 1:+.0%}"
+        print(
+            f"{key:<64}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+            f"{stats['requests_per_second']:>9.0f}{stats['failures']:>6}{change:>13}"
+        )
+
+
+def main() -> int:
+    """Run the benchmark, report it and check it against the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, nargs="+", default=[10000, 100000], help="Catalog sizes to benchmark")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="Requests in flight at once")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per endpoint and concurrency level")
+    parser.add_argument("--transport", choices=TRANSPORTS, nargs="+", default=list(TRANSPORTS))
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", help="Compare against the results saved in this file")
+    parser.add_argument("--save-baseline", help="Save the results to this file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative p50/p95 growth")
+    parser.add_argument("--asgi-worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.asgi_worker:
+        results = asyncio.run(run_asgi(args.books[0], args.concurrency, args.requests, args.seed))
+        print(json.dumps(results))
+        return 0
+    
+    results: Dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for books in args.books:
+            database_url = f"sqlite:///{os.path.join(directory, f'catalog-{books}.db')}"
+            engine = create_engine(database_url)
+            migrate(engine, MIGRATIONS)
+            print(f"catalog: {populate(engine, books, args.seed)}")
+            engine.dispose()
+            for transport in args.transport:
+                if transport == "asgi":
+                    results.update(run_asgi_worker(database_url, args, books))
+                else:
+                    results.update(asyncio.run(run_uvicorn(database_url, args, books)))
+    
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+    
+    print()
+    print_report(results, baseline)
+    
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as file:
+            json.dump({"results": results}, file, indent=2)
+        print(f"\nsaved baseline to {args.save_baseline}")
+    
+    failures = sum(stats["failures"] for stats in results.values())
+    if failures:
+        print(f"\n{failures} requests failed")
+    
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        print(f"\n{len(regressions)} regressions beyond {args.threshold:.0%}")
+        for regression in regressions:
+            print(f"  {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Benchmark foreign-key lookups with and without the secondary indexes.
+
+Generates a throwaway SQLite catalog at the latest schema, drops its
+secondary indexes, times the repository queries that filter on foreign keys,
+then runs the secondary index migration (the same code that upgrades
+existing databases) and times the queries again. The query plan for each lookup is printed so
+the switch from SCAN to SEARCH is visible.
+
+Usage:
+    python -m benchmarks.index_benchmark --books 200000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.migrations import MIGRATIONS, migrate
+from app.migrations.versions import v0002_secondary_indexes
+from app.generator import FIRST_NAMES, CatalogSize, generate_catalog
+from app.repositories import AuthorRepository, BookRepository, GenreRepository, PublisherRepository
+
+
+def populate(engine: Engine, books: int, seed: int) -> Dict[str, int]:
+    """Fill an empty database with a synthetic catalog.
+    
+    Args:
+        engine: Engine for the benchmark database.
+        books: Number of books to create.
+        seed: Random seed, so runs are comparable.
+    
+    Returns:
+        Row counts per entity.
+    """
+    with Session(engine) as db:
+        return generate_catalog(db, CatalogSize.for_books(books), seed).as_dict()
+
+
+def lookups(sizes: Dict[str, int]) -> List[Tuple[str, Callable[[Session, random.Random], object], str]]:
+    """Repository calls to time, with SQL whose plan represents each one."""
+    return [
+        (
+            "BookRepository.get_by_author",
+            lambda db, rng: BookRepository(db).get_by_author(rng.randint(1, sizes["authors"])),
+            "SELECT book_id FROM book_authors WHERE author_id = 1",
+        ),
+        (
+            "BookRepository.get_by_genre",
+            lambda db, rng: BookRepository(db).get_by_genre(rng.randint(1, sizes["genres"])),
+            "SELECT id FROM books WHERE genre_id = 1",
+        ),
+        (
+            "BookRepository.get_by_publisher",
+            lambda db, rng: BookRepository(db).get_by_publisher(rng.randint(1, sizes["publishers"])),
+            "SELECT id FROM books WHERE publisher_id = 1",
+        ),
+        (
+            "GenreRepository.has_books",
+            lambda db, rng: GenreRepository(db).has_books(rng.randint(1, sizes["genres"])),
+            "SELECT 1 FROM books WHERE genre_id = 1",
+        ),
+        (
+            "PublisherRepository.has_books",
+            lambda db, rng: PublisherRepository(db).has_books(rng.randint(1, sizes["publishers"])),
+            "SELECT 1 FROM books WHERE publisher_id = 1",
+        ),
+        (
+            "AuthorRepository.has_books",
+            lambda db, rng: AuthorRepository(db).has_books(rng.randint(1, sizes["authors"])),
+            "SELECT 1 FROM book_authors WHERE author_id = 1",
+        ),
+        (
+            "AuthorRepository.get_by_name",
+            lambda db, rng: AuthorRepository(db).get_by_name(rng.choice(FIRST_NAMES)),
+            f"SELECT id FROM authors WHERE name = '{FIRST_NAMES[0]}'",
+        ),
+    ]
+
+
+def measure(engine: Engine, sizes: Dict[str, int], repeats: int) -> Dict[str, Tuple[float, str]]:
+    """Time each lookup and capture its query plan.
+    
+    Args:
+        engine: Engine for the benchmark database.
+        sizes: Row counts returned by populate.
+        repeats: Calls per lookup.
+    
+    Returns:
+        Mapping of lookup name to (milliseconds per call, query plan).
+    """
+    results = {}
+    for name, call, plan_sql in lookups(sizes):
+        rng = random.Random(name)
+        with Session(engine) as db:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                call(db, rng)
+                db.expunge_all()
+            elapsed = (time.perf_counter() - start) * 1000 / repeats
+            plan = "; ".join(row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {plan_sql}")))
+        results[name] = (elapsed, plan)
+    return results
+
+
+def main() -> None:
+    """Run the benchmark and print a before/after table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=200000, help="Number of books to generate")
+    parser.add_argument("--repeats", type=int, default=50, help="Calls per lookup")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        migrate(engine, MIGRATIONS)
+        sizes = populate(engine, args.books, args.seed)
+        print(f"catalog: {sizes}")
+        with engine.begin() as connection:
+            for name, _, _ in v0002_secondary_indexes.INDEXES:
+                connection.execute(text(f"DROP INDEX {name}"))
+        
+        before = measure(engine, sizes, args.repeats)
+        start = time.perf_counter()
+        v0002_secondary_indexes.upgrade(engine)
+        print(f"built secondary indexes in {time.perf_counter() - start:.2f}s")
+        after = measure(engine, sizes, args.repeats)
+        engine.dispose()
+    
+    print()
+    print(f"{'lookup':<36}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name, (before_ms, _) in before.items():
+        after_ms = after[name][0]
+        print(f"{name:<36}{before_ms:>12.3f}{after_ms:>12.3f}{before_ms / after_ms:>9.1f}x")
+    print()
+    for name in before:
+        print(f"{name}\n  before: {before[name][1]}\n  after:  {after[name][1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Benchmark response serialization and compression on large payloads.
+
+Builds a throwaway SQLite catalog, loads the payloads of the largest
+responses (a full page of GET /books, a full page of book details and an
+author with all their books) and times three ways of turning them into
+JSON: FastAPI's default response_model path, validating through a
+TypeAdapter and dumping with pydantic-core, and the compiled serializers
+ModelResponse uses, which skip validation. The bytes on the wire are then compared
+uncompressed, gzipped and, when the brotli package is installed, brotli
+encoded, at the settings CompressionMiddleware uses.
+
+Usage:
+    python -m benchmarks.serialization_benchmark --books 20000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.compression import available_encodings
+from app.core.pagination import MAX_PAGE_SIZE
+from app.core.responses import ModelResponse
+from app.migrations import MIGRATIONS, migrate
+from app.models import Author, Book, book_authors
+from app.repositories import BookRepository
+from app.schemas import AuthorWithBooks, BookResponse, BookSummary
+from benchmarks.index_benchmark import populate
+
+
+def payloads(db: Session) -> List[Tuple[str, Any, Any]]:
+    """Load the content of the benchmarked responses.
+    
+    Args:
+        db: Session on the benchmark database.
+    
+    Returns:
+        (name, response schema, content) for each response.
+    """
+    summaries = BookRepository(db).get_page(limit=MAX_PAGE_SIZE, projection=BookSummary).items
+    books = list(db.scalars(
+        select(Book)
+        .options(selectinload(Book.authors), selectinload(Book.publisher), selectinload(Book.genre))
+        .order_by(Book.id)
+        .limit(MAX_PAGE_SIZE)
+    ))
+    busiest = db.scalar(
+        select(book_authors.c.author_id)
+        .group_by(book_authors.c.author_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    )
+    author = db.scalar(
+        select(Author).options(selectinload(Author.books)).where(Author.id == busiest)
+    )
+    return [
+        (f"{len(summaries)} x BookSummary", List[BookSummary], summaries),
+        (f"{len(books)} x BookResponse", List[BookResponse], books),
+        (f"AuthorWithBooks ({len(author.books)} books)", AuthorWithBooks, author),
+    ]
+
+
+def default_path(schema: Any) -> Callable[[Any], bytes]:
+    """Serializer doing what FastAPI's serialize_response does for a response_model."""
+    field = create_response_field(name="response", type_=schema)
+    
+    def render(content: Any) -> bytes:
+        value, errors = field.validate(content, {}, loc=("response",))
+        assert not errors, errors
+        return JSONResponse(field.serialize(value)).body
+    
+    return render
+
+
+def validated_path(schema: Any) -> Callable[[Any], bytes]:
+    """Serializer validating from attributes, then dumping JSON in pydantic-core."""
+    adapter = TypeAdapter(schema)
+    return lambda content: adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+
+def compiled_path(schema: Any) -> Callable[[Any], bytes]:
+    """Serializer of ModelResponse."""
+    return lambda content: ModelResponse(content, schema).body
+
+
+PATHS = (("default", default_path), ("validated", validated_path), ("compiled", compiled_path))
+
+
+def time_ms(render: Callable[[Any], bytes], content: Any, repeats: int) -> float:
+    """Milliseconds per call of a serializer."""
+    render(content)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        render(content)
+    return (time.perf_counter() - start) * 1000 / repeats
+
+
+def encoded_sizes(body: bytes) -> Dict[str, int]:
+    """Size of a body in each content coding the middleware can produce."""
+    sizes = {"identity": len(body)}
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    sizes["gzip"] = len(compressor.compress(body) + compressor.flush())
+    if "br" in available_encodings():
+        import brotli
+        sizes["br"] = len(brotli.compress(body, quality=4))
+    return sizes
+
+
+def main() -> None:
+    """Run the benchmark and print timing and size tables."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=20000, help="Number of books to generate")
+    parser.add_argument("--repeats", type=int, default=50, help="Serializations per payload")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        migrate(engine, MIGRATIONS)
+        print(f"catalog: {populate(engine, args.books, args.seed)}")
+        
+        results = []
+        with Session(engine) as db:
+            for name, schema, content in payloads(db):
+                bodies = {path: serializer(schema)(content) for path, serializer in PATHS}
+                assert len(set(bodies.values())) == 1, f"{name}: serializers disagree"
+                timings = {
+                    path: time_ms(serializer(schema), content, args.repeats)
+                    for path, serializer in PATHS
+                }
+                results.append((name, timings, encoded_sizes(bodies["compiled"])))
+        engine.dispose()
+    
+    print()
+    print(f"{'payload':<36}" + "".join(f"{path + ' ms':>14}" for path, _ in PATHS) + f"{'speedup':>10}")
+    for name, timings, _ in results:
+        cells = "".join(f"{timings[path]:>14.3f}" for path, _ in PATHS)
+        print(f"{name:<36}{cells}{timings['default'] / timings['compiled']:>9.1f}x")
+    print()
+    codings = list(results[0][2])
+    print(f"{'payload':<36}" + "".join(f"{coding + ' bytes':>16}" for coding in codings))
+    for name, _, sizes in results:
+        cells = "".join(
+            f"{sizes[coding]:>10} {sizes[coding] / sizes['identity']:>5.0%}" for coding in codings
+        )
+        print(f"{name:<36}{cells}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ import type {
 } from './types';
 
 const API_BASE_URL = 'http://localhost:8080';
+const PAGE_SIZE = 500;
 
 /**
  * Generic fetch wrapper with error handling
@@ -41,10 +42,36 @@ async function fetchApi<T>(
   return response.json();
 }
 
+/**
+ * Fetch every page of a cursor-paginated list endpoint
+ */
+async function fetchAllPages<T>(endpoint: string): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | null = null;
+
+  do {
+    const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+    if (cursor) {
+      params.set('after', cursor);
+    }
+
+    const response = await fetch(`${API_BASE_URL}${endpoint}?${params}`);
+    if (!response.ok) {
+      const error = await response.json().catch(() => ({ detail: 'An error occurred' }));
+      throw new Error(error.detail || `HTTP error! status: ${response.status}`);
+    }
+
+    items.push(...(await response.json()));
+    cursor = response.headers.get('X-Next-Cursor');
+  } while (cursor);
+
+  return items;
+}
+
 // ============== Author API ==============
 export const authorApi = {
   getAll: (): Promise<Author[]> => 
-    fetchApi<Author[]>('/authors'),
+    fetchAllPages<Author>('/authors'),
 
   getById: (id: number): Promise<AuthorWithBooks> => 
     fetchApi<AuthorWithBooks>(`/authors/${id}`),
@@ -70,7 +97,7 @@ export const authorApi = {
 // ============== Book API ==============
 export const bookApi = {
   getAll: (): Promise<Book[]> => 
-    fetchApi<Book[]>('/books'),
+    fetchAllPages<Book>('/books'),
 
   getById: (id: number): Promise<Book> => 
     fetchApi<Book>(`/books/${id}`),
@@ -96,7 +123,7 @@ export const bookApi = {
 // ============== Publisher API ==============
 export const publisherApi = {
   getAll: (): Promise<Publisher[]> => 
-    fetchApi<Publisher[]>('/publishers'),
+    fetchAllPages<Publisher>('/publishers'),
 
   getById: (id: number): Promise<Publisher> => 
     fetchApi<Publisher>(`/publishers/${id}`),
@@ -105,7 +132,7 @@ export const publisherApi = {
 // ============== Genre API ==============
 export const genreApi = {
   getAll: (): Promise<Genre[]> => 
-    fetchApi<Genre[]>('/genres'),
+    fetchAllPages<Genre>('/genres'),
 
   getById: (id: number): Promise<Genre> => 
     fetchApi<Genre>(`/genres/${id}`),